@@ -7,8 +7,21 @@
   Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
 """
 
-import matplotlib.pyplot as plt
-from file_analysis import FileAnalysis
+import os
+from file_analysis import FileAnalysis, split_log_path
+from capture_catalog import Catalog
+from decimate import decimate_line
+
+
+def import_pyplot():
+    """Returns matplotlib.pyplot, imported on first use.
+
+       Importing pyplot takes seconds on a Pi, so commands that only print
+       or save data do not pay for it. Choose a backend, such as Agg, before
+       the first call to render without a display.
+    """
+    import matplotlib.pyplot as plt
+    return plt
 
 
 class Evaluate(object):
@@ -16,35 +29,83 @@ class Evaluate(object):
 
     Args:
         ts_path_name: The path name to the video timestamp file.
+        use_cache: Whether parsed logs may go through the sidecar cache.
 
     Attributes:
         x_size: Width of the graph to be drawn.
         y_size: Height of the graph to be drawn.
+        decimate: Whether long lines are thinned out to the pixel width
+        before drawing.
+        save_path: If set, graphs are written to this image file instead
+        of being shown.
         plot_style: Style of the graph to be drawn.
         file_path: Path to the timestamp files.
         files: List of the timestamp files to be plotted.
     """
-    __slots__ = ('x_size', 'y_size', 'plot_style', 'file_path', 'files')
-    def __init__(self, ts_path_name):
+    __slots__ = ('x_size', 'y_size', 'decimate', 'save_path', 'plot_style',
+                 'file_path', 'files')
+    def __init__(self, ts_path_name, use_cache=True):
         if type(ts_path_name) != type([]):
             ts_path_name = [ts_path_name]
 
         self.x_size = 8
         self.y_size = 6
+        self.decimate = True
+        self.save_path = None
         self.plot_style = 'vertical'
         self.file_path = ts_path_name
         self.files = []
 
         for i in range(len(self.file_path)):
-            self.files.append(FileAnalysis(self.file_path[i]))
+            self.files.append(FileAnalysis(self.file_path[i], use_cache))
+
 
+    def pixel_width(self, columns=1):
+        """Returns the width in pixels of one plot in a row of columns."""
+        plt = import_pyplot()
+        return int(self.x_size * plt.rcParams['figure.dpi'] / columns)
+
+
+    def draw_lines(self, axes, plot_data, columns=1):
+        """Draws the lines of a Plot on axes, decimated to the pixel width.
+
+        Args:
+            axes: The matplotlib axes to draw on.
+            plot_data: The Plot to draw.
+            columns: Number of plots side by side in the figure.
+        """
+        for line in plot_data.get_draw_lines():
+            if self.decimate:
+                line = decimate_line(line, self.pixel_width(columns))
+            axes.plot(*line)
 
-    def plot(self, plot_data):
+
+    def title(self, i):
+        """Returns the title for the i-th file, the name of its video."""
+        return os.path.basename(split_log_path(self.file_path[i])[0])
+
+
+    def finish(self, save_path=None):
+        """Shows the current figure, or writes it to save_path."""
+        plt = import_pyplot()
+        save_path = save_path or self.save_path
+        if save_path is None:
+            plt.draw()
+            plt.show()
+        else:
+            plt.savefig(save_path)
+        plt.close()
+
+
+    def plot(self, plot_data, save_path=None):
         """Plots data in a graph.
 
         Args:
             plot_data: An matplotlib object containing the data to be plotted.
+            save_path: Where to write the graph as an image instead of
+            showing it, defaults to the save_path attribute.
         """
+        plt = import_pyplot()
         # Get current size
         fig_size = plt.rcParams["figure.figsize"]
         fig_size[0] = self.x_size
@@ -52,10 +113,10 @@ class Evaluate(object):
         plt.rcParams["figure.figsize"] = fig_size
 
         if len(plot_data) == 1:
-            plt.title(self.file_path[0].split('/')[-1][:-3])
+            plt.title(self.title(0))
             plt.xlabel(plot_data[0].x_label)
             plt.ylabel(plot_data[0].y_label)
-            plt.plot(*plot_data[0].get_draw_lines()[0])
+            self.draw_lines(plt.gca(), plot_data[0])
 
         # Dont use for now
         elif len(plot_data) == -1:
@@ -64,46 +125,41 @@ class Evaluate(object):
 
             plot.subplots_adjust(hspace=0.25, wspace=0.25)
 
-            sub_plot1.set_title(self.file_path[0].split('/')[-1][:-3])
-            for line in plot_data[0].get_draw_lines():
-                sub_plot1.plot(*line)
-
-            sub_plot2.set_title(self.file_path[1].split('/')[-1][:-3])
-            for line in plot_data[1].get_draw_lines():
-                sub_plot2.plot(*line)
-
-            sub_plot3.set_title(self.file_path[2].split('/')[-1][:-3])
-            for line in plot_data[2].get_draw_lines():
-                sub_plot3.plot(*line)
-
-            sub_plot4.set_title(self.file_path[3].split('/')[-1][:-3])
-            for line in plot_data[3].get_draw_lines():
-                sub_plot4.plot(*line)
+            for (i, sub_plot) in enumerate((sub_plot1, sub_plot2,
+                                            sub_plot3, sub_plot4)):
+                sub_plot.set_title(self.title(i))
+                self.draw_lines(sub_plot, plot_data[i], 2)
 
         else:
+            columns = 1
             if self.plot_style == 'horizontal':
                 plot, sub_plots = plt.subplots(1, len(plot_data), sharey=True)
+                columns = len(plot_data)
             else:
                 plot, sub_plots = plt.subplots(len(plot_data), sharex=True)
 
             plot.subplots_adjust(hspace=0.25, wspace=0.25)
-            for i in enumerate(plot_data):
-                sub_plots[i].set_title(self.file_path[i].split('/')[-1][:-3])
-                plt.xlabel(plot_data[i].x_label)
-                plt.ylabel(plot_data[i].y_label)
-                for line in plot_data[i].get_draw_lines():
-                    sub_plots[i].plot(*line)
-
-        plt.draw()
-        plt.show()
-        plt.close()
-        print('\n')
+            # Shared axes only need their label once, the y label of a
+            #     column of plots goes on its middle row
+            x_labeled = len(plot_data) - 1
+            y_labeled = 0 if columns > 1 else len(plot_data) // 2
+            for i in range(len(plot_data)):
+                sub_plots[i].set_title(self.title(i))
+                if columns > 1 or i == x_labeled:
+                    sub_plots[i].set_xlabel(plot_data[i].x_label)
+                if i == y_labeled:
+                    sub_plots[i].set_ylabel(plot_data[i].y_label)
+                self.draw_lines(sub_plots[i], plot_data[i], columns)
+
+        self.finish(save_path)
+        if save_path is None and self.save_path is None:
+            print('\n')
 
 
     def info(self):
         """Prints general information about files."""
         for i, obj in enumerate(self.files):
-            print(self.file_path[i].split('/')[-1][:-3])
+            print(self.title(i))
             obj.info()
             print('\n')
 
@@ -125,21 +181,19 @@ class Evaluate(object):
 
     def plot_standards(self):
         """Plots standard deviation of video framerate drops."""
+        plt = import_pyplot()
         mean_value = []
         deviations = []
         for obj in self.files:
             mean_value.append(obj.get_mean_difference())
             deviations.append(obj.get_standard_deviation())
 
-        bar = None
         _, ax = plt.subplots()
-        with sorted(range(len(mean_value))) as axb:
-            bar = ax.bar(axb, (lambda x: mean_value[x]),
-                         mean_value, yerr=deviations)
+        ax.bar(range(len(mean_value)), mean_value, yerr=deviations)
+        ax.set_xticks(range(len(mean_value)))
+        ax.set_xticklabels([self.title(i) for i in range(len(mean_value))])
 
-        plt.draw()
-        plt.show()
-        plt.close()
+        self.finish()
 
 
     def plot_deviation(self, target_framerate):
@@ -152,7 +206,7 @@ class Evaluate(object):
         """
         plot_data = []
         for obj in self.files:
-            plot_data.append(obj.plot_framerate(target_framerate))
+            plot_data.append(obj.plot_deviation(target_framerate))
 
         self.plot(plot_data)
 
@@ -175,10 +229,36 @@ class Evaluate(object):
         self.plot(plot_data)
 
 
-    def apply_tracking(self, write=None, display=True):
+    def clock_models(self, reference=0, kind='auto'):
+        """Returns the camera_sync.ClockModel of each file against one.
+
+        The files are expected to be captures of the same scene from
+        different Pis, see camera_sync for how they are lined up.
+
+        Args:
+            reference: Index of the file whose clock the others are put on.
+            kind: Signal to line the files up with, see
+            camera_sync.stream_signal.
+        """
+        from camera_sync import align_files
+        return align_files(self.files, reference, kind)
+
+
+    def apply_tracking(self, write=None, display=True, queue_depth=32):
         """Applys tracking to multiple files."""
         for obj in self.files:
-            obj.apply_tracking(write, display)
+            obj.apply_tracking(write, display, queue_depth)
+
+
+    def render_events(self, out_dir, pre_sec=5, post_sec=5, kinds=None,
+                      mode='clips'):
+        """Renders the video around sleep, wake and buzz events of files."""
+        written = []
+        for obj in self.files:
+            written.extend(obj.render_events(out_dir, pre_sec, post_sec,
+                                             kinds, mode))
+        return written
+
 
     def plot_timestamps(self):
         """Plots timestamps from multiple files."""
@@ -190,13 +270,29 @@ class Evaluate(object):
 
 
     def plot_dropped_frames(self):
-        """Plots dropped frames from multiple files."""
-        plot_data = []
-        for obj in self.files:
-            plot_data.append(obj.plot_dropped_frames())
+        """Plots dropped frames from multiple files.
 
-        plt.bar([3, 2, 1], plot_data)
-        plt.xticks([3, 2, 1], ('480p @ 120', '720p @ 60', '1080p @ 30'))
+           Files are grouped by the resolution and framerate in their names,
+           so repetitions of the same settings share one bar showing their
+           mean. Drops are counted against the framerate in the name, or the
+           measured framerate when the name has none.
+        """
+        plt = import_pyplot()
+        catalog = Catalog(self.file_path)
+        dropped = {}
+        for (i, obj) in enumerate(self.files):
+            dropped[self.file_path[i]] = obj.plot_dropped_frames()
+
+        groups = catalog.group_by(catalog.runs, 'resolution', 'fps')
+        labels = []
+        plot_data = []
+        for runs in groups.values():
+            labels.append(runs[0].label())
+            plot_data.append(sum(dropped[run.path] for run in runs) /
+                             float(len(runs)))
+
+        positions = list(range(len(plot_data)))
+        plt.bar(positions, plot_data)
+        plt.xticks(positions, labels)
         plt.ylabel('Dropped Frames')
-        plt.show()
-        plt.close()
+        self.finish()
@@ -0,0 +1,248 @@
+"""Analyzes a whole directory of timestamp logs over a process pool and
+   writes one summary table.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import os
+import csv
+import json
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from file_analysis import FileAnalysis, TIMESTAMP_SUFFIXES
+from capture_catalog import parse_run_name
+from interval_histogram import IntervalHistogram
+
+# Columns of the summary table, in order, with the dtype used for the
+#     binary form
+SUMMARY_COLUMNS = (
+    ('name', 'U'),
+    ('path', 'U'),
+    ('resolution', 'U'),
+    ('container', 'U'),
+    ('repetition', 'i8'),
+    ('tags', 'U'),
+    ('duration_sec', 'f8'),
+    ('frames', 'i8'),
+    ('fps', 'f8'),
+    ('interval_std_ms', 'f8'),
+    ('p50_ms', 'f8'),
+    ('p99_ms', 'f8'),
+    ('p999_ms', 'f8'),
+    ('max_interval_ms', 'f8'),
+    ('target_fps', 'f8'),
+    ('dropped', 'i8'),
+    ('extra', 'i8'),
+    ('error', 'U'),
+)
+
+
+def find_logs(log_dir):
+    """Returns the sorted paths of every timestamp log in log_dir."""
+    paths = []
+    for name in os.listdir(log_dir):
+        if name.endswith(TIMESTAMP_SUFFIXES):
+            path = os.path.join(log_dir, name)
+            if os.path.isfile(path):
+                paths.append(path)
+    return sorted(paths)
+
+
+def summarize_file(path, target_framerate=None, use_cache=True):
+    """Returns one row of the summary table for a timestamp log.
+
+       A log that cannot be analyzed (for example an empty one) still gets
+       a row, with its error column filled in. Besides SUMMARY_COLUMNS the
+       row holds the serialized IntervalHistogram of the file (the sparse
+       to_dict() form, which stays small however many frames there are)
+       under 'histogram'.
+
+       Args:
+           path: The path to the timestamp log.
+           target_framerate: The framerate dropped and extra frames are
+           counted against, defaults to the framerate in the file name or
+           else the measured framerate.
+           use_cache: Whether the sidecar cache may be used.
+    """
+    run = parse_run_name(path)
+    if target_framerate is None:
+        target_framerate = run.fps
+    row = {'name': os.path.basename(path), 'path': path,
+           'resolution': run.resolution or '',
+           'container': run.container or '',
+           'repetition': run.repetition, 'tags': '_'.join(run.tags),
+           'duration_sec': np.nan, 'frames': 0, 'fps': np.nan,
+           'interval_std_ms': np.nan, 'p50_ms': np.nan, 'p99_ms': np.nan,
+           'p999_ms': np.nan, 'max_interval_ms': np.nan,
+           'target_fps': np.nan, 'dropped': 0, 'extra': 0, 'error': '',
+           'histogram': IntervalHistogram().to_dict()}
+    try:
+        analysis = FileAnalysis(path, use_cache)
+        slots = analysis.frame_slots(target_framerate)
+        row['duration_sec'] = analysis.total_time / 1000.0
+        row['frames'] = len(analysis.timestamps) - 1
+        row['fps'] = analysis.framerate
+        row['interval_std_ms'] = float(np.std(analysis.time_difference))
+        histogram = analysis.interval_histogram()
+        row['histogram'] = histogram.to_dict()
+        row['p50_ms'] = histogram.percentile(50)
+        row['p99_ms'] = histogram.percentile(99)
+        row['p999_ms'] = histogram.percentile(99.9)
+        row['max_interval_ms'] = histogram.percentile(100)
+        row['target_fps'] = slots.target_framerate
+        row['dropped'] = slots.dropped()
+        row['extra'] = slots.extras()
+    except Exception as e:
+        row['error'] = '%s: %s' % (type(e).__name__, e)
+    return row
+
+
+def _summarize_star(args):
+    """Unpacks the arguments for summarize_file inside a worker."""
+    return summarize_file(*args)
+
+
+def analyze_files(paths, workers=None, target_framerate=None, use_cache=True):
+    """Summarizes every timestamp log in paths.
+
+       Each file is analyzed independently, so the rows do not depend on
+       the number of workers; they are returned sorted by path.
+
+       Args:
+           paths: List of timestamp log paths.
+           workers: Number of worker processes, None for one per CPU and 1
+           to run in this process.
+           target_framerate: The framerate dropped and extra frames are
+           counted against, defaults to each file's named or measured
+           framerate.
+           use_cache: Whether the sidecar cache may be used.
+
+       Returns:
+           A list of row dicts keyed by SUMMARY_COLUMNS.
+    """
+    paths = sorted(paths)
+    jobs = [(path, target_framerate, use_cache) for path in paths]
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or len(jobs) <= 1:
+        return [_summarize_star(job) for job in jobs]
+
+    # Several files per task keeps the scheduling overhead small for large
+    #     directories while still balancing long and short logs
+    chunksize = max(1, len(jobs) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_summarize_star, jobs, chunksize=chunksize))
+
+
+def analyze_directory(log_dir, workers=None, target_framerate=None,
+                      use_cache=True):
+    """Summarizes every timestamp log found in log_dir."""
+    return analyze_files(find_logs(log_dir), workers, target_framerate,
+                         use_cache)
+
+
+def write_csv(rows, csv_path):
+    """Writes the summary rows as a CSV table."""
+    with open(csv_path, 'w', newline='') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow([name for (name, _) in SUMMARY_COLUMNS])
+        for row in rows:
+            writer.writerow([row[name] for (name, _) in SUMMARY_COLUMNS])
+
+
+def rows_to_columns(rows):
+    """Returns the summary rows as a dict of typed column arrays."""
+    columns = {}
+    for (name, dtype) in SUMMARY_COLUMNS:
+        columns[name] = np.array([row[name] for row in rows], dtype=dtype)
+    return columns
+
+
+def write_columns(rows, npz_path):
+    """Writes the summary rows as a binary columnar .npz table."""
+    np.savez(npz_path, **rows_to_columns(rows))
+
+
+def read_columns(npz_path):
+    """Reads a table written by write_columns into a dict of arrays."""
+    with np.load(npz_path) as table:
+        return dict((name, table[name]) for (name, _) in SUMMARY_COLUMNS)
+
+
+def aggregate_histograms(rows, fields=('resolution', 'fps', 'container',
+                                       'tags')):
+    """Merges the interval histograms of rows that share fields.
+
+       With the default fields every repetition of the same capture
+       settings ends up in one distribution.
+
+       Args:
+           rows: Rows from analyze_files().
+           fields: Row keys to group on. The named fps is used rather than
+           the measured one.
+
+       Returns:
+           A dict of tuple of field values to the merged IntervalHistogram.
+    """
+    merged = {}
+    for row in rows:
+        if row['error']:
+            continue
+        key = tuple(parse_run_name(row['path']).fps if field == 'fps'
+                    else row[field] for field in fields)
+        histogram = IntervalHistogram.from_dict(row['histogram'])
+        if key in merged:
+            merged[key].merge(histogram)
+        else:
+            merged[key] = histogram
+    return merged
+
+
+def write_histograms(rows, json_path):
+    """Writes the interval histogram of every row as JSON keyed by path."""
+    with open(json_path, 'w') as json_file:
+        json.dump(dict((row['path'], row['histogram'])
+                       for row in rows), json_file)
+
+
+def read_histograms(json_path):
+    """Reads a file written by write_histograms into a dict of histograms."""
+    with open(json_path, 'r') as json_file:
+        return dict((path, IntervalHistogram.from_dict(data))
+                    for (path, data) in json.load(json_file).items())
+
+
+def write_summary(rows, out_path):
+    """Writes out_path.csv, out_path.npz and out_path.hist.json."""
+    write_csv(rows, out_path + '.csv')
+    write_columns(rows, out_path + '.npz')
+    write_histograms(rows, out_path + '.hist.json')
+
+
+def main():
+    """Runs a batch analysis from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('log_dir', help='Directory of timestamp logs')
+    parser.add_argument('-o', '--output', default='summary',
+                        help='Output path without extension')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='Worker processes (default: one per CPU)')
+    parser.add_argument('-f', '--fps', type=float, default=None,
+                        help='Target framerate for dropped/extra frames')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not use the parsed log cache')
+    args = parser.parse_args()
+
+    rows = analyze_directory(args.log_dir, args.workers, args.fps,
+                             not args.no_cache)
+    write_summary(rows, args.output)
+    print('Wrote %i rows to %s.csv, %s.npz and %s.hist.json' %
+          (len(rows), args.output, args.output, args.output))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""Renders Evaluate plots straight to PNG files without a display, one per
+   log or one per group of repeated captures.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import os
+import argparse
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from analysis_tools import Evaluate
+from capture_catalog import Catalog
+
+# Plots that can be rendered, mapped to whether they take a target framerate
+PLOTS = {
+    'framerate': False,
+    'deviation': True,
+    'relative_deviation': False,
+    'timestamps': False,
+    'standards': False,
+    'dropped_frames': False,
+}
+
+
+def render(paths, save_path, plot='framerate', target_framerate=None,
+           use_cache=True):
+    """Renders one plot of the logs in paths to save_path.
+
+       Args:
+           paths: List of timestamp log paths shown together in the figure.
+           save_path: The image file to write.
+           plot: Which Evaluate plot to draw, one of PLOTS.
+           target_framerate: Framerate for the 'deviation' plot.
+           use_cache: Whether the sidecar cache may be used.
+    """
+    if plot not in PLOTS:
+        raise ValueError('Unknown plot %r' % plot)
+    plt.switch_backend('Agg')
+
+    evaluate = Evaluate(list(paths), use_cache)
+    evaluate.save_path = save_path
+    method = getattr(evaluate, 'plot_' + plot)
+    if PLOTS[plot]:
+        method(target_framerate)
+    else:
+        method()
+
+
+def render_files(paths, out_dir, plot='framerate', use_cache=True):
+    """Renders plot for every log on its own, named after the log.
+
+       Returns:
+           A list of the image paths written.
+    """
+    catalog = Catalog(paths)
+    written = []
+    for run in catalog.runs:
+        save_path = os.path.join(out_dir, '%s.%s.png' % (run.name, plot))
+        try:
+            render([run.path], save_path, plot, run.fps, use_cache)
+        except Exception as e:
+            print('Warning! Could not render %s: %s' % (run.path, e))
+            plt.close('all')
+            continue
+        written.append(save_path)
+    return written
+
+
+def render_groups(paths, out_dir, plot='framerate', per_figure=4,
+                  fields=('resolution', 'fps', 'container', 'tags'),
+                  use_cache=True):
+    """Renders repetitions of the same capture settings side by side.
+
+       Runs are grouped with the capture catalog; each group is split into
+       figures of at most per_figure runs, in the style of results/.
+
+       Returns:
+           A list of the image paths written.
+    """
+    catalog = Catalog(paths)
+    written = []
+    for runs in catalog.group_by(catalog.runs, *fields).values():
+        run = runs[0]
+        name = '%s@%g' % (run.resolution or 'unknown', run.fps or 0)
+        if run.container:
+            name += '_' + run.container
+        if run.tags:
+            name += '_' + '_'.join(run.tags)
+
+        for start in range(0, len(runs), per_figure):
+            part = runs[start:start + per_figure]
+            suffix = '' if start == 0 else '.%i' % (start // per_figure)
+            save_path = os.path.join(out_dir, '%s%s.%s.png' %
+                                     (name, suffix, plot))
+            try:
+                render([r.path for r in part], save_path, plot, run.fps,
+                       use_cache)
+            except Exception as e:
+                print('Warning! Could not render %s: %s' % (save_path, e))
+                plt.close('all')
+                continue
+            written.append(save_path)
+    return written
+
+
+def main():
+    """Renders plots for a directory of logs from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('log_dir', help='Directory of timestamp logs')
+    parser.add_argument('out_dir', help='Directory to write PNGs to')
+    parser.add_argument('-p', '--plot', default='framerate',
+                        choices=sorted(PLOTS), help='Plot to draw')
+    parser.add_argument('-g', '--group', action='store_true',
+                        help='Put repetitions of a capture in one figure')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.out_dir):
+        os.makedirs(args.out_dir)
+    paths = [run.path for run in Catalog.from_directory(args.log_dir).runs]
+    if args.group:
+        written = render_groups(paths, args.out_dir, args.plot)
+    else:
+        written = render_files(paths, args.out_dir, args.plot)
+    print('Wrote %i images to %s' % (len(written), args.out_dir))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,293 @@
+"""Times the analysis hot paths on synthetic captures of any length and
+   stores the results as JSON so that runs can be compared across commits.
+
+   The logs of each capture size are generated and written by this
+   process, then analysed in a fresh worker process, so the peak RSS
+   reported is that of the analysis alone rather than of generating the
+   data or of the largest size seen so far.
+
+   Usage examples:
+       python benchmark.py -o before.json
+       python benchmark.py --frames 10000 10000000 -o after.json \\
+           --compare before.json
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+# Capture lengths benchmarked by default, 10M frames is left to --frames
+DEFAULT_FRAMES = (10000, 100000, 1000000)
+
+# Analysis stages timed and compared, in the order they run
+STAGES = ('load', 'find_info', 'drop_classification', 'deviation_prep',
+          'tracking_distance', 'sleep_detection')
+
+
+def synthetic_timestamps(frames, fps=30.0, jitter_ms=1.0, drop_rate=0.001,
+                         stall_rate=0.0001, stall_ms=500.0, seed=0):
+    """Returns timestamps in ms that look like a capture's.
+
+       Args:
+           frames: Number of timestamps.
+           fps: The framerate frames are captured at.
+           jitter_ms: Standard deviation of the timing noise.
+           drop_rate: Chance that a frame slot is skipped.
+           stall_rate: Chance that the capture stalls before a frame.
+           stall_ms: Mean length of a stall, exponentially distributed.
+           seed: Random seed, the same seed gives the same capture.
+    """
+    rng = np.random.RandomState(seed)
+    gap = 1000.0 / fps
+    # Dropped slots add a whole frame gap before the next frame
+    slots = rng.geometric(1.0 - drop_rate, frames) if drop_rate > 0 \
+        else np.ones(frames)
+    intervals = slots * gap
+    stalls = rng.random_sample(frames) < stall_rate
+    intervals[stalls] += rng.exponential(stall_ms, int(stalls.sum()))
+    timestamps = np.cumsum(intervals) + rng.normal(0, jitter_ms, frames)
+    return np.maximum.accumulate(np.maximum(timestamps, 0))
+
+
+def synthetic_tracking(frames, width=640, height=480, still_rate=0.0005,
+                       still_frames=1200, buzz_rate=0.0002, seed=0):
+    """Returns tracking boxes of a subject wandering with rests.
+
+       Args:
+           frames: Number of boxes.
+           width: Width of the frame in pixels.
+           height: Height of the frame in pixels.
+           still_rate: Chance of a rest starting at a frame.
+           still_frames: Mean length of a rest in frames.
+           buzz_rate: Chance of a buzz at a frame.
+           seed: Random seed.
+
+       Returns:
+           An (frames, 5) int64 array of x0, y0, x1, y1, buzz rows.
+    """
+    rng = np.random.RandomState(seed)
+    steps = rng.randint(-2, 3, (frames, 2))
+    # Rests are stretches where the box does not move at all
+    rest_starts = np.flatnonzero(rng.random_sample(frames) < still_rate)
+    resting = np.zeros(frames + 1, dtype=np.int64)
+    ends = np.minimum(rest_starts + rng.exponential(
+        still_frames, len(rest_starts)).astype(np.int64) + 1, frames)
+    np.add.at(resting, rest_starts, 1)
+    np.add.at(resting, ends, -1)
+    steps[np.cumsum(resting)[:frames] > 0] = 0
+
+    centre = np.cumsum(steps, axis=0) + (width // 2, height // 2)
+    centre[:, 0] = np.abs((centre[:, 0] - 40) % (2 * (width - 80)) -
+                          (width - 80)) + 40
+    centre[:, 1] = np.abs((centre[:, 1] - 40) % (2 * (height - 80)) -
+                          (height - 80)) + 40
+    boxes = np.empty((frames, 5), dtype=np.int64)
+    boxes[:, 0:2] = centre - 30
+    boxes[:, 2:4] = centre + 30
+    boxes[:, 4] = rng.random_sample(frames) < buzz_rate
+    return boxes
+
+
+def write_logs(path_name, timestamps, boxes):
+    """Writes a .timestamp.log and .tracking.log for path_name."""
+    with io.open(path_name + '.timestamp.log', 'w') as timestamp_file:
+        timestamp_file.write(u'\n'.join(map(u'{:.6f}'.format,
+                                            timestamps.tolist())) + u'\n')
+    # The first line of a tracking log does not belong to a frame
+    lines = [u'0,0,0,0']
+    lines.extend(u'%i,%i,%i,%i,%i' % tuple(row) for row in boxes.tolist())
+    with io.open(path_name + '.tracking.log', 'w') as tracking_file:
+        tracking_file.write(u'\n'.join(lines) + u'\n')
+
+
+def peak_rss_mb():
+    """Returns the peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024.0 * 1024.0 if sys.platform == 'darwin' else 1024.0)
+
+
+def prepare_size(work_dir, frames, fps=30.0, jitter_ms=1.0,
+                 drop_rate=0.001, stall_rate=0.0001, seed=0):
+    """Generates one capture and writes its logs into work_dir.
+
+       Returns:
+           A tuple of the path name of the logs and the seconds it took.
+    """
+    path_name = os.path.join(work_dir, 'synthetic.yuv')
+    began = time.perf_counter()
+    timestamps = synthetic_timestamps(frames, fps, jitter_ms, drop_rate,
+                                      stall_rate, seed=seed)
+    boxes = synthetic_tracking(frames, seed=seed)
+    write_logs(path_name, timestamps, boxes)
+    return (path_name, time.perf_counter() - began)
+
+
+def run_size(path_name, frames, fps=30.0):
+    """Times every analysis stage on the logs of path_name.
+
+       Meant to run in a fresh process, see run_benchmarks.
+
+       Returns:
+           A dict with the frames, the seconds and frames/sec of each
+           stage, and the peak RSS.
+    """
+    from file_analysis import FileAnalysis
+
+    stages = (
+        ('load', lambda analysis: (analysis.timestamps,
+                                   analysis.tracking_boxes)),
+        ('find_info', lambda analysis: analysis.find_info()),
+        ('drop_classification',
+         lambda analysis: analysis.frame_slots(fps).dropped()),
+        ('deviation_prep', lambda analysis: analysis.plot_deviation(fps)),
+        ('tracking_distance', lambda analysis: analysis.plot_tracking()),
+        ('sleep_detection', lambda analysis: analysis.sleep_episodes()),
+    )
+    seconds = {}
+    analysis = FileAnalysis(path_name + '.timestamp.log', False)
+    for (stage, run) in stages:
+        began = time.perf_counter()
+        run(analysis)
+        seconds[stage] = time.perf_counter() - began
+
+    return {
+        'frames': frames,
+        'seconds': seconds,
+        'frames_per_sec': dict((stage, frames / value if value else None)
+                               for (stage, value) in seconds.items()),
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def _run_size_star(args):
+    """Unpacks the arguments for run_size inside a worker."""
+    return run_size(*args)
+
+
+def git_commit():
+    """Returns the commit the scripts are at, or None outside git."""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.STDOUT).decode('ascii').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes=DEFAULT_FRAMES, fps=30.0, jitter_ms=1.0,
+                   drop_rate=0.001, stall_rate=0.0001, seed=0):
+    """Benchmarks every capture size, each in its own process.
+
+       Returns:
+           A JSON friendly dict of the environment and a result per size.
+    """
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for frames in sizes:
+        work_dir = tempfile.mkdtemp(prefix='picam_benchmark_')
+        try:
+            (path_name, write_seconds) = prepare_size(
+                work_dir, frames, fps, jitter_ms, drop_rate, stall_rate,
+                seed)
+            with ProcessPoolExecutor(max_workers=1,
+                                     mp_context=context) as executor:
+                result = executor.submit(
+                    _run_size_star, (path_name, frames, fps)).result()
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        # Kept for reference, it times the generator rather than analysis
+        result['write_seconds'] = write_seconds
+        results.append(result)
+    return {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'settings': {'fps': fps, 'jitter_ms': jitter_ms,
+                     'drop_rate': drop_rate, 'stall_rate': stall_rate,
+                     'seed': seed},
+        'results': results,
+    }
+
+
+def compare(old, new):
+    """Returns lines comparing the frames/sec of two benchmark runs."""
+    old_results = dict((result['frames'], result)
+                       for result in old['results'])
+    lines = ['%-10s %-20s %12s %12s %8s' %
+             ('frames', 'stage', 'old fps', 'new fps', 'speedup')]
+    for result in new['results']:
+        previous = old_results.get(result['frames'])
+        if previous is None:
+            continue
+        for stage in STAGES:
+            before = previous['frames_per_sec'].get(stage)
+            after = result['frames_per_sec'].get(stage)
+            if not before or not after:
+                continue
+            lines.append('%-10i %-20s %12.0f %12.0f %7.2fx' %
+                         (result['frames'], stage, before, after,
+                          after / before))
+    return lines
+
+
+def main():
+    """Runs the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--frames', type=int, nargs='+',
+                        default=list(DEFAULT_FRAMES),
+                        help='Capture lengths to benchmark')
+    parser.add_argument('--fps', type=float, default=30.0,
+                        help='Framerate of the synthetic captures')
+    parser.add_argument('--jitter', type=float, default=1.0,
+                        help='Timing noise in ms')
+    parser.add_argument('--drop-rate', type=float, default=0.001,
+                        help='Chance of a dropped frame slot')
+    parser.add_argument('--stall-rate', type=float, default=0.0001,
+                        help='Chance of a capture stall')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('-o', '--output', default=None,
+                        help='JSON file to write the results to')
+    parser.add_argument('--compare', default=None,
+                        help='Earlier JSON results to compare against')
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.frames, args.fps, args.jitter,
+                            args.drop_rate, args.stall_rate, args.seed)
+    for result in report['results']:
+        print('%i frames, peak RSS %.0f MB, written in %.3f s' %
+              (result['frames'], result['peak_rss_mb'],
+               result['write_seconds']))
+        for stage in STAGES:
+            print('    %-20s %10.3f s %14.0f frames/s' %
+                  (stage, result['seconds'][stage],
+                   result['frames_per_sec'][stage] or 0))
+
+    if args.output is not None:
+        with io.open(args.output, 'w') as json_file:
+            json_file.write(json.dumps(report, indent=2, sort_keys=True))
+    if args.compare is not None:
+        with io.open(args.compare, 'r') as json_file:
+            old = json.loads(json_file.read())
+        print('\n'.join(compare(old, report)))
+
+
+if __name__ == '__main__':
+    main()
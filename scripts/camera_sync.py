@@ -0,0 +1,492 @@
+"""Estimates the clock offset and drift between captures of the same scene
+   made on different Pis, and joins them onto one timeline.
+
+   Each timestamp log starts from its own zero and each Pi's clock runs at
+   a slightly different rate. A stream is turned into a signal sampled on
+   a regular grid, either the motion of its tracking box or the excess of
+   its frame intervals (stalls and drops), and the signals are cross
+   correlated with FFTs. The lag of the whole capture gives the offset and
+   the lags of windows along it give the drift, so a model maps every
+   stream's timestamps onto the reference stream's clock.
+
+   The aligned streams are then joined with a sorted merge: every stream
+   is already in time order, so the common timeline is a merge of the
+   streams and each stream's frame at a time is found by binary search.
+
+   Usage examples:
+       python camera_sync.py ../logs/*_OOC_mypi.yuv.timestamp.log \\
+           ../logs/*_OOC_altpi.yuv.timestamp.log
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import argparse
+import numpy as np
+
+# Width of one sample of a stream's signal in ms
+DEFAULT_BIN_MS = 5.0
+
+# Length of the windows the drift is measured over, in ms
+DEFAULT_WINDOW_MS = 60000.0
+
+# Captures too short for this many windows get shorter windows
+MIN_WINDOWS = 8
+
+# Fewest windows that agree on a line for the drift to be estimated
+MIN_FIT_WINDOWS = 4
+
+# How far a window's lag may stray from the whole capture's lag, in ms
+DEFAULT_SEARCH_MS = 2000.0
+
+
+class ClockModel(object):
+    """Maps a stream's timestamps onto the reference stream's clock.
+
+       reference_ms = timestamp_ms * (1 + drift) + offset_ms
+
+       Attributes:
+           offset_ms: Reference time of the stream's zero in ms.
+           drift: How much faster the reference clock runs, as a fraction
+           (1e-6 is one ppm).
+           score: Normalized correlation of the signals at the estimated
+           lag, from 0 (no match) to 1. Estimates with a low score should
+           not be trusted.
+           windows: Number of windows the drift was fitted to.
+    """
+    __slots__ = ('offset_ms', 'drift', 'score', 'windows')
+
+    def __init__(self, offset_ms=0.0, drift=0.0, score=1.0, windows=0):
+        self.offset_ms = offset_ms
+        self.drift = drift
+        self.score = score
+        self.windows = windows
+
+
+    def to_reference(self, timestamps):
+        """Returns timestamps in ms on the reference clock."""
+        return np.asarray(timestamps, dtype=np.float64) * (1.0 + self.drift) \
+            + self.offset_ms
+
+
+    def from_reference(self, timestamps):
+        """Returns reference clock times in ms on this stream's clock."""
+        return (np.asarray(timestamps, dtype=np.float64) - self.offset_ms) \
+            / (1.0 + self.drift)
+
+
+    def drift_ppm(self):
+        """Returns the drift in parts per million."""
+        return self.drift * 1e6
+
+
+    def __repr__(self):
+        return 'ClockModel(offset_ms=%.3f, drift_ppm=%.2f, score=%.3f)' % \
+            (self.offset_ms, self.drift_ppm(), self.score)
+
+
+def _standardize(signal):
+    """Returns signal with zero mean and unit variance."""
+    signal = signal - signal.mean()
+    scale = signal.std()
+    return signal / scale if scale > 0 else signal
+
+
+def interval_signal(timestamps, bin_ms=DEFAULT_BIN_MS):
+    """Returns the stalls and drops of a stream as a signal.
+
+       Each frame adds how much longer than the median its interval was to
+       the sample it lands in, so the signal is zero while frames arrive
+       steadily and spikes wherever the capture hiccuped.
+
+       Args:
+           timestamps: Array of the stream's timestamps in ms.
+           bin_ms: Width of one sample in ms.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    samples = int(timestamps[-1] // bin_ms) + 1 if len(timestamps) else 0
+    if len(timestamps) < 2:
+        return np.zeros(samples)
+    intervals = np.diff(timestamps)
+    excess = np.maximum(intervals - np.median(intervals), 0.0)
+    bins = (timestamps[1:] // bin_ms).astype(np.int64)
+    return _standardize(np.bincount(bins, excess, samples))
+
+
+def motion_signal(timestamps, boxes, bin_ms=DEFAULT_BIN_MS):
+    """Returns how fast a stream's tracking box moves as a signal.
+
+       The distance the box centre moves between frames, in px/ms, is
+       interpolated onto the samples so gaps between frames do not show up
+       as stillness.
+
+       Args:
+           timestamps: Array of the stream's timestamps in ms.
+           boxes: Array of the stream's tracking boxes, x0, y0, x1, y1 in
+           the first four columns and one row per timestamp.
+           bin_ms: Width of one sample in ms.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    boxes = np.asarray(boxes, dtype=np.float64)[:len(timestamps), :4]
+    timestamps = timestamps[:len(boxes)]
+    samples = int(timestamps[-1] // bin_ms) + 1 if len(timestamps) else 0
+    if len(timestamps) < 2:
+        return np.zeros(samples)
+    centres = (boxes[:, 0:2] + boxes[:, 2:4]) / 2.0
+    distance = np.hypot(*np.diff(centres, axis=0).T)
+    speed = distance / np.maximum(np.diff(timestamps), 1e-3)
+    grid = (np.arange(samples) + 0.5) * bin_ms
+    return _standardize(np.interp(grid, timestamps[1:], speed))
+
+
+def stream_signal(timestamps, boxes=None, kind='auto',
+                  bin_ms=DEFAULT_BIN_MS):
+    """Returns the signal of a stream used to line it up with others.
+
+       Args:
+           timestamps: Array of the stream's timestamps in ms.
+           boxes: Optional array of the stream's tracking boxes.
+           kind: 'motion', 'intervals', or 'auto' for motion when there
+           are tracking boxes.
+           bin_ms: Width of one sample in ms.
+    """
+    if kind == 'auto':
+        kind = 'motion' if boxes is not None and len(boxes) > 1 else \
+            'intervals'
+    if kind == 'motion':
+        return motion_signal(timestamps, boxes, bin_ms)
+    if kind == 'intervals':
+        return interval_signal(timestamps, bin_ms)
+    raise ValueError('Unknown signal kind %r' % kind)
+
+
+def _fft_size(length):
+    """Returns the power of two at least length."""
+    return 1 << max(int(length) - 1, 0).bit_length()
+
+
+def _peak(correlation, lags, norm):
+    """Returns the sub-sample lag and normalized height of the highest peak.
+
+       Args:
+           correlation: Array of correlations, the last axis over lags.
+           lags: Array of the lag of each correlation in samples.
+           norm: Array of what each row is divided by to normalize it.
+    """
+    best = np.argmax(correlation, axis=-1)
+    rows = np.arange(correlation.shape[0])
+    height = correlation[rows, best]
+    # A parabola through the peak and its neighbours places it between
+    #     samples
+    left = correlation[rows, np.maximum(best - 1, 0)]
+    right = correlation[rows, np.minimum(best + 1, correlation.shape[1] - 1)]
+    curve = left - 2.0 * height + right
+    shift = np.where(curve < 0, 0.5 * (left - right) / np.where(
+        curve < 0, curve, 1.0), 0.0)
+    inside = (best > 0) & (best < correlation.shape[1] - 1)
+    shift = np.where(inside, np.clip(shift, -0.5, 0.5), 0.0)
+    score = np.where(norm > 0, height / np.where(norm > 0, norm, 1.0), 0.0)
+    return (lags[best] + shift, score)
+
+
+def cross_correlate(reference, signal, max_lag=None):
+    """Finds the lag that lines signal up with reference.
+
+       A lag of k means that what happens at sample i of signal happens at
+       sample i + k of reference.
+
+       Args:
+           reference: Array of the reference signal.
+           signal: Array of the signal to line up.
+           max_lag: Largest lag to consider, in samples, or None for any.
+
+       Returns:
+           A tuple of the lag in (fractional) samples and the normalized
+           correlation at it.
+    """
+    size = _fft_size(len(reference) + len(signal) - 1)
+    correlation = np.fft.irfft(np.fft.rfft(reference, size) *
+                               np.conj(np.fft.rfft(signal, size)), size)
+    # Negative lags wrap around to the end of the circular correlation
+    lags = np.arange(-(len(signal) - 1), len(reference))
+    correlation = correlation[lags % size]
+    if max_lag is not None:
+        inside = np.abs(lags) <= max_lag
+        (lags, correlation) = (lags[inside], correlation[inside])
+    norm = np.sqrt(np.dot(reference, reference) * np.dot(signal, signal))
+    (lag, score) = _peak(correlation[np.newaxis], lags, np.array([norm]))
+    return (float(lag[0]), float(score[0]))
+
+
+def window_lags(reference, signal, lag, window, search):
+    """Finds the lag of each window of signal near an expected lag.
+
+       All windows are correlated at once with one batched FFT.
+
+       Args:
+           reference: Array of the reference signal.
+           signal: Array of the signal to line up.
+           lag: The expected lag in samples, e.g. of the whole capture.
+           window: Length of a window in samples.
+           search: How far each window's lag may be from lag, in samples.
+
+       Returns:
+           A tuple of arrays: the centre of each window in samples of
+           signal, its lag in samples and its normalized correlation.
+           Windows without reference signal around them are left out.
+    """
+    lag = int(round(lag))
+    starts = np.arange(0, len(signal) - window + 1, window)
+    # The reference segment a window could line up with
+    segment_starts = starts + lag - search
+    keep = (segment_starts >= 0) & \
+        (segment_starts + window + 2 * search <= len(reference))
+    (starts, segment_starts) = (starts[keep], segment_starts[keep])
+    if len(starts) == 0:
+        empty = np.zeros(0)
+        return (empty, empty, empty)
+
+    windows = signal[starts[:, np.newaxis] + np.arange(window)]
+    segments = reference[segment_starts[:, np.newaxis] +
+                         np.arange(window + 2 * search)]
+    windows = windows - windows.mean(axis=1, keepdims=True)
+    segments = segments - segments.mean(axis=1, keepdims=True)
+
+    size = _fft_size(window + 2 * search + window - 1)
+    correlation = np.fft.irfft(np.fft.rfft(segments, size, axis=1) *
+                               np.conj(np.fft.rfft(windows, size, axis=1)),
+                               size, axis=1)[:, :2 * search + 1]
+    # Normalized by the energy of the window and of the part of the segment
+    #     it is compared against, which changes with the lag
+    energy = np.cumsum(np.concatenate((np.zeros((len(segments), 1)),
+                                       segments ** 2), axis=1), axis=1)
+    overlap = energy[:, window:window + 2 * search + 1] - \
+        energy[:, :2 * search + 1]
+    window_energy = np.sum(windows ** 2, axis=1, keepdims=True)
+    scale = np.sqrt(overlap * window_energy)
+    correlation = np.where(scale > 0, correlation / np.where(
+        scale > 0, scale, 1.0), 0.0)
+    (lags, score) = _peak(correlation, np.arange(-search, search + 1),
+                          np.ones(len(correlation)))
+    # A window that is almost flat, e.g. while the subject sleeps, matches
+    #     any flat stretch of the reference perfectly
+    flat = window_energy[:, 0] < 0.01 * window * np.mean(signal ** 2)
+    score[flat] = 0.0
+    return (starts + window / 2.0, lags + lag, score)
+
+
+def estimate_clock(reference, signal, bin_ms=DEFAULT_BIN_MS,
+                   window_ms=DEFAULT_WINDOW_MS, search_ms=DEFAULT_SEARCH_MS,
+                   max_offset_ms=None, min_score=0.2):
+    """Estimates the ClockModel that lines signal up with reference.
+
+       The offset comes from correlating the whole signals. The drift is
+       the slope of a line through the lags of windows along the capture:
+       a median of pairwise slopes finds the windows that agree, and a
+       line weighted by how well each matched is fitted to them. With
+       fewer than MIN_FIT_WINDOWS agreeing windows, or a capture too short
+       to split into windows, only the offset is estimated.
+
+       Window lags are found to a fraction of bin_ms, so the drift is only
+       good to a few ppm on a 20 minute capture and gets better the longer
+       the capture.
+
+       Args:
+           reference: Signal of the reference stream (see stream_signal).
+           signal: Signal of the stream to line up, with the same bin_ms.
+           bin_ms: Width of one sample in ms.
+           window_ms: Length of the windows the drift is measured over.
+           search_ms: How far a window's lag may stray from the whole
+           capture's lag.
+           max_offset_ms: Largest offset to consider, or None for any.
+           min_score: Windows matching worse than this are ignored.
+    """
+    max_lag = None if max_offset_ms is None else int(max_offset_ms / bin_ms)
+    (lag, score) = cross_correlate(reference, signal, max_lag)
+    model = ClockModel(lag * bin_ms, 0.0, score, 0)
+
+    # Short captures are split into at least MIN_WINDOWS windows
+    window = min(int(window_ms / bin_ms), len(signal) // MIN_WINDOWS)
+    if window < 1:
+        return model
+    (centres, lags, scores) = window_lags(
+        reference, signal, lag, window, min(int(search_ms / bin_ms), window))
+    (centres, lags) = (centres * bin_ms, lags * bin_ms)
+    good = np.flatnonzero(scores >= min_score)
+    if len(good) < MIN_FIT_WINDOWS:
+        return model
+
+    # The median slope between every pair of windows is not thrown off by
+    #     a window that matched the wrong stretch
+    (first, second) = np.triu_indices(len(good), 1)
+    rise = lags[good[second]] - lags[good[first]]
+    run = centres[good[second]] - centres[good[first]]
+    slope = np.median(rise / run)
+    intercept = np.median(lags[good] - slope * centres[good])
+
+    # The line is fitted again to the windows that lie near it
+    residual = np.abs(lags[good] - (slope * centres[good] + intercept))
+    spread = np.median(residual)
+    good = good[residual <= max(3.0 * spread, 2.0 * bin_ms)]
+    if len(good) < MIN_FIT_WINDOWS:
+        return model
+    # reference = t + lag(t), with lag(t) = slope * t + intercept
+    (slope, intercept) = np.polyfit(centres[good], lags[good], 1,
+                                    w=scores[good])
+    model.offset_ms = float(intercept)
+    model.drift = float(slope)
+    model.windows = len(good)
+    return model
+
+
+def align_streams(streams, reference=0, kind='auto', bin_ms=DEFAULT_BIN_MS,
+                  **estimate_args):
+    """Estimates the ClockModel of every stream against one of them.
+
+       Args:
+           streams: List of (timestamps, boxes) tuples, boxes may be None.
+           reference: Index of the stream whose clock the others are put
+           on.
+           kind: Signal kind, see stream_signal. With 'auto' motion is only
+           used if every stream has tracking boxes.
+           bin_ms: Width of one sample in ms.
+           estimate_args: Passed on to estimate_clock.
+
+       Returns:
+           A list of ClockModels, one per stream.
+    """
+    if kind == 'auto':
+        kind = 'motion' if all(boxes is not None and len(boxes) > 1
+                               for (_, boxes) in streams) else 'intervals'
+    signals = [stream_signal(timestamps, boxes, kind, bin_ms)
+               for (timestamps, boxes) in streams]
+    models = []
+    for (i, signal) in enumerate(signals):
+        if i == reference:
+            models.append(ClockModel())
+        else:
+            models.append(estimate_clock(signals[reference], signal, bin_ms,
+                                         **estimate_args))
+    return models
+
+
+def align_files(analyses, reference=0, kind='auto', **estimate_args):
+    """Estimates the ClockModel of every FileAnalysis against one of them."""
+    streams = [(analysis.timestamps,
+                analysis.tracking_boxes if analysis.tracking else None)
+               for analysis in analyses]
+    return align_streams(streams, reference, kind, **estimate_args)
+
+
+class Timeline(object):
+    """Several streams joined onto the reference clock.
+
+       Attributes:
+           times: Array of the timeline's times in reference ms.
+           frames: (streams, len(times)) int64 array of the index of each
+           stream's latest frame at or before each time, -1 where it has
+           none (or none recent enough).
+    """
+    __slots__ = ('times', 'frames')
+
+    def __init__(self, times, frames):
+        self.times = times
+        self.frames = frames
+
+
+    def __len__(self):
+        return len(self.times)
+
+
+    def complete(self):
+        """Returns a boolean array, True where every stream has a frame."""
+        return np.all(self.frames >= 0, axis=0)
+
+
+def join_streams(aligned, times=None, tolerance_ms=None):
+    """Joins aligned streams onto one timeline, as of each time.
+
+       Args:
+           aligned: List of arrays of each stream's timestamps on the
+           reference clock (see ClockModel.to_reference), each sorted.
+           times: Array of the times to join at, sorted. Defaults to every
+           stream's timestamps merged together.
+           tolerance_ms: Frames older than this at a time are not used,
+           None to always use the latest frame.
+
+       Returns:
+           A Timeline.
+    """
+    aligned = [np.asarray(stream, dtype=np.float64) for stream in aligned]
+    if times is None:
+        # Each stream is a sorted run, which a stable sort merges in
+        #     linear time
+        times = np.sort(np.concatenate(aligned), kind='stable')
+    times = np.asarray(times, dtype=np.float64)
+
+    frames = np.full((len(aligned), len(times)), -1, dtype=np.int64)
+    for (i, stream) in enumerate(aligned):
+        if len(stream) == 0:
+            continue
+        index = np.searchsorted(stream, times, side='right') - 1
+        if tolerance_ms is not None:
+            late = times - stream[np.maximum(index, 0)] > tolerance_ms
+            index[late] = -1
+        frames[i] = index
+    return Timeline(times, frames)
+
+
+def resample_streams(aligned, framerate, tolerance_ms=None):
+    """Joins aligned streams onto a regular grid at framerate.
+
+       The grid covers the time every stream was capturing, so it is empty
+       when there are no streams or one of them has no frames.
+
+       Args:
+           aligned: List of arrays of each stream's timestamps on the
+           reference clock, each sorted.
+           framerate: Frames/sec of the grid.
+           tolerance_ms: See join_streams.
+
+       Returns:
+           A Timeline.
+    """
+    aligned = [np.asarray(stream, dtype=np.float64) for stream in aligned]
+    if not aligned or min(len(stream) for stream in aligned) == 0:
+        return join_streams(aligned, np.zeros(0), tolerance_ms)
+    start = max(stream[0] for stream in aligned)
+    end = min(stream[-1] for stream in aligned)
+    times = np.arange(start, end, 1000.0 / framerate)
+    return join_streams(aligned, times, tolerance_ms)
+
+
+def main():
+    """Prints the clock offset and drift of logs against the first one."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('paths', nargs='+',
+                        help='Timestamp logs, the first is the reference')
+    parser.add_argument('-k', '--kind', default='auto',
+                        choices=('auto', 'motion', 'intervals'),
+                        help='Signal to line the streams up with')
+    parser.add_argument('-b', '--bin-ms', type=float, default=DEFAULT_BIN_MS,
+                        help='Width of one signal sample in ms')
+    parser.add_argument('-w', '--window-ms', type=float,
+                        default=DEFAULT_WINDOW_MS,
+                        help='Window the drift is measured over in ms')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not use the parsed log cache')
+    args = parser.parse_args()
+
+    from file_analysis import FileAnalysis
+    analyses = [FileAnalysis(path, not args.no_cache) for path in args.paths]
+    models = align_files(analyses, kind=args.kind, bin_ms=args.bin_ms,
+                         window_ms=args.window_ms)
+    for (path, model) in zip(args.paths, models):
+        print('%s: offset %.3f ms, drift %.2f ppm, score %.3f, '
+              '%i windows' % (path, model.offset_ms, model.drift_ppm(),
+                              model.score, model.windows))
+
+
+if __name__ == '__main__':
+    main()
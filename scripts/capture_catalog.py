@@ -0,0 +1,249 @@
+"""Indexes capture runs by the parameters encoded in their log file names.
+
+   A name such as '1800sec_120fps_480p_nowrite.3.h264.ts' is read as a
+   1800 second capture at 120fps and 480p, tagged 'nowrite', repetition 3
+   of an h264 recording. No file is opened to build the catalog.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import os
+import re
+from collections import OrderedDict
+from file_analysis import TIMESTAMP_SUFFIXES
+
+# Video containers the capture software writes
+CONTAINERS = ('h264', 'yuv', 'mjpeg', 'bgr', 'mp4')
+
+# Resolutions that are named rather than given as a line count
+NAMED_RESOLUTIONS = ('lowres', 'highres', 'sd')
+
+RUN_NAME = re.compile(r'^(?P<duration>\d+(?:\.\d+)?)sec'
+                      r'_(?P<fps>\d+(?:\.\d+)?)fps'
+                      r'(?P<rest>.*?)'
+                      r'(?:\.(?P<repetition>\d+))?'
+                      r'\.(?P<container>%s)$' % '|'.join(CONTAINERS),
+                      re.IGNORECASE)
+
+RESOLUTION = re.compile(r'^(?:full)?(?P<lines>\d{3,4})p')
+
+
+def _natural_key(value):
+    """Returns a sort key that orders '480p' before '1080p' and None last."""
+    if value is None:
+        return (2, ())
+    if isinstance(value, str):
+        return (1, tuple(int(part) if part.isdigit() else part
+                         for part in re.split(r'(\d+)', value)))
+    return (0, (value,))
+
+
+class CaptureRun(object):
+    """The capture parameters of one log, parsed from its file name.
+
+       Attributes:
+           name: The file name without the timestamp log suffix.
+           path: The path to the timestamp log.
+           duration: The requested length of the capture in seconds, or
+           None if the name does not say.
+           fps: The target framerate, or None if the name does not say.
+           resolution: For example '480p' or 'lowres', or None.
+           container: The video format, for example 'h264', or None.
+           repetition: Which repetition of the same settings this is, 0 for
+           the first run.
+           tags: Tuple of the remaining name tokens, e.g. ('inet', 'notnice').
+    """
+    __slots__ = ('name', 'path', 'duration', 'fps', 'resolution',
+                 'container', 'repetition', 'tags')
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        for suffix in TIMESTAMP_SUFFIXES:
+            if self.name.endswith(suffix):
+                self.name = self.name[:-len(suffix)]
+                break
+
+        self.duration = None
+        self.fps = None
+        self.resolution = None
+        self.container = None
+        self.repetition = 0
+        self.tags = ()
+
+        match = RUN_NAME.match(self.name)
+        if match is None:
+            # Names like 'Video.h264' only tell the container
+            extension = self.name.split('.')[-1].lower()
+            if extension in CONTAINERS:
+                self.container = extension
+            return
+
+        self.duration = float(match.group('duration'))
+        self.fps = float(match.group('fps'))
+        self.container = match.group('container').lower()
+        if match.group('repetition') is not None:
+            self.repetition = int(match.group('repetition'))
+
+        rest = match.group('rest')
+        # '500sec_15fps1' is the second run of '500sec_15fps'
+        leading = re.match(r'^(\d+)(?=_|$)', rest)
+        if leading is not None:
+            self.repetition = int(leading.group(1))
+            rest = rest[leading.end():]
+
+        tags = [token for token in rest.split('_') if token]
+        # 'singlerecord_bash_1' is the second run of 'singlerecord_bash'
+        if tags and tags[-1].isdigit() and self.repetition == 0:
+            self.repetition = int(tags.pop())
+
+        for (i, token) in enumerate(tags):
+            resolution = RESOLUTION.match(token)
+            if resolution is not None:
+                self.resolution = resolution.group('lines') + 'p'
+                del tags[i]
+                break
+            if token in NAMED_RESOLUTIONS:
+                self.resolution = token
+                del tags[i]
+                break
+
+        self.tags = tuple(tags)
+
+
+    def has_tag(self, tag):
+        """Returns True if the run is tagged with tag.
+
+           Args:
+               tag: A single tag such as 'nowrite' or several joined by
+               underscores such as 'singlerecord_bash' or 'maxqueue64_OOC'.
+        """
+        return ('_%s_' % tag) in ('_%s_' % '_'.join(self.tags))
+
+
+    def label(self):
+        """Returns a short label such as '480p @ 120'."""
+        return '%s @ %g' % (self.resolution or '?', self.fps or 0)
+
+
+    def __repr__(self):
+        return 'CaptureRun(%r)' % self.path
+
+
+def parse_run_name(path):
+    """Returns the CaptureRun described by the name of path."""
+    return CaptureRun(path)
+
+
+class Catalog(object):
+    """An index of capture runs that answers queries on their parameters.
+
+       Args:
+           paths: Paths to timestamp logs.
+
+       Attributes:
+           runs: List of CaptureRun sorted by path.
+           index: Dict of field name to a dict of value to the set of
+           positions in runs with that value.
+    """
+    __slots__ = ('runs', 'index')
+
+    # Fields that are indexed for exact matches
+    FIELDS = ('duration', 'fps', 'resolution', 'container', 'repetition')
+
+    def __init__(self, paths):
+        self.runs = [CaptureRun(path) for path in sorted(paths)]
+        self.index = dict((field, {}) for field in self.FIELDS + ('tags',))
+
+        for (i, run) in enumerate(self.runs):
+            for field in self.FIELDS:
+                self.index[field].setdefault(getattr(run, field),
+                                             set()).add(i)
+            for tag in run.tags:
+                self.index['tags'].setdefault(tag, set()).add(i)
+
+
+    @classmethod
+    def from_directory(cls, log_dir):
+        """Builds a catalog of every timestamp log in log_dir."""
+        paths = [os.path.join(log_dir, name) for name in os.listdir(log_dir)
+                 if name.endswith(TIMESTAMP_SUFFIXES)]
+        return cls(paths)
+
+
+    def query(self, tags=(), exclude_tags=(), **fields):
+        """Returns the runs matching every given parameter.
+
+           Args:
+               tags: Tags that must all be present. Tags joined by
+               underscores must appear next to each other.
+               exclude_tags: Tags that must not be present.
+               **fields: Exact values for any of FIELDS, for example
+               fps=120, resolution='480p', container='h264'. A list or
+               tuple value matches any of its items.
+
+           Returns:
+               A list of CaptureRun sorted by path.
+        """
+        if isinstance(tags, str):
+            tags = (tags,)
+        if isinstance(exclude_tags, str):
+            exclude_tags = (exclude_tags,)
+
+        matches = None
+        for (field, value) in fields.items():
+            if field not in self.FIELDS:
+                raise ValueError('Cannot query on %r' % field)
+            values = value if isinstance(value, (list, tuple)) else (value,)
+            if field in ('duration', 'fps'):
+                values = [float(v) for v in values]
+            found = set()
+            for v in values:
+                found |= self.index[field].get(v, set())
+            matches = found if matches is None else matches & found
+
+        for tag in tags:
+            # Only the first token can be looked up, joined tags are then
+            #     checked on the few runs left
+            found = self.index['tags'].get(tag.split('_')[0], set())
+            matches = found if matches is None else matches & found
+
+        if matches is None:
+            matches = range(len(self.runs))
+        runs = [self.runs[i] for i in sorted(matches)]
+
+        return [run for run in runs
+                if all(run.has_tag(tag) for tag in tags) and
+                not any(run.has_tag(tag) for tag in exclude_tags)]
+
+
+    def group_by(self, runs, *fields):
+        """Groups runs by the values of fields.
+
+           Args:
+               runs: List of CaptureRun, for example from query().
+               *fields: Attribute names to group on.
+
+           Returns:
+               An OrderedDict of value (or tuple of values for several
+               fields) to the list of runs, sorted by key.
+        """
+        groups = {}
+        for run in runs:
+            key = tuple(getattr(run, field) for field in fields)
+            if len(fields) == 1:
+                key = key[0]
+            groups.setdefault(key, []).append(run)
+
+        def sort_key(key):
+            keys = key if isinstance(key, tuple) else (key,)
+            return tuple(_natural_key(k) for k in keys)
+
+        return OrderedDict((key, groups[key])
+                           for key in sorted(groups, key=sort_key))
+
+
+    def __len__(self):
+        return len(self.runs)
@@ -0,0 +1,291 @@
+"""Stores everything known about the frames of one capture in a single
+   binary file, in place of the timestamp, tracking and sleeping logs.
+
+   The file is a short header followed by one fixed-width record per frame.
+   Records can be appended while the capture is being recorded, and a
+   reader memory-maps the file and gets every field as a typed column, so
+   a half-hour capture opens in milliseconds. Because all fields of a
+   frame are stored together they can not drift out of alignment the way
+   separate text logs do.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import io
+import os
+import json
+import struct
+import argparse
+import numpy as np
+
+# File extension of a capture file
+CAPTURE_SUFFIX = '.capture'
+
+MAGIC = b'PICAMCAP'
+VERSION = 1
+
+# The header is padded to this size so records start aligned
+HEADER_BYTES = 4096
+
+# One record per frame
+#     timestamp_ms: Capture time of the frame.
+#     box: x0, y0, x1, y1 of the tracking box, zeros when not tracked.
+#     buzz: 1 or 0, -1 when not recorded.
+#     tracked: Whether the frame has a tracking box.
+#     sleeping: Whether the subject was asleep (see sleep_detection).
+#     extra: Whether the frame shared its slot with an earlier frame.
+#     dropped: Frame slots missed just before this frame.
+RECORD_DTYPE = np.dtype([
+    ('timestamp_ms', '<f8'),
+    ('box', '<i4', (4,)),
+    ('buzz', 'i1'),
+    ('tracked', '?'),
+    ('sleeping', '?'),
+    ('extra', '?'),
+    ('dropped', '<u4'),
+])
+
+
+def _header(metadata):
+    """Returns the header bytes holding metadata."""
+    text = json.dumps(metadata, sort_keys=True).encode('utf-8')
+    header = MAGIC + struct.pack('<HI', VERSION, len(text)) + text
+    if len(header) > HEADER_BYTES:
+        raise ValueError('Capture metadata is too large')
+    return header + b'\0' * (HEADER_BYTES - len(header))
+
+
+def read_metadata(path):
+    """Returns the metadata dict stored in a capture file's header."""
+    with open(path, 'rb') as capture_file:
+        header = capture_file.read(HEADER_BYTES)
+    if len(header) < HEADER_BYTES or not header.startswith(MAGIC):
+        raise ValueError('%s is not a capture file' % path)
+    (version, length) = struct.unpack_from('<HI', header, len(MAGIC))
+    if version != VERSION:
+        raise ValueError('%s has unsupported version %i' % (path, version))
+    start = len(MAGIC) + 6
+    return json.loads(header[start:start + length].decode('utf-8'))
+
+
+def make_records(timestamps, boxes=None, sleeping=None, dropped=None,
+                 extra=None):
+    """Returns a record array for frames, filling in what is not known.
+
+       Args:
+           timestamps: Array of frame timestamps in ms.
+           boxes: Optional array of x0, y0, x1, y1[, buzz] rows. Frames
+           past its end are marked as not tracked.
+           sleeping: Optional array of sleeping flags.
+           dropped: Optional array of slots missed before each frame.
+           extra: Optional array of extra frame flags.
+    """
+    records = np.zeros(len(timestamps), dtype=RECORD_DTYPE)
+    records['timestamp_ms'] = timestamps
+    records['buzz'] = -1
+    if boxes is not None:
+        boxes = np.asarray(boxes)[:len(records)]
+        records['box'][:len(boxes)] = boxes[:, :4]
+        if boxes.shape[1] > 4:
+            records['buzz'][:len(boxes)] = boxes[:, 4]
+        records['tracked'][:len(boxes)] = True
+    for (name, values) in (('sleeping', sleeping), ('dropped', dropped),
+                           ('extra', extra)):
+        if values is not None:
+            values = np.asarray(values)[:len(records)]
+            records[name][:len(values)] = values
+    return records
+
+
+def dropped_before(frame_slots):
+    """Returns the number of dropped slots just before each frame.
+
+       Args:
+           frame_slots: The FrameSlots of the capture.
+    """
+    return frame_slots.missing
+
+
+class CaptureWriter(object):
+    """Appends frame records to a capture file.
+
+       Each append is written straight through, so a reader opening the
+       file at the same time sees every whole record written so far.
+
+       Args:
+           path: The capture file, created if it does not exist.
+           metadata: Dict stored in the header of a new file.
+    """
+    __slots__ = ('path', 'capture_file')
+
+    def __init__(self, path, metadata=None):
+        self.path = path
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, 'wb') as capture_file:
+                capture_file.write(_header(metadata or {}))
+        else:
+            read_metadata(path)
+        self.capture_file = io.open(path, 'ab', buffering=0)
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+    def append(self, timestamp_ms, box=None, buzz=-1, sleeping=False,
+               dropped=0, extra=False):
+        """Appends the record of one frame."""
+        record = np.zeros(1, dtype=RECORD_DTYPE)
+        record['timestamp_ms'] = timestamp_ms
+        if box is not None:
+            record['box'] = box
+            record['tracked'] = True
+        record['buzz'] = buzz
+        record['sleeping'] = sleeping
+        record['dropped'] = dropped
+        record['extra'] = extra
+        self.capture_file.write(record.tobytes())
+
+
+    def append_records(self, records):
+        """Appends a record array, e.g. from make_records."""
+        self.capture_file.write(
+            np.ascontiguousarray(records, dtype=RECORD_DTYPE).tobytes())
+
+
+    def close(self):
+        """Closes the file."""
+        self.capture_file.close()
+
+
+class Capture(object):
+    """A capture file opened for reading.
+
+       Args:
+           path: The capture file.
+
+       Attributes:
+           path: The capture file.
+           metadata: The dict stored in the header.
+           records: Read-only memmap of the records. A record that is only
+           partly written is left out.
+    """
+    __slots__ = ('path', 'metadata', 'records')
+
+    def __init__(self, path):
+        self.path = path
+        self.metadata = read_metadata(path)
+        count = (os.path.getsize(path) - HEADER_BYTES) // RECORD_DTYPE.itemsize
+        if count > 0:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode='r',
+                                     offset=HEADER_BYTES, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+
+    def __len__(self):
+        return len(self.records)
+
+
+    def __getitem__(self, name):
+        """Returns the column called name."""
+        return self.records[name]
+
+
+    def timestamps(self):
+        """Returns the timestamps in ms as a float64 array."""
+        return np.asarray(self.records['timestamp_ms'], dtype=np.float64)
+
+
+    def tracking_boxes(self):
+        """Returns the tracked frames as x0, y0, x1, y1, buzz rows.
+
+           This is the same form FileAnalysis keeps tracking_boxes in.
+        """
+        tracked = self.records[self.records['tracked']]
+        return np.column_stack((tracked['box'], tracked['buzz'])
+                               ).astype(np.int64)
+
+
+def write_capture(path, records, metadata=None):
+    """Writes records to a new capture file, replacing any old one."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as capture_file:
+        capture_file.write(_header(metadata or {}))
+        capture_file.write(np.ascontiguousarray(records, dtype=RECORD_DTYPE)
+                           .tobytes())
+    os.replace(tmp_path, path)
+
+
+def export_logs(capture_path, path_name):
+    """Writes the legacy text logs of a capture file.
+
+       Args:
+           capture_path: The capture file.
+           path_name: The video path the logs are named after, e.g.
+           'Video.yuv' gives 'Video.yuv.timestamp.log' and
+           'Video.yuv.tracking.log'. The sleeping log is written as
+           __TMP__.sleeping.log next to it, as apply_tracking does.
+
+       Returns:
+           A list of the paths written.
+    """
+    capture = Capture(capture_path)
+    records = capture.records
+    written = [path_name + '.timestamp.log']
+    with io.open(written[0], 'w') as timestamp_file:
+        timestamp_file.write(u''.join(u'%f\n' % value for value in
+                                      records['timestamp_ms'].tolist()))
+
+    if records['tracked'].any():
+        # The first line of a tracking log does not belong to a frame
+        written.append(path_name + '.tracking.log')
+        lines = [u'0,0,0,0']
+        for row in capture.tracking_boxes().tolist():
+            if row[4] < 0:
+                row = row[:4]
+            lines.append(u','.join(str(value) for value in row))
+        with io.open(written[-1], 'w') as tracking_file:
+            tracking_file.write(u'\n'.join(lines) + u'\n')
+
+        written.append(os.path.join(os.path.dirname(path_name),
+                                    '__TMP__.sleeping.log'))
+        with io.open(written[-1], 'w') as sleep_file:
+            sleep_file.write(u''.join(
+                u'1\n' if flag else u'0\n' for flag in
+                records['sleeping'][records['tracked']].tolist()))
+    return written
+
+
+def main():
+    """Converts between capture files and the legacy text logs."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('command', choices=('import', 'export'),
+                        help='import text logs or export a capture file')
+    parser.add_argument('path', help='Video path or timestamp log to import, '
+                                     'or capture file to export')
+    parser.add_argument('-o', '--output', default=None,
+                        help='Capture file (import) or video path the logs '
+                             'are named after (export)')
+    parser.add_argument('-f', '--fps', type=float, default=None,
+                        help='Target framerate for dropped frames')
+    args = parser.parse_args()
+
+    if args.command == 'import':
+        from file_analysis import FileAnalysis
+        path = FileAnalysis(args.path).save_capture(args.output, args.fps)
+        print('Wrote %s' % path)
+    else:
+        path_name = args.output or args.path[:-len(CAPTURE_SUFFIX)]
+        for path in export_logs(args.path, path_name):
+            print('Wrote %s' % path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Reduces long series to roughly what a plot can show, keeping their shape
+   and every outlier.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import numpy as np
+
+# Series shorter than this many points per pixel are drawn as they are
+POINTS_PER_PIXEL = 4
+
+
+def _first_in_bucket(bucket, mask):
+    """Returns the index of the first point with mask set in every bucket."""
+    index = np.flatnonzero(mask)
+    (_, first) = np.unique(bucket[index], return_index=True)
+    return index[first]
+
+
+def outlier_mask(y, threshold=6.0):
+    """Returns a mask of points far from the bulk of y.
+
+       A point is an outlier if it is more than threshold median absolute
+       deviations from the median, which singles out dropped frame spikes
+       without being thrown off by them the way a standard deviation is.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    if len(y) == 0:
+        return np.zeros(0, dtype=bool)
+    median = np.median(y)
+    deviation = np.abs(y - median)
+    mad = np.median(deviation)
+    if mad == 0:
+        return deviation > 0
+    return deviation > threshold * mad
+
+
+def decimate(x, y, buckets, keep=None, max_outliers=None):
+    """Returns the indices of the points of (x, y) worth plotting.
+
+       The x range is split into buckets (normally one per pixel column) and
+       the first, last, lowest and highest point of each bucket is kept, so
+       lines and spikes look the same as with every point drawn. Outliers
+       are always kept as well.
+
+       Args:
+           x: Array of x values.
+           y: Array of y values.
+           buckets: Number of buckets, e.g. the plot width in pixels.
+           keep: Optional boolean array of points that must be kept. Defaults
+           to outlier_mask(y).
+           max_outliers: Largest number of outliers kept on top of the
+           bucket extremes, defaults to 4 per bucket. If there are more,
+           the extremes alone already show them at this resolution.
+
+       Returns:
+           A sorted array of indices into x and y.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n <= POINTS_PER_PIXEL * buckets:
+        return np.arange(n)
+
+    order = None
+    if np.any(x[1:] < x[:-1]):
+        order = np.argsort(x, kind='stable')
+        x = x[order]
+        y = y[order]
+
+    finite = np.isfinite(x) & np.isfinite(y)
+    span = x[finite][-1] - x[finite][0] if finite.any() else 0.0
+    if span > 0:
+        bucket = ((x - x[finite][0]) / span * buckets).astype(np.int64)
+        bucket = np.clip(bucket, 0, buckets - 1)
+    else:
+        bucket = np.zeros(n, dtype=np.int64)
+    bucket[~finite] = -1
+
+    # Sorted x makes each bucket a contiguous run
+    valid = np.flatnonzero(finite)
+    starts = valid[np.r_[True, bucket[valid][1:] != bucket[valid][:-1]]]
+    ends = np.r_[starts[1:], valid[-1] + 1] if len(starts) else starts
+    yv = np.where(finite, y, 0.0)
+    lows = np.minimum.reduceat(yv, starts) if len(starts) else starts
+    highs = np.maximum.reduceat(yv, starts) if len(starts) else starts
+
+    run = np.full(n, -1, dtype=np.int64)
+    run[valid] = np.searchsorted(starts, valid, side='right') - 1
+    run_valid = run >= 0
+    is_low = np.zeros(n, dtype=bool)
+    is_high = np.zeros(n, dtype=bool)
+    is_low[run_valid] = y[run_valid] == lows[run[run_valid]]
+    is_high[run_valid] = y[run_valid] == highs[run[run_valid]]
+
+    chosen = [starts, ends - 1,
+              _first_in_bucket(run, is_low),
+              _first_in_bucket(run, is_high)]
+
+    if keep is None:
+        keep = outlier_mask(y[finite])
+        full = np.zeros(n, dtype=bool)
+        full[valid] = keep
+        keep = full
+    elif order is not None:
+        keep = np.asarray(keep, dtype=bool)[order]
+    if max_outliers is None:
+        max_outliers = POINTS_PER_PIXEL * buckets
+    kept = np.flatnonzero(keep)
+    if len(kept) <= max_outliers:
+        chosen.append(kept)
+
+    index = np.unique(np.concatenate(chosen))
+    if order is not None:
+        index = np.sort(order[index])
+    return index
+
+
+def decimate_line(line, buckets):
+    """Returns a (x, y, style) plot line reduced for buckets pixel columns."""
+    (x, y) = (np.asarray(line[0]), np.asarray(line[1]))
+    if len(x) <= POINTS_PER_PIXEL * buckets:
+        return line
+    index = decimate(x, y, buckets)
+    return (x[index], y[index]) + tuple(line[2:])
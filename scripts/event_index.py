@@ -0,0 +1,236 @@
+"""Indexes the interesting moments of a capture (falling asleep, waking up
+   and buzzes) and renders only the video around them.
+
+   Seeking the capture straight to each event window means reviewing a
+   night's recording decodes seconds of video instead of all of it.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import os
+import numpy as np
+from tracking_pipeline import draw_overlay, import_cv2
+
+# Kinds of event
+SLEEP = 'sleep'
+WAKE = 'wake'
+BUZZ = 'buzz'
+
+
+def _runs(mask):
+    """Returns the (first, last) indices of every run of True in mask."""
+    mask = np.asarray(mask, dtype=np.int8)
+    edges = np.diff(np.concatenate(([0], mask, [0])))
+    return (np.flatnonzero(edges == 1), np.flatnonzero(edges == -1) - 1)
+
+
+class EventIndex(object):
+    """The events of one capture, sorted by frame.
+
+       Args:
+           timestamps: Array of frame timestamps in ms.
+           tracking_boxes: Array of x0, y0, x1, y1, buzz rows, aligned with
+           timestamps.
+           episodes: The SleepEpisodes of the capture.
+
+       Attributes:
+           timestamps: Array of frame timestamps in ms.
+           kind: Array of the event kinds (SLEEP, WAKE or BUZZ).
+           first_frame: Array of the first frame of each event.
+           last_frame: Array of the last frame of each event.
+           start_ms: Array of the timestamp of first_frame.
+           end_ms: Array of the timestamp of last_frame.
+    """
+    __slots__ = ('timestamps', 'kind', 'first_frame', 'last_frame',
+                 'start_ms', 'end_ms')
+
+    def __init__(self, timestamps, tracking_boxes, episodes):
+        n = min(len(timestamps), len(tracking_boxes))
+        self.timestamps = np.asarray(timestamps[:n], dtype=np.float64)
+
+        # Falling asleep and waking up are single frames, consecutive buzz
+        #     frames make up one event
+        (buzz_first, buzz_last) = _runs(np.asarray(tracking_boxes)[:n, 4]
+                                        == 1)
+        wake = episodes.end_frame + 1
+        wake = wake[wake < n]
+        kinds = ([SLEEP] * len(episodes.start_frame) + [WAKE] * len(wake) +
+                 [BUZZ] * len(buzz_first))
+        first = np.concatenate((episodes.start_frame, wake, buzz_first))
+        last = np.concatenate((episodes.start_frame, wake, buzz_last))
+
+        order = np.argsort(first, kind='stable')
+        self.kind = np.array(kinds, dtype='U5')[order]
+        self.first_frame = first[order].astype(np.int64)
+        self.last_frame = last[order].astype(np.int64)
+        self.start_ms = self.timestamps[self.first_frame]
+        self.end_ms = self.timestamps[self.last_frame]
+
+
+    def __len__(self):
+        return len(self.kind)
+
+
+    def select(self, kinds=None):
+        """Returns a boolean mask of the events of the given kinds."""
+        if kinds is None:
+            return np.ones(len(self), dtype=bool)
+        return np.isin(self.kind, list(kinds))
+
+
+    def between(self, start_ms, end_ms):
+        """Returns the positions of events overlapping [start_ms, end_ms]."""
+        return np.flatnonzero((self.start_ms <= end_ms) &
+                              (self.end_ms >= start_ms))
+
+
+    def windows(self, pre_sec=5.0, post_sec=5.0, kinds=None):
+        """Returns the frame ranges to review around the events.
+
+           Overlapping windows are merged, so no frame is rendered twice.
+
+           Args:
+               pre_sec: Seconds of video kept before each event.
+               post_sec: Seconds of video kept after each event.
+               kinds: Event kinds to include, defaults to all.
+
+           Returns:
+               A list of (first_frame, last_frame) tuples, inclusive.
+        """
+        selected = self.select(kinds)
+        if not selected.any():
+            return []
+        first = np.searchsorted(self.timestamps,
+                                self.start_ms[selected] - pre_sec * 1000.0)
+        last = np.searchsorted(self.timestamps,
+                               self.end_ms[selected] + post_sec * 1000.0,
+                               side='right') - 1
+
+        order = np.argsort(first, kind='stable')
+        (first, last) = (first[order], last[order])
+        # A window starts a new group unless it touches the furthest end
+        #     reached by the windows before it
+        reach = np.maximum.accumulate(last)
+        new = np.ones(len(first), dtype=bool)
+        new[1:] = first[1:] > reach[:-1] + 1
+        group = np.cumsum(new) - 1
+        merged_first = first[new]
+        merged_last = np.zeros(len(merged_first), dtype=np.int64)
+        np.maximum.at(merged_last, group, last)
+        return list(zip(merged_first.tolist(), merged_last.tolist()))
+
+
+def render_clips(video_path, windows, out_dir, tracking_boxes=None,
+                 sleeping=None, fourcc=0x00000021, fps=30):
+    """Writes one video per window, seeking straight to it.
+
+       Args:
+           video_path: The capture video.
+           windows: List of (first_frame, last_frame) from
+           EventIndex.windows().
+           out_dir: Directory to write the clips to.
+           tracking_boxes: If given, the tracking overlay is drawn.
+           sleeping: Per frame sleeping flags for the overlay.
+           fourcc: Codec of the written clips.
+           fps: Framerate of the written clips.
+
+       Returns:
+           A list of the clip paths written.
+    """
+    cv2 = import_cv2()
+    name = os.path.splitext(os.path.basename(video_path))[0]
+    cap = cv2.VideoCapture(video_path)
+    written = []
+    try:
+        for (first, last) in windows:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, first)
+            path = os.path.join(out_dir, '%s.%07i-%07i.mp4' %
+                                (name, first, last))
+            writer = None
+            for i in range(first, last + 1):
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                gray = _overlayed(frame, i, tracking_boxes, sleeping)
+                if writer is None:
+                    (height, width) = gray.shape[:2]
+                    writer = cv2.VideoWriter(path, fourcc, fps,
+                                             (width, height), False)
+                writer.write(gray)
+            if writer is not None:
+                writer.release()
+                written.append(path)
+    finally:
+        cap.release()
+    return written
+
+
+def render_contact_sheets(video_path, windows, out_dir, thumbnails=8,
+                          columns=4, scale=0.25, tracking_boxes=None,
+                          sleeping=None):
+    """Writes one image per window with thumbnails spread across it.
+
+       Only the sampled frames are decoded, each after a seek.
+
+       Args:
+           video_path: The capture video.
+           windows: List of (first_frame, last_frame) from
+           EventIndex.windows().
+           out_dir: Directory to write the images to.
+           thumbnails: Number of frames sampled per window.
+           columns: Thumbnails per row.
+           scale: Size of a thumbnail relative to the frame.
+           tracking_boxes: If given, the tracking overlay is drawn.
+           sleeping: Per frame sleeping flags for the overlay.
+
+       Returns:
+           A list of the image paths written.
+    """
+    cv2 = import_cv2()
+    name = os.path.splitext(os.path.basename(video_path))[0]
+    cap = cv2.VideoCapture(video_path)
+    written = []
+    try:
+        for (first, last) in windows:
+            frames = np.unique(np.linspace(first, last, thumbnails)
+                               .astype(np.int64))
+            tiles = []
+            for i in frames.tolist():
+                cap.set(cv2.CAP_PROP_POS_FRAMES, i)
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                gray = _overlayed(frame, i, tracking_boxes, sleeping)
+                tiles.append(cv2.resize(gray, None, fx=scale, fy=scale,
+                                        interpolation=cv2.INTER_AREA))
+            if not tiles:
+                continue
+
+            # Pad the last row with black tiles to make a full grid
+            blank = np.zeros_like(tiles[0])
+            while len(tiles) % columns:
+                tiles.append(blank)
+            rows = [np.hstack(tiles[j:j + columns])
+                    for j in range(0, len(tiles), columns)]
+            path = os.path.join(out_dir, '%s.%07i-%07i.png' %
+                                (name, first, last))
+            cv2.imwrite(path, np.vstack(rows))
+            written.append(path)
+    finally:
+        cap.release()
+    return written
+
+
+def _overlayed(frame, i, tracking_boxes, sleeping):
+    """Returns frame i in gray, with the tracking overlay if available."""
+    cv2 = import_cv2()
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    if tracking_boxes is None or i >= len(tracking_boxes):
+        return gray
+    row = tracking_boxes[i].tolist()
+    msg = 'Awake'
+    if sleeping is not None and i < len(sleeping) and sleeping[i]:
+        msg = 'Sleeping'
+    return draw_overlay(gray, tuple(row[:4]), msg, row[4])
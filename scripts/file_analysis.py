@@ -8,15 +8,101 @@
   Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
 """
 
-import io
-import sys
+import os
 import math
-import matplotlib.pyplot as plt
+import numpy as np
+from log_cache import cached_load, cache_disabled
+from frame_slots import classify_frames
+from gap_index import load_gap_index
+from running_stats import RunningStats
+from interval_histogram import histogram_of
+from tracking_pipeline import TrackingPipeline
+from sleep_detection import detect_sleep
+from event_index import EventIndex, render_clips, render_contact_sheets
+from mp4_timestamps import load_mp4_timestamps
+from yuv_reader import YuvVideo
+from motion_tracker import write_tracking_log
+from segment_tracking import track_parallel
+from capture_store import (CAPTURE_SUFFIX, Capture, make_records,
+                           dropped_before, write_capture)
+
+
+# Files the metrics of a FileAnalysis come from, and the memoized metrics
+#     that depend on each
+SOURCES = ('timestamps', 'tracking')
+SOURCE_METRICS = {
+    'timestamps': ('timestamps', 'time_difference', 'total_time',
+                   'framerate', 'standard_deviation', 'histogram'),
+    'tracking': ('tracking_boxes',),
+}
+
+# Endings used for timestamp logs, longest first
+TIMESTAMP_SUFFIXES = ('.timestamp.log', '.ts')
+
+
+def split_log_path(path_name):
+    """Returns the video path and timestamp log path for path_name.
 
-try:
-    import cv2
-except:
-    print('Warning! Cannot import cv2')
+       Args:
+           path_name: Either the path to the video file or to one of its
+           timestamp logs ('.timestamp.log' or the older '.ts').
+    """
+    for suffix in TIMESTAMP_SUFFIXES:
+        if path_name.endswith(suffix):
+            return (path_name[:-len(suffix)], path_name)
+    return (path_name, path_name + '.timestamp.log')
+
+
+def load_timestamps(timestamp_path):
+    """Parses a timestamp log into an array in a single pass.
+
+       Args:
+           timestamp_path: The path to a file of one timestamp (ms) per line.
+
+       Returns:
+           A float64 ndarray of the timestamps.
+    """
+    with open(timestamp_path, 'r') as timestamp_file:
+        return np.array(timestamp_file.read().split(), dtype=np.float64)
+
+
+def load_tracking(tracking_path):
+    """Parses a tracking log into an array of boxes.
+
+       Each line of the log is 'x0,y0,x1,y1' optionally followed by ',buzz'.
+
+       Args:
+           tracking_path: The path to the tracking log.
+
+       Returns:
+           An (n, 5) int64 ndarray of x0, y0, x1, y1, buzz where buzz is -1
+           for lines that did not record it.
+    """
+    with open(tracking_path, 'r') as tracking_file:
+        return parse_tracking(tracking_file.read().split())
+
+
+def parse_tracking(lines):
+    """Parses tracking log lines into an array of boxes, see load_tracking.
+
+       Args:
+           lines: List of the lines as str, without their newlines.
+    """
+    boxes = np.full((len(lines), 5), -1, dtype=np.int64)
+    if not lines:
+        return boxes
+
+    columns = lines[0].count(',') + 1
+    if all(line.count(',') + 1 == columns for line in lines):
+        # Every line has the same shape so it can be parsed in bulk
+        values = np.array(','.join(lines).split(','), dtype=np.int64)
+        values = values.reshape(len(lines), columns)
+        boxes[:, :min(columns, 5)] = values[:, :5]
+    else:
+        for i, line in enumerate(lines):
+            values = [int(value) for value in line.split(',')[:5]]
+            boxes[i, :len(values)] = values
+    return boxes
 
 
 class Plot:
@@ -59,89 +145,246 @@ class Plot:
 class FileAnalysis:
     """Plots data in a graph.
 
+       Nothing is read when the object is made. The logs are parsed and
+       every metric is computed on first access and memoized. Each access
+       checks the size and modification time of the file the metric comes
+       from, and a changed file drops the memoized metrics that depend on
+       it.
+
         Args:
-            path_name: The path to the video file.
+            path_name: The path to the video file, or to its timestamp log,
+            or a capture file (see capture_store).
+            use_cache: Whether parsed logs may be read from and saved to
+            the sidecar cache.
 
        Attributes:
             path_name: The path to the video file.
-            timestamp_path: The path to the timestamp file.
+            timestamp_path: The path to the timestamp file, or the MP4
+            itself when its frame times are read from the sample table.
             tracking_path: The path to the tracking data file.
-            timestamp_lines: List of timestamps.
-            tracking_lines: List of tracking lines.
+            use_cache: Whether the sidecar cache may be used.
+            timestamps: Array of timestamps in ms (float64).
+            tracking_boxes: Array of tracking boxes, one row of
+            x0, y0, x1, y1, buzz per frame.
             tracking: Whether or not tracking is to be applied.
             framerate: Framerate of video.
             total_time: The duration of video.
-            time_difference: List of time difference between 
-            subsequent timestamps
+            time_difference: Array of time differences between
+            subsequent timestamps in ms.
             standard_deviation: The standard deviation of the framerate.
+            slot_cache: Frame slot classifications by target framerate.
+            gap_cache: Gap indexes by target framerate.
+            histogram: IntervalHistogram of the time differences.
+            memo: Dict of the metrics computed so far.
+            signatures: Dict of the (size, mtime) each source file had when
+            its metrics were computed.
     """
-    def __init__(self, path_name):
-        self.path_name = path_name
-        self.timestamp_path = path_name + '.timestamp.log'
-        self.tracking_path = path_name + '.tracking.log'
-        self.timestamp_lines = []
-        self.tracking_lines = []
-        self.tracking = False
-        self.framerate = 0
-        self.total_time = 0
-        self.time_difference = []
-        self.standard_deviation = u''
-
-        with open(self.timestamp_path, 'r') as timestamp_file:
-            self.timestamp_lines = timestamp_file.readlines()
+    def __init__(self, path_name, use_cache=True):
+        self.use_cache = use_cache
+        self.memo = {}
+        self.signatures = {}
+        self.slot_cache = {}
+        self.gap_cache = {}
+        if path_name.endswith(CAPTURE_SUFFIX):
+            self.path_name = path_name[:-len(CAPTURE_SUFFIX)]
+            self.timestamp_path = path_name
+            self.tracking_path = path_name
+            return
+
+        (self.path_name, self.timestamp_path) = split_log_path(path_name)
+        self.tracking_path = self.path_name + '.tracking.log'
+        # Without a timestamp log an MP4's own sample table is used
+        if (self.path_name.lower().endswith('.mp4') and
+                not os.path.exists(self.timestamp_path)):
+            self.timestamp_path = self.path_name
+
+
+    def invalidate(self, source=None):
+        """Drops memoized metrics so they are recomputed on next access.
+
+           Args:
+              source: 'timestamps' or 'tracking' to only drop the metrics
+              of that file, None for all.
+        """
+        for name in (SOURCES if source is None else (source,)):
+            for metric in SOURCE_METRICS[name]:
+                self.memo.pop(metric, None)
+            self.signatures.pop(name, None)
+            if name == 'timestamps':
+                self.slot_cache = {}
+                self.gap_cache = {}
+
+
+    def check_source(self, source):
+        """Invalidates the metrics of source if its file has changed."""
+        path = (self.timestamp_path if source == 'timestamps'
+                else self.tracking_path)
+        try:
+            stat = os.stat(path)
+            signature = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            signature = None
+        if source not in self.signatures or \
+                self.signatures[source] != signature:
+            self.invalidate(source)
+            self.signatures[source] = signature
+
 
+    def metric(self, source, name, compute):
+        """Returns the memoized metric name, computing it if needed.
+
+           Args:
+              source: Which file the metric comes from, see SOURCES.
+              name: Key of the metric in memo.
+              compute: Function returning the metric.
+        """
+        self.check_source(source)
+        if name not in self.memo:
+            self.memo[name] = compute()
+        return self.memo[name]
+
+
+    def read_timestamps(self):
+        """Returns the timestamps parsed from the timestamp source."""
+        if self.timestamp_path.endswith(CAPTURE_SUFFIX):
+            return Capture(self.timestamp_path).timestamps()
+        if self.timestamp_path == self.path_name and \
+                self.path_name.lower().endswith('.mp4'):
+            return cached_load(self.timestamp_path, 'mp4_timestamps',
+                               load_mp4_timestamps, self.use_cache)
+        return cached_load(self.timestamp_path, 'timestamps',
+                           load_timestamps, self.use_cache)
+
+
+    def read_tracking(self):
+        """Returns the tracking boxes, or None without tracking data."""
+        if self.tracking_path.endswith(CAPTURE_SUFFIX):
+            boxes = Capture(self.tracking_path).tracking_boxes()
+            return boxes if len(boxes) else None
         # Check to see if the file exists
         try:
-            with open(self.tracking_path, 'r') as tracking_file:
-                # Ignoring the first line to match up the timestamps
-                self.tracking_lines = tracking_file.readlines()[1:]
-            self.tracking = True
-        except:
-            pass
+            boxes = cached_load(self.tracking_path, 'tracking',
+                                load_tracking, self.use_cache)
+        except (IOError, OSError):
+            return None
+        # Ignoring the first line to match up the timestamps
+        return boxes[1:]
+
+
+    @property
+    def timestamps(self):
+        return self.metric('timestamps', 'timestamps', self.read_timestamps)
+
+
+    @property
+    def tracking_boxes(self):
+        boxes = self.metric('tracking', 'tracking_boxes', self.read_tracking)
+        if boxes is None:
+            return np.empty((0, 5), dtype=np.int64)
+        return boxes
+
+
+    @property
+    def tracking(self):
+        return self.metric('tracking', 'tracking_boxes',
+                           self.read_tracking) is not None
+
+
+    @property
+    def time_difference(self):
+        return self.metric('timestamps', 'time_difference',
+                           self.find_time_differences)
+
+
+    @property
+    def total_time(self):
+        return self.metric('timestamps', 'total_time',
+                           lambda: float(self.time_difference.sum()))
 
-        self.find_info()
+
+    @property
+    def framerate(self):
+        return self.metric('timestamps', 'framerate', self.find_framerate)
+
+
+    @property
+    def target_framerate(self):
+        """The framerate in the file name, else the measured framerate."""
+        from capture_catalog import parse_run_name
+        return parse_run_name(self.timestamp_path).fps or self.framerate
+
+
+    @property
+    def standard_deviation(self):
+        return self.metric('timestamps', 'standard_deviation',
+                           self.find_standard_deviation)
+
+
+    @property
+    def histogram(self):
+        return self.interval_histogram()
+
+
+    def save_capture(self, capture_path=None, target_framerate=None,
+                     threshold_sec=20):
+        """Writes the timestamps, tracking, sleep and dropped frames to a
+           single capture file (see capture_store).
+
+           Args:
+              capture_path: The file to write, defaults to the video path
+              with CAPTURE_SUFFIX added.
+              target_framerate: Framerate the dropped frames are counted
+              against, defaults to target_framerate.
+              threshold_sec: Seconds the box has to stay still to count as
+              sleeping.
+
+           Returns:
+              The path of the capture file.
+        """
+        if capture_path is None:
+            capture_path = self.path_name + CAPTURE_SUFFIX
+        slots = self.frame_slots(target_framerate)
+        sleeping = None
+        if self.tracking:
+            sleeping = self.sleep_episodes(threshold_sec).sleeping
+        records = make_records(self.timestamps,
+                               self.tracking_boxes if self.tracking else None,
+                               sleeping, dropped_before(slots), slots.extra)
+        write_capture(capture_path, records, {
+            'source': self.timestamp_path,
+            'target_framerate': slots.target_framerate,
+            'threshold_sec': threshold_sec,
+        })
+        return capture_path
 
 
     def find_time_differences(self):
         """Finds the time differences between 2 subsequent timestamps in order
            to find framerate.
         """
-        self.time_difference = []
-        self.total_time = 0
-        last_time = float(self.timestamp_lines[0])
-
-        for timestamp in self.timestamp_lines[1:]:
-            difference = float(timestamp) - last_time
-            self.total_time += difference
-            self.time_difference.append(difference)
-            last_time = float(timestamp)
+        return np.diff(self.timestamps)
 
 
     def find_framerate(self):
         """Finds the framerate of the video using time differences."""
-        self.framerate = 1 / ((self.total_time/1000) /
-                              len(self.time_difference))
+        return 1 / ((self.total_time/1000) / len(self.time_difference))
 
 
     def find_standard_deviation(self):
         """Finds the standard deviation of the time differences"""
-        mean = self.total_time / len(self.time_difference)
-        deviation_sum = 0
-        for difference in self.time_difference:
-            deviation_sum += (difference - mean)**2
-
-        standard_deviation = deviation_sum/len(self.time_difference)
+        stats = RunningStats()
+        stats.add_array(self.time_difference)
+        standard_deviation = stats.variance()
         (multiplier, units) = self.get_time_units(standard_deviation)
         standard_deviation = math.sqrt(standard_deviation)
         standard_deviation *= multiplier
-        self.standard_deviation = (standard_deviation, units)
+        return (standard_deviation, units)
 
 
     def find_info(self):
-        """Computes useful analysis data."""
-        self.find_time_differences()
-        self.find_framerate()
-        self.find_standard_deviation()
+        """Computes useful analysis data now rather than on first use."""
+        self.framerate
+        self.standard_deviation
 
 
     def get_time_units(self, num):
@@ -177,43 +420,79 @@ class FileAnalysis:
     def info(self):
         """Displays simple information about the file."""
         print('  Sec: %s' % str(self.total_time/1000))
-        print('  Frames: %s' % str(len(self.timestamp_lines)-1))
+        print('  Frames: %s' % str(len(self.timestamps)-1))
         print('  Framerate: %s' % str(self.framerate))
         print('  Standard Deviation: %f %s' % self.standard_deviation)
+        percentiles = self.interval_histogram().percentiles((50, 99, 99.9))
+        print('  Interval p50/p99/p99.9: %.3f / %.3f / %.3f ms' %
+              (percentiles[50], percentiles[99], percentiles[99.9]))
 
 
-    def dropped_frames(self):
+    def interval_histogram(self):
+        """Returns the IntervalHistogram of the time differences."""
+        return self.metric('timestamps', 'histogram',
+                           lambda: histogram_of(self.time_difference))
+
+
+    def frame_slots(self, target_framerate=None):
+        """Returns the frame slot classification of the timestamps.
+
+           Args:
+              target_framerate: The framerate the slots are laid out for,
+              defaults to the target_framerate attribute.
+        """
+        if target_framerate is None:
+            target_framerate = self.target_framerate
+        target_framerate = float(target_framerate)
+
+        self.check_source('timestamps')
+        if target_framerate not in self.slot_cache:
+            self.slot_cache[target_framerate] = \
+                classify_frames(self.timestamps, target_framerate)
+        return self.slot_cache[target_framerate]
+
+
+    def gap_index(self, target_framerate=None):
+        """Returns the gap_index.GapIndex of the dropped frames and stalls.
+
+           With the cache on, the index is saved next to the timestamp log
+           and later loads skip parsing the log while it is unchanged.
+
+           Args:
+              target_framerate: The framerate the capture was asked for,
+              defaults to the target_framerate attribute.
+        """
+        if target_framerate is None:
+            # The measured framerate is left to the index, a saved index
+            #     then loads without parsing the log
+            from capture_catalog import parse_run_name
+            target_framerate = parse_run_name(self.timestamp_path).fps
+        self.check_source('timestamps')
+        if target_framerate not in self.gap_cache:
+            self.gap_cache[target_framerate] = load_gap_index(
+                self.timestamp_path, lambda: self.timestamps,
+                target_framerate,
+                persist=self.use_cache and not cache_disabled())
+        return self.gap_cache[target_framerate]
+
+
+    def dropped_frames(self, target_framerate=None):
         """Finds frames if a frame has deviated more than half the
            inverse of the framerate from the standard then determines
            whether a timeframe is missing a frame or has too many frames.
+
+           Args:
+              target_framerate: The framerate we expect or wish to
+              be capturing at, defaults to the target_framerate attribute.
         """
-        frames = len(self.timestamp_lines)-1
-        list_of_frames = [[]*frames]
-        inverse_fps = 1.0/self.framerate
-
-        for line in self.timestamp_lines:
-            time = float(line) / 1000.0
-            index = int(time/inverse_fps + 0.5)
-            while index >= len(list_of_frames):
-                list_of_frames.append([])
-            list_of_frames[index].append(time/inverse_fps - index*inverse_fps)
-
-            dropped = 0
-            extra = 0
-            extra_count = 0
-            for frame in list_of_frames:
-                if len(frame) > 1:
-                    extra += 1
-                    extra_count += len(frame)
-                elif len(frame) < 1:
-                    dropped += 1
-
-        print('Dropped: %i' % dropped)
-        print('Extra: %i' % extra)
+        slots = self.frame_slots(target_framerate)
+
+        print('Dropped: %i' % slots.dropped())
+        print('Extra: %i' % slots.extras())
 
         # If it is balanced then no frames where dropped, they where just
         #     in a different timeframe
-        if extra_count == 2*dropped:
+        if slots.balanced():
             print('Balanced')
         else:
             print('Unbalanced')
@@ -223,14 +502,12 @@ class FileAnalysis:
         """Retruns the center point of a box
 
         Args:
-            box: A tuple defined as (x0, y0, x1, y1) where (x0, y0) is the top
-            left corner and (x1, y1) is the bottom right corner
+            box: A sequence starting with (x0, y0, x1, y1) where (x0, y0) is
+            the top left corner and (x1, y1) is the bottom right corner
         """
-        box = box.split(',')
-        for i in enumerate(box):
-            box[i] = float(box[i])
+        box = [float(value) for value in box[:4]]
 
-        if box[0] is -1 and box[1] is -1 and box[2] is -1 and box[3] is -1:
+        if box[0] == -1 and box[1] == -1 and box[2] == -1 and box[3] == -1:
             return 0
         return (box[0] + (box[2]-box[0])/2, box[1] + (box[3]-box[1])/2)
 
@@ -246,120 +523,165 @@ class FileAnalysis:
             print('Sorry, there was no tracking file found')
             return
 
-        if len(self.timestamp_lines) != len(self.tracking_lines):
+        timestamps = self.timestamps
+        tracking_boxes = self.tracking_boxes
+        if len(timestamps) != len(tracking_boxes):
             print('Not equal')
-            print(len(self.timestamp_lines))
-            print(len(self.tracking_lines))
+            print(len(timestamps))
+            print(len(tracking_boxes))
             return
 
         x = []  # The x value of all the points
         y = []  # The y value of all the points
         # The last timestamp
-        #last_time = float(self.timestamp_lines[0])
         # The last center point
-        last_point = self.get_point(self.tracking_lines[0])
-        for i in range(len(self.tracking_lines)-1):
-            point = self.get_point(self.tracking_lines[i+1])
+        last_point = self.get_point(tracking_boxes[0])
+        for i in range(len(tracking_boxes)-1):
+            point = self.get_point(tracking_boxes[i+1])
             y.append(self.calc_dist(point, last_point))
-            x.append(float(self.timestamp_lines[i+1])/1000)  # Convert to sec
+            x.append(timestamps[i+1]/1000)  # Convert to sec
             last_point = point
 
-        p = plot(x, y, 'g')
+        p = Plot(x, y, 'g')
         p.y_label = 'Distance (px)'
         p.x_label = 'Sec'
 
         return p
 
 
-    def apply_tracking(self, write, display):
+    def video_path(self):
+        """Returns the path of the .mp4 video the tracking was made on."""
+        path = self.path_name.split('.')
+        path[-1] = 'mp4'
+        return '.'.join(path)
+
+
+    def sleep_episodes(self, threshold_sec=20):
+        """Returns the SleepEpisodes found in the tracking data.
+
+           Args:
+              threshold_sec: Seconds the box has to stay still to count as
+              sleeping.
+        """
+        return detect_sleep(self.tracking_boxes, self.timestamps,
+                            threshold_sec * 1000.0)
+
+
+    def event_index(self, threshold_sec=20):
+        """Returns the EventIndex of sleep, wake and buzz events.
+
+           Args:
+              threshold_sec: Seconds the box has to stay still to count as
+              sleeping.
+        """
+        return EventIndex(self.timestamps, self.tracking_boxes,
+                          self.sleep_episodes(threshold_sec))
+
+
+    def render_events(self, out_dir, pre_sec=5, post_sec=5, kinds=None,
+                      mode='clips', threshold_sec=20):
+        """Renders only the video around events, seeking to each of them.
+
+           Args:
+              out_dir: Directory to write the clips or images to.
+              pre_sec: Seconds of video kept before each event.
+              post_sec: Seconds of video kept after each event.
+              kinds: Event kinds to include, defaults to all.
+              mode: 'clips' for a video per event window or 'sheets' for a
+              contact sheet of thumbnails per window.
+              threshold_sec: Seconds the box has to stay still to count as
+              sleeping.
+
+           Returns:
+              A list of the files written.
+        """
+        episodes = self.sleep_episodes(threshold_sec)
+        events = EventIndex(self.timestamps, self.tracking_boxes, episodes)
+        windows = events.windows(pre_sec, post_sec, kinds)
+        if mode == 'sheets':
+            return render_contact_sheets(self.video_path(), windows, out_dir,
+                                         tracking_boxes=self.tracking_boxes,
+                                         sleeping=episodes.sleeping)
+        return render_clips(self.video_path(), windows, out_dir,
+                            self.tracking_boxes, episodes.sleeping)
+
+
+    def yuv_video(self, width, height, padded=False):
+        """Returns the raw .yuv capture as a memory-mapped YuvVideo.
+
+           Args:
+              width: Width of the frames in pixels.
+              height: Height of the frames in pixels.
+              padded: Whether the frames are stored padded by the camera.
+        """
+        return YuvVideo(self.path_name, width, height, padded)
+
+
+    def generate_tracking(self, resolution, padded=False, workers=1,
+                          **tracker_args):
+        """Tracks the raw .yuv capture and writes its .tracking.log.
+
+           The capture is tracked in segments (see segment_tracking), so
+           the log is the same for any number of workers. It has one box
+           per timestamp.
+
+           Args:
+              resolution: (width, height) of the capture.
+              padded: Whether the frames are stored padded by the camera.
+              workers: Number of worker processes, None for one per CPU.
+              tracker_args: Passed on to motion_tracker.MotionTracker, e.g.
+              stride, scale, blur or roi.
+
+           Returns:
+              The frames/sec the tracking ran at.
+        """
+        (result, seconds) = track_parallel(self.path_name, resolution, padded,
+                                           len(self.timestamps), workers,
+                                           **tracker_args)
+        write_tracking_log(self.tracking_path, result.boxes())
+        self.invalidate('tracking')
+        return result.frames / seconds if seconds else float('inf')
+
+
+    def apply_tracking(self, write, display, queue_depth=32,
+                       threshold_sec=20, resolution=None, profiler=None):
         """Displays the video feed with the tracking and sleep data overlayed.
 
+           Decoding, drawing and encoding run on their own threads, see
+           tracking_pipeline.TrackingPipeline.
+
            Args:
               write: The video to be written.
               display: Whether or not to display the video.
+              queue_depth: Number of frames buffered between stages.
+              threshold_sec: Seconds the box has to stay still to count as
+              sleeping.
+              resolution: (width, height) of a raw .yuv capture. If given,
+              frames come straight from the Y plane of the .yuv file
+              instead of decoding the .mp4.
+              profiler: Optional stage_profiler.StageProfiler to record
+              where the time goes.
         """
-        try:
-            path = self.path_name.split('.')
-            path[-1] = 'mp4'
-            path = '.'.join(path)
-            cap = cv2.VideoCapture(path)
-        except Exception as e:
-            print('Error: %s' % e)
-            print(self.path_name)
-            return
-
+        episodes = self.sleep_episodes(threshold_sec)
         path = '/'.join(self.path_name.split('/')[:-1]) + '/'
-        sleep_writer = io.open(path + '__TMP__.sleeping.log', 'w')
-        sleeping = False
-        prev_box = None
-        seconds_waited = 0
-        #count = 0
-        writer = None
-        if write is not None:
-            writer = cv2.VideoWriter(write, 0x00000021, 30, (640, 480), False)
-
-        for i, line in enumerate(self.tracking_lines[:-1]):
-            line = line.split(',')
-            box = (int(line[0]), int(line[1]), int(line[2]), int(line[3]))
-            try:
-                buzz = int(line[4])
-            except:
-                pass
-            ret, frame = cap.read()
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            gray = cv2.rectangle(gray, (box[0], box[1]),
-                                 (box[2], box[3]), (255, 255, 255), 2)
-            if prev_box == box:
-                seconds_waited += self.time_difference[i] / 1000
-            else:
-                seconds_waited = 0
-
-            prev_box = box
-
-            msg = 'Awake'
-            if seconds_waited >= 20:
-                msg = 'Sleeping'
-                sleep_writer.write(u'1\n')
-            else:
-                sleep_writer.write(u'0\n')
-
-            cv2.putText(gray, msg, (15, 30),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        1, (255, 255, 255), 3, 8)
-            try:
-                if buzz == 1:
-                    cv2.putText(gray, 'Buzz', (15, 600),
-                                cv2.FONT_HERSHEY_SIMPLEX,
-                                1, (255, 255, 255), 3, 8)
-            except:
-                pass
-            if display is True:
-                cv2.imshow('frame', gray)
-                if cv2.waitKey(1) & 0xFF == ord('q'):
-                    break
-            if write is not None:
-                writer.write(gray)
-
-        if write is not None:
-            writer.release()
-        sleep_writer.close()
-        cap.release()
-        cv2.destroyAllWindows()
+        episodes.write_log(path + '__TMP__.sleeping.log')
+
+        source = None
+        if resolution is not None:
+            source = self.yuv_video(*resolution)
+        pipeline = TrackingPipeline(self.video_path(), self.tracking_boxes,
+                                    episodes.sleeping, write, display,
+                                    queue_depth, source=source,
+                                    profiler=profiler)
+        pipeline.run()
 
 
     def plot_framerate(self):
         """Plots the framerate of each frame in relation to the last frame."""
-        x = []
-        y = []
-        last_time = float(self.timestamp_lines[0])
-        for line in self.timestamp_lines[1:]:
-            cur_time = float(line) / 1000.0
-            fps = 1.0/(cur_time - last_time)
-            x.append(cur_time)
-            y.append(fps)
-            last_time = cur_time
-
-        p = plot(x, y, 'go')
+        x = self.timestamps[1:] / 1000.0
+        y = 1000.0 / self.time_difference
+
+        p = Plot(x, y, 'go')
         p.y_label = 'Framerate'
         p.x_label = 'Time [sec]'
 
@@ -374,55 +696,8 @@ class FileAnalysis:
               target_framerate: The framerate we expect or wish to 
               be capturing at.
         """
-        hits_x = []     # A list of x values for each frame
-        hits_y = []     # A list of y values for each frame
-        dropped_x = []  # A list of x values for each dropped frame
-        dropped_y = []  # A list of y values for each dropped frame
-        extra_x = []    # A list of x values for each additional frame
-        extra_y = []    # A list of y values for each additional frame
-
-        # The inverse of the framerate, to give a timeframe for where a frame
-        #     should be found
-        time_gap = 1.0/float(target_framerate)
-        correct_time = 0  # Where the frame should be found
-        line_num = 0      # What line from the file is being used
-        count = 0         # Counting the number of frames
-
-        while line_num < len(self.timestamp_lines):
-            time = float(self.timestamp_lines[line_num]) / 1000.0
-
-            # Frame was either dropped or very delayed
-            if time >= correct_time + time_gap:
-                dropped_x.append(count)
-                # y value is set to time_gap so that extrenuous points
-                #     don't lower the resolution on the usefull information
-                #     when plotting
-                dropped_y.append(time_gap)
-
-                # An extra frame was found in the previous period
-                #     (usually from delayed frames)
-            elif time <= correct_time - time_gap:
-                extra_x.append(count)
-                # y value is set to -time_gap so that extrenuous points
-                #     don't lower the resolution on the usefull information
-                #     when plotting
-                extra_y.append(-time_gap)
-
-                # Don't advance the time, because we are looking for
-                #     a frame in this time period, and maybe the next
-                #     frame is in it
-                line_num += 1
-                count += 1
-                continue
-
-            # The frame was found in the correct time period
-            else:
-                hits_x.append(count)
-                hits_y.append(time - correct_time)
-                line_num += 1
-
-            count += 1               # Another frame is found
-            correct_time += time_gap # Advance the timeframe
+        slots = self.frame_slots(target_framerate)
+        time_gap = slots.time_gap
 
         multiplier = 1000000
         units = '\xB5s'
@@ -433,10 +708,21 @@ class FileAnalysis:
             multiplier = 1000
             units = 'ms'
 
+        # Dropped and extra frames are drawn at +/- time_gap so that
+        #     extrenuous points don't lower the resolution on the usefull
+        #     information when plotting. The first point of each series is left
+        #     out
+        hits_x = slots.slot[slots.hit][1:]
+        hits_y = slots.deviation[slots.hit][1:] * multiplier
+        dropped_x = slots.dropped_slots[1:]
+        extra_x = slots.slot[slots.extra][1:]
+
         # Plotting everything
-        p = plot(hits_x[1:], [i*multiplier for i in hits_y[1:]], 'go')
-        p.add_line(dropped_x[1:], [i*multiplier for i in dropped_y[1:]], 'ro')
-        p.add_line(extra_x[1:], [i*multiplier for i in extra_y[1:]], 'ro')
+        p = Plot(hits_x, hits_y, 'go')
+        p.add_line(dropped_x, np.full(len(dropped_x), time_gap*multiplier),
+                   'ro')
+        p.add_line(extra_x, np.full(len(extra_x), -time_gap*multiplier),
+                   'ro')
         p.y_label = 'Time Deviation from Expected [%s]' % units
         p.x_label = 'Frame'
 
@@ -450,39 +736,22 @@ class FileAnalysis:
 
     def plot_timestamps(self):
         """Plots the timestamps in a graph."""
-        list_of_times = []
-        x_axis = []
-        (multiplier, units) = \
-        self.get_time_units(float(self.timestamp_lines[1]) - \
-                            float(self.timestamp_lines[0]))
+        (multiplier, units) = self.get_time_units(self.time_difference[0])
+        list_of_times = self.time_difference * multiplier
+        x_axis = np.arange(len(list_of_times))
 
-        last_time = float(self.timestamp_lines[0]) * multiplier
-
-        for i, timestamp in enumerate(self.timestamp_lines[1:]):
-            list_of_times.append(float(timestamp) * multiplier - last_time)
-
-            last_time = float(timestamp) * multiplier
-            x_axis.append(i)
-
-        p = plot(x_axis, list_of_times, 'g')
+        p = Plot(x_axis, list_of_times, 'g')
         p.y_label = units
         p.x_label = 'Timestamp'
 
         return p
 
 
-    def plot_dropped_frames(self):
-        """Plots the ammount of dropped frames in a graph."""
-        count = 0
-        list_of_times = []
-        last_time = float(self.timestamp_lines[0])
-        inverted_framerate = 1.0/self.framerate * 1000
-
-        for timestamp in self.timestamp_lines[1:]:
-            frames = int((float(timestamp)-last_time) / inverted_framerate)
-            if frames > 1:
-                count += frames-1
+    def plot_dropped_frames(self, target_framerate=None):
+        """Returns the ammount of dropped frames to plot in a graph.
 
-            last_time = float(timestamp)
-
-        return count
+           Args:
+              target_framerate: The framerate the capture was asked for,
+              defaults to the target_framerate attribute.
+        """
+        return self.frame_slots(target_framerate).dropped()
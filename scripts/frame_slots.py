@@ -0,0 +1,145 @@
+"""Classifies every frame of a capture against the slots it should have
+   landed in at a target framerate.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import numpy as np
+
+
+# An interval shorter than this many frame gaps keeps a frame in the slot
+#     of the frame before it
+EXTRA_GAPS = 0.5
+
+
+def slot_steps(intervals_ms, gap_ms):
+    """Returns how many slots each interval between frames moves on.
+
+       An interval of n whole frame gaps, n of at least 2, skips n - 1
+       slots, so a frame that is merely late does not leave an empty slot
+       behind it. An interval under EXTRA_GAPS frame gaps stays in the same
+       slot, anything else moves on by one.
+
+       Args:
+           intervals_ms: Array of intervals between frames in ms.
+           gap_ms: The expected interval between frames in ms.
+
+       Returns:
+           An int64 array, one step per interval.
+    """
+    intervals_ms = np.asarray(intervals_ms, dtype=np.float64)
+    # Without the tolerance rounding error can put an interval of exactly
+    #     two frame gaps, such as 0.08 / 0.04, just under 2
+    gaps = intervals_ms / gap_ms + 1e-9
+    steps = np.maximum(np.floor(gaps), 1).astype(np.int64)
+    steps[intervals_ms < EXTRA_GAPS * gap_ms] = 0
+    return steps
+
+
+class FrameSlots(object):
+    """The result of binning timestamps into frame slots.
+
+       The first frame fills slot 0 and every later frame moves on from the
+       slot of the frame before it by slot_steps of the interval between
+       them. The first frame in a slot is a hit, any further frames in the
+       same slot are extra, and a slot that received no frame at all is
+       dropped. Timestamps are taken in capture order, a frame earlier than
+       the one before it is extra.
+
+       Attributes:
+           target_framerate: The framerate the slots were laid out for.
+           time_gap: Length of one slot in seconds.
+           slot: Array of the slot index of each frame.
+           deviation: Array of how far each frame is from the start of its
+           slot in seconds, measured from the first frame.
+           hit: Boolean array, True for frames that filled their slot.
+           extra: Boolean array, True for frames landing in a slot that was
+           already filled.
+           missing: Array of the slots dropped just before each frame.
+           dropped_slots: Array of slot indices that received no frame.
+           extra_slots: Array of slot indices that received several frames.
+    """
+    __slots__ = ('target_framerate', 'time_gap', 'slot', 'deviation', 'hit',
+                 'extra', 'missing', 'dropped_slots', 'extra_slots')
+
+    def __init__(self, timestamps, target_framerate):
+        self.target_framerate = float(target_framerate)
+        self.time_gap = 1.0/self.target_framerate
+
+        times = np.asarray(timestamps, dtype=np.float64) / 1000.0
+        steps = slot_steps(np.diff(times), self.time_gap)
+        self.slot = np.zeros(len(times), dtype=np.int64)
+        np.cumsum(steps, out=self.slot[1:])
+        self.deviation = times - self.slot*self.time_gap
+        if len(times):
+            self.deviation -= times[0]
+
+        self.hit = np.ones(len(times), dtype=bool)
+        self.hit[1:] = steps > 0
+        self.extra = ~self.hit
+        self.missing = np.zeros(len(times), dtype=np.int64)
+        self.missing[1:] = np.maximum(steps - 1, 0)
+
+        # The slots skipped by each long interval follow the slot before it
+        skipped = np.flatnonzero(self.missing)
+        counts = self.missing[skipped]
+        first = np.repeat(self.slot[skipped - 1] + 1, counts)
+        offset = np.arange(len(first)) - np.repeat(np.cumsum(counts) - counts,
+                                                   counts)
+        self.dropped_slots = first + offset
+        self.extra_slots = np.unique(self.slot[self.extra])
+
+
+    def frames(self):
+        """Returns the number of frames classified."""
+        return len(self.slot)
+
+
+    def hits(self):
+        """Returns the number of slots that received a frame."""
+        return int(np.count_nonzero(self.hit))
+
+
+    def dropped(self):
+        """Returns the number of slots without a frame."""
+        return len(self.dropped_slots)
+
+
+    def extras(self):
+        """Returns the number of frames beyond the first in their slot."""
+        return int(np.count_nonzero(self.extra))
+
+
+    def balanced(self):
+        """Returns True if every empty slot is made up for by an extra frame.
+
+           If it is balanced then no frames where dropped, they where just
+           in a different timeframe.
+        """
+        return self.extras() == self.dropped()
+
+
+    def summary(self):
+        """Returns a dict of the summary counts."""
+        return {'frames': self.frames(),
+                'hits': self.hits(),
+                'dropped': self.dropped(),
+                'extra': self.extras(),
+                'extra_slots': len(self.extra_slots),
+                'balanced': self.balanced()}
+
+
+def classify_frames(timestamps, target_framerate):
+    """Bins timestamps into slots at target_framerate.
+
+       Args:
+           timestamps: Sequence of timestamps in ms.
+           target_framerate: The framerate we expect or wish to be
+           capturing at.
+
+       Returns:
+           A FrameSlots.
+    """
+    return FrameSlots(timestamps, target_framerate)
@@ -0,0 +1,332 @@
+"""Indexes the gaps of a capture, the places where frames were dropped or
+   the capture stalled, so questions about them do not rescan the log.
+
+   A gap is an interval in which frame_slots skipped slots, so the frames
+   an index counts as missing are the ones FileAnalysis.dropped_frames
+   reports. Gaps never overlap and are found in time order, so both their
+   starts and their ends are sorted. Range and overlap queries are then two
+   binary searches, frame counts over a range come from a running sum,
+   and duration thresholds search a copy of the gaps sorted by duration.
+   The index is small and is saved next to the log, so a dashboard can
+   load the gaps of thousands of captures without parsing any of them.
+
+   Usage examples:
+       python gap_index.py ../logs/1800sec_120fps_480p.h264.ts
+       python gap_index.py ../logs/*.ts --between 720 840 --longer-than 100
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import os
+import argparse
+import numpy as np
+from frame_slots import classify_frames
+
+# File ending of a saved index, added to the timestamp log's path
+GAP_SUFFIX = '.gaps.npz'
+
+# Bumped when the saved layout or the gaps found change, older files are
+#     rebuilt
+VERSION = 3
+
+# Gaps longer than this many frame gaps are stalls rather than drops
+STALL_GAPS = 4
+
+# Kinds of gap
+DROP = 'drop'
+STALL = 'stall'
+
+
+class GapIndex(object):
+    """The gaps of one capture, sorted by time.
+
+       Gap i runs from frame start_frame[i] to the frame after it.
+
+       Args:
+           start_frame: Array of the frame before each gap.
+           start_ms: Array of the timestamp of that frame.
+           end_ms: Array of the timestamp of the frame after the gap.
+           missing: Array of the frames each gap is missing.
+           gap_ms: The expected interval between frames in ms.
+
+       Attributes:
+           start_frame: Array of the frame before each gap.
+           start_ms: Array of when each gap started in ms.
+           end_ms: Array of when each gap ended in ms.
+           missing: Array of the frames each gap is missing.
+           duration_ms: Array of how long each gap lasted in ms.
+           gap_ms: The expected interval between frames in ms.
+           missing_sum: Array of the frames missing before each gap, with
+           the total at the end.
+           by_duration: Array of the gaps ordered by duration.
+           sorted_duration_ms: Array of the durations in that order.
+    """
+    __slots__ = ('start_frame', 'start_ms', 'end_ms', 'missing',
+                 'duration_ms', 'gap_ms', 'missing_sum', 'by_duration',
+                 'sorted_duration_ms')
+
+    def __init__(self, start_frame, start_ms, end_ms, missing, gap_ms):
+        self.start_frame = np.asarray(start_frame, dtype=np.int64)
+        self.start_ms = np.asarray(start_ms, dtype=np.float64)
+        self.end_ms = np.asarray(end_ms, dtype=np.float64)
+        self.missing = np.asarray(missing, dtype=np.int64)
+        self.duration_ms = self.end_ms - self.start_ms
+        self.gap_ms = float(gap_ms)
+        self.missing_sum = np.concatenate(([0], np.cumsum(self.missing)))
+        self.by_duration = np.argsort(self.duration_ms, kind='stable')
+        self.sorted_duration_ms = self.duration_ms[self.by_duration]
+
+
+    @classmethod
+    def from_timestamps(cls, timestamps, target_framerate=None):
+        """Returns the index of the gaps between timestamps.
+
+           Args:
+               timestamps: Array of frame timestamps in ms.
+               target_framerate: The framerate the capture was asked for,
+               defaults to the measured framerate.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if not target_framerate and len(timestamps) > 1 and \
+                timestamps[-1] > timestamps[0]:
+            target_framerate = 1000.0 * (len(timestamps) - 1) / \
+                (timestamps[-1] - timestamps[0])
+        if not target_framerate:
+            empty = np.zeros(0)
+            return cls(empty, empty, empty, empty, 0.0)
+        return cls.from_slots(timestamps,
+                              classify_frames(timestamps, target_framerate))
+
+
+    @classmethod
+    def from_slots(cls, timestamps, frame_slots):
+        """Returns the index of the slots frame_slots found dropped.
+
+           Args:
+               timestamps: Array of frame timestamps in ms.
+               frame_slots: The frame_slots.FrameSlots of timestamps.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        after = np.flatnonzero(frame_slots.missing)
+        return cls(after - 1, timestamps[after - 1], timestamps[after],
+                   frame_slots.missing[after], frame_slots.time_gap * 1000.0)
+
+
+    def __len__(self):
+        return len(self.start_ms)
+
+
+    def kinds(self):
+        """Returns an array of the kind of each gap, DROP or STALL."""
+        return np.where(self.duration_ms > STALL_GAPS * self.gap_ms,
+                        STALL, DROP)
+
+
+    def total_missing(self):
+        """Returns the number of frames missing from the whole capture."""
+        return int(self.missing_sum[-1])
+
+
+    def overlapping(self, start_ms, end_ms):
+        """Returns the indices of the gaps overlapping [start_ms, end_ms).
+
+           Gaps are sorted by both start and end, so they are a slice.
+        """
+        first = int(np.searchsorted(self.end_ms, start_ms, side='right'))
+        last = int(np.searchsorted(self.start_ms, end_ms, side='left'))
+        return np.arange(first, max(first, last))
+
+
+    def missing_between(self, start_ms, end_ms):
+        """Returns the number of frames missing in [start_ms, end_ms).
+
+           A gap's missing frames are spread evenly over it, so a gap only
+           partly inside the range counts the frames that fall in the
+           range.
+        """
+        index = self.overlapping(start_ms, end_ms)
+        if len(index) == 0:
+            return 0
+        total = int(self.missing_sum[index[-1] + 1] -
+                    self.missing_sum[index[0]])
+        # Only the gaps at either end of the range can stick out of it
+        for i in sorted(set((int(index[0]), int(index[-1])))):
+            total -= int(self.missing[i]) - \
+                self._missing_inside(i, start_ms, end_ms)
+        return total
+
+
+    def _missing_inside(self, i, start_ms, end_ms):
+        """Returns how many missing frames of gap i are in the range."""
+        missing = int(self.missing[i])
+        step = self.duration_ms[i] / (missing + 1)
+        # Missing frame k of the gap would have come at start + k * step
+        low = 1
+        if start_ms > self.start_ms[i]:
+            low = max(low, int(np.ceil((start_ms - self.start_ms[i]) / step)))
+        high = missing
+        if end_ms < self.end_ms[i]:
+            high = min(high, int(np.ceil((end_ms - self.start_ms[i]) /
+                                         step)) - 1)
+        return max(0, high - low + 1)
+
+
+    def count_longer_than(self, duration_ms):
+        """Returns the number of gaps lasting longer than duration_ms."""
+        position = np.searchsorted(self.sorted_duration_ms, duration_ms,
+                                   side='right')
+        return len(self) - int(position)
+
+
+    def longer_than(self, duration_ms, start_ms=None, end_ms=None):
+        """Returns the indices of the gaps lasting longer than duration_ms.
+
+           Without a range, the gaps sorted by duration are binary searched,
+           O(log n + k) for k gaps found. With a range, the gaps
+           overlapping it are found first and only those are checked, so
+           the cost is O(log n + m) for the m gaps in the range however
+           many there are in the whole capture.
+
+           Args:
+               duration_ms: Shortest duration, exclusive.
+               start_ms: Optionally, only gaps overlapping this range.
+               end_ms: End of the range.
+        """
+        if start_ms is not None or end_ms is not None:
+            span = self.overlapping(-np.inf if start_ms is None else start_ms,
+                                    np.inf if end_ms is None else end_ms)
+            return span[self.duration_ms[span] > duration_ms]
+        position = np.searchsorted(self.sorted_duration_ms, duration_ms,
+                                   side='right')
+        return np.sort(self.by_duration[position:])
+
+
+    def records(self, index=None):
+        """Returns a list of dicts describing the gaps at index (or all)."""
+        if index is None:
+            index = np.arange(len(self))
+        kinds = self.kinds()
+        return [{'frame': int(self.start_frame[i]),
+                 'start_ms': float(self.start_ms[i]),
+                 'end_ms': float(self.end_ms[i]),
+                 'duration_ms': float(self.duration_ms[i]),
+                 'missing': int(self.missing[i]),
+                 'kind': str(kinds[i])} for i in np.asarray(index).tolist()]
+
+
+    def save(self, path, signature=None, settings=None):
+        """Writes the index to an .npz file, replaced atomically.
+
+           Args:
+               path: The file to write.
+               signature: Optional (size, mtime_ns) of the log it was made
+               from, so a stale index can be told apart.
+               settings: Optional (target_framerate,) it was made with.
+        """
+        tmp_path = '%s.%d.tmp' % (path, os.getpid())
+        with open(tmp_path, 'wb') as tmp_file:
+            np.savez(tmp_file, version=np.int64(VERSION),
+                     start_frame=self.start_frame, start_ms=self.start_ms,
+                     end_ms=self.end_ms, missing=self.missing,
+                     gap_ms=np.float64(self.gap_ms),
+                     signature=np.array(signature or (-1, -1),
+                                        dtype=np.int64),
+                     settings=np.array(settings or (0.0,),
+                                       dtype=np.float64))
+        os.replace(tmp_path, path)
+
+
+    @classmethod
+    def load(cls, path):
+        """Returns the index saved in path, with its signature and settings.
+
+           Returns:
+               A tuple (index, signature, settings), see save.
+        """
+        with np.load(path) as saved:
+            if int(saved['version']) != VERSION:
+                raise ValueError('%s has unsupported version %i' %
+                                 (path, int(saved['version'])))
+            index = cls(saved['start_frame'], saved['start_ms'],
+                        saved['end_ms'], saved['missing'],
+                        float(saved['gap_ms']))
+            return (index, tuple(saved['signature'].tolist()),
+                    tuple(saved['settings'].tolist()))
+
+
+def load_gap_index(timestamp_path, timestamps=None, target_framerate=None,
+                   persist=True):
+    """Returns the GapIndex of a log, from its saved index when current.
+
+       Args:
+           timestamp_path: The timestamp log (or capture file).
+           timestamps: Function returning the log's timestamps, only called
+           when the index has to be built.
+           target_framerate: See GapIndex.from_timestamps.
+           persist: Whether to read and write timestamp_path + GAP_SUFFIX.
+    """
+    stat = os.stat(timestamp_path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    settings = (float(target_framerate or 0.0),)
+    index_path = timestamp_path + GAP_SUFFIX
+    if persist:
+        try:
+            (index, saved_signature, saved_settings) = GapIndex.load(
+                index_path)
+            if saved_signature == signature and saved_settings == settings:
+                return index
+        except (IOError, OSError, ValueError, KeyError):
+            pass
+
+    if timestamps is None:
+        from file_analysis import load_timestamps
+        values = load_timestamps(timestamp_path)
+    else:
+        values = timestamps()
+    index = GapIndex.from_timestamps(values, target_framerate)
+    if persist:
+        try:
+            index.save(index_path, signature, settings)
+        except (IOError, OSError) as e:
+            print('Warning! Could not write gap index %s: %s' %
+                  (index_path, e))
+    return index
+
+
+def main():
+    """Answers questions about the gaps of logs from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('paths', nargs='+', help='Timestamp logs')
+    parser.add_argument('-f', '--fps', type=float, default=None,
+                        help='Target framerate (default: from the name, '
+                             'else measured)')
+    parser.add_argument('--between', type=float, nargs=2, default=None,
+                        metavar=('START_SEC', 'END_SEC'),
+                        help='Only count gaps in this time range')
+    parser.add_argument('--longer-than', type=float, default=None,
+                        help='List the gaps longer than this many ms')
+    parser.add_argument('--no-save', action='store_true',
+                        help='Do not read or write saved indexes')
+    args = parser.parse_args()
+
+    from file_analysis import FileAnalysis
+    for path in args.paths:
+        index = FileAnalysis(path, not args.no_save).gap_index(args.fps)
+        (start_ms, end_ms) = (-np.inf, np.inf)
+        if args.between is not None:
+            (start_ms, end_ms) = (args.between[0] * 1000.0,
+                                  args.between[1] * 1000.0)
+        print('%s: %i gaps, %i frames missing' %
+              (path, len(index.overlapping(start_ms, end_ms)),
+               index.missing_between(start_ms, end_ms)))
+        if args.longer_than is not None:
+            for record in index.records(index.longer_than(
+                    args.longer_than, start_ms, end_ms)):
+                print('    %(kind)-5s at %(start_ms)12.3f ms for '
+                      '%(duration_ms)10.3f ms, %(missing)i missing' % record)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+"""Counts the frames of a raw Annex-B H.264 capture without decoding it.
+
+   The file is memory-mapped and searched for start codes a chunk at a time
+   with NumPy. Each NAL unit is classified from its header byte, and a new
+   frame begins at every slice whose first_mb_in_slice is 0. This gives
+   frame counts, GOP structure and per-frame sizes at disk speed, to cross
+   check against the frames in a timestamp log.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import mmap
+import argparse
+import numpy as np
+
+# NAL unit types
+NON_IDR = 1
+IDR = 5
+SEI = 6
+SPS = 7
+PPS = 8
+AUD = 9
+
+NAL_NAMES = {
+    NON_IDR: 'slice',
+    IDR: 'idr',
+    SEI: 'sei',
+    SPS: 'sps',
+    PPS: 'pps',
+    AUD: 'aud',
+}
+
+# Bytes searched at a time, keeps the temporary arrays small
+CHUNK_BYTES = 1 << 24
+
+
+def find_start_codes(data, chunk_bytes=CHUNK_BYTES):
+    """Returns the offsets of every 00 00 01 start code in data.
+
+       Args:
+           data: A bytes-like object such as an mmap.
+           chunk_bytes: Bytes searched at a time.
+
+       Returns:
+           An int64 array of the offsets of the first 00 of each start code.
+    """
+    size = len(data)
+    found = []
+    for start in range(0, size, chunk_bytes):
+        # Overlap by two bytes so codes across chunk borders are found
+        stop = min(start + chunk_bytes + 2, size)
+        chunk = np.frombuffer(data, dtype=np.uint8, count=stop - start,
+                              offset=start)
+        # 01 bytes are rare, so check them first and then their prefix
+        ones = np.flatnonzero(chunk[2:] == 1)
+        ones = ones[(chunk[ones] == 0) & (chunk[ones + 1] == 0)]
+        found.append(ones + start)
+    if not found:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(found).astype(np.int64)
+
+
+class H264Scan(object):
+    """The NAL units and frames of a raw H.264 stream.
+
+       Args:
+           path: The .h264 file.
+
+       Attributes:
+           path: The .h264 file.
+           nal_offset: Array of the offset of each NAL unit, start code
+           included.
+           nal_size: Array of the bytes of each NAL unit, start code
+           included.
+           nal_type: Array of the nal_unit_type of each NAL unit.
+           nal_ref_idc: Array of the nal_ref_idc of each NAL unit.
+           frame_nal: Array of the first slice NAL of each frame.
+           frame_size: Array of the bytes of each frame, including the
+           parameter sets and SEI sent ahead of it.
+           keyframe: Boolean array, True for IDR frames.
+    """
+    __slots__ = ('path', 'nal_offset', 'nal_size', 'nal_type',
+                 'nal_ref_idc', 'frame_nal', 'frame_size', 'keyframe')
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as h264_file:
+            data = mmap.mmap(h264_file.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                self.scan(data)
+            finally:
+                data.close()
+
+
+    def scan(self, data):
+        """Finds and classifies the NAL units and frames in data."""
+        size = len(data)
+        codes = find_start_codes(data)
+        payload = codes + 3
+        payload = payload[payload < size]
+        codes = codes[:len(payload)]
+
+        # A zero before the start code makes it a 4-byte code
+        raw = np.frombuffer(data, dtype=np.uint8)
+        offset = codes.copy()
+        long_code = offset > 0
+        long_code[long_code] = raw[offset[long_code] - 1] == 0
+        offset[long_code] -= 1
+        self.nal_offset = offset
+        self.nal_size = np.diff(np.append(offset, size))
+
+        header = raw[payload]
+        self.nal_type = (header & 0x1f).astype(np.int64)
+        self.nal_ref_idc = ((header >> 5) & 0x3).astype(np.int64)
+
+        # first_mb_in_slice is ue(v) coded, so it is 0 exactly when the
+        #     first bit after the header is set
+        vcl = (self.nal_type == NON_IDR) | (self.nal_type == IDR)
+        following = np.minimum(payload + 1, size - 1)
+        first_slice = vcl & ((raw[following] & 0x80) != 0) & \
+            (payload + 1 < size)
+        self.frame_nal = np.flatnonzero(first_slice)
+
+        # Slices belong to the last frame started, other units to the next
+        nal_index = np.arange(len(self.nal_type))
+        frame = np.where(vcl,
+                         np.searchsorted(self.frame_nal, nal_index,
+                                         side='right') - 1,
+                         np.searchsorted(self.frame_nal, nal_index))
+        frame = np.clip(frame, 0, max(len(self.frame_nal) - 1, 0))
+        self.frame_size = np.bincount(frame, weights=self.nal_size,
+                                      minlength=len(self.frame_nal)
+                                      )[:len(self.frame_nal)].astype(np.int64)
+        self.keyframe = np.zeros(len(self.frame_nal), dtype=bool)
+        idr_frames = frame[self.nal_type == IDR]
+        self.keyframe[idr_frames[idr_frames < len(self.frame_nal)]] = True
+
+
+    def frames(self):
+        """Returns the number of frames in the stream."""
+        return len(self.frame_nal)
+
+
+    def type_counts(self):
+        """Returns a dict of the number of NAL units of each type."""
+        counts = np.bincount(self.nal_type, minlength=32)
+        return dict((NAL_NAMES.get(i, 'type%i' % i), int(count))
+                    for i, count in enumerate(counts.tolist()) if count)
+
+
+    def keyframes(self):
+        """Returns the frame indices of the IDR frames."""
+        return np.flatnonzero(self.keyframe)
+
+
+    def gop_lengths(self):
+        """Returns the number of frames from each IDR frame to the next.
+
+           Frames before the first IDR frame are not part of any GOP.
+        """
+        keys = self.keyframes()
+        return np.diff(np.append(keys, self.frames()))
+
+
+    def summary(self):
+        """Returns a dict of the frame count, GOPs and frame sizes."""
+        gops = self.gop_lengths()
+        sizes = self.frame_size
+        return {
+            'path': self.path,
+            'frames': self.frames(),
+            'keyframes': int(self.keyframe.sum()),
+            'gop_min': int(gops.min()) if len(gops) else 0,
+            'gop_max': int(gops.max()) if len(gops) else 0,
+            'frame_bytes_mean': float(sizes.mean()) if len(sizes) else 0.0,
+            'frame_bytes_max': int(sizes.max()) if len(sizes) else 0,
+            'keyframe_bytes_mean': (float(sizes[self.keyframe].mean())
+                                    if self.keyframe.any() else 0.0),
+            'nal_units': self.type_counts(),
+        }
+
+
+def count_frames(path):
+    """Returns the number of frames in a raw .h264 file."""
+    return H264Scan(path).frames()
+
+
+def check_frame_count(path, timestamps):
+    """Compares the frames in a raw .h264 file with its timestamps.
+
+       Args:
+           path: The .h264 file.
+           timestamps: Array of the frame timestamps logged for it.
+
+       Returns:
+           The number of frames in the bitstream minus the number of
+           timestamps, 0 when they agree.
+    """
+    return count_frames(path) - len(timestamps)
+
+
+def main():
+    """Prints the frame count and GOP structure of .h264 files."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('paths', nargs='+', help='Raw .h264 files')
+    parser.add_argument('-t', '--timestamps', action='store_true',
+                        help='Check against the .timestamp.log of each file')
+    args = parser.parse_args()
+
+    for path in args.paths:
+        summary = H264Scan(path).summary()
+        print('%s: %i frames, %i keyframes, GOP %i-%i, %.0f bytes/frame' %
+              (path, summary['frames'], summary['keyframes'],
+               summary['gop_min'], summary['gop_max'],
+               summary['frame_bytes_mean']))
+        print('    NAL units: %s' % ', '.join(
+            '%s=%i' % item for item in sorted(summary['nal_units'].items())))
+        if args.timestamps:
+            from file_analysis import load_timestamps, split_log_path
+            timestamp_path = split_log_path(path)[1]
+            try:
+                difference = check_frame_count(
+                    path, load_timestamps(timestamp_path))
+            except (IOError, OSError):
+                print('    Warning! No timestamp log at %s' % timestamp_path)
+                continue
+            if difference:
+                print('    Warning! %+i frames compared to %s' %
+                      (difference, timestamp_path))
+            else:
+                print('    Frame count matches %s' % timestamp_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""A fixed size, mergeable histogram of frame intervals for tail latency
+   percentiles.
+
+   Buckets follow the HDR histogram layout: values are recorded in whole
+   microseconds and every power of two range is split into the same number
+   of linear sub-buckets, so the relative error is bounded at every scale
+   while the memory use stays constant.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import json
+import math
+import numpy as np
+
+
+class IntervalHistogram(object):
+    """Counts of frame intervals in log-linear buckets.
+
+       Args:
+           significant_digits: Decimal digits of precision kept for every
+           value (1 to 4).
+           highest_ms: Largest interval that is told apart, larger ones are
+           counted in the top bucket.
+
+       Attributes:
+           significant_digits: Decimal digits of precision.
+           highest_ms: Largest interval that is told apart.
+           sub_bucket_bits: Number of bits in the sub-bucket index.
+           counts: Array of counts per bucket.
+           total: Number of values recorded.
+           sum_us: Sum of the recorded values in microseconds.
+           min_us: Smallest recorded value in microseconds.
+           max_us: Largest recorded value in microseconds.
+    """
+    __slots__ = ('significant_digits', 'highest_ms', 'sub_bucket_bits',
+                 'counts', 'total', 'sum_us', 'min_us', 'max_us')
+
+    def __init__(self, significant_digits=3, highest_ms=3600000):
+        if not 1 <= significant_digits <= 4:
+            raise ValueError('significant_digits must be between 1 and 4')
+        self.significant_digits = significant_digits
+        self.highest_ms = highest_ms
+        self.sub_bucket_bits = int(math.ceil(
+            math.log2(2 * 10**significant_digits)))
+        self.counts = np.zeros(self.index_of(self.highest_us()) + 1,
+                               dtype=np.int64)
+        self.total = 0
+        self.sum_us = 0
+        self.min_us = None
+        self.max_us = None
+
+
+    def highest_us(self):
+        """Returns the largest trackable value in microseconds."""
+        return int(self.highest_ms * 1000)
+
+
+    def half_count(self):
+        """Returns the number of sub-buckets in every bucket but the first."""
+        return 1 << (self.sub_bucket_bits - 1)
+
+
+    def index_of(self, value_us):
+        """Returns the bucket index of a value or array of values in us."""
+        values = np.asarray(value_us, dtype=np.int64)
+        # frexp gives the exact bit length for integers below 2**53
+        bit_length = np.frexp(values.astype(np.float64))[1]
+        bucket = np.maximum(bit_length - self.sub_bucket_bits, 0)
+        sub_bucket = values >> bucket
+        return bucket * self.half_count() + sub_bucket
+
+
+    def bucket_range(self, index):
+        """Returns the (lowest, highest) microsecond values of a bucket."""
+        half = self.half_count()
+        bucket = max(0, index // half - 1)
+        sub_bucket = index - bucket * half
+        lowest = sub_bucket << bucket
+        return (lowest, lowest + (1 << bucket) - 1)
+
+
+    def record(self, intervals_ms):
+        """Records an array of intervals given in ms."""
+        values = np.rint(np.asarray(intervals_ms, dtype=np.float64) * 1000.0)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return
+        values = np.clip(values, 0, self.highest_us()).astype(np.int64)
+
+        self.counts += np.bincount(self.index_of(values),
+                                   minlength=len(self.counts))
+        self.total += len(values)
+        self.sum_us += int(values.sum())
+        low = int(values.min())
+        high = int(values.max())
+        self.min_us = low if self.min_us is None else min(self.min_us, low)
+        self.max_us = high if self.max_us is None else max(self.max_us, high)
+
+
+    def compatible(self, other):
+        """Returns True if other has the same bucket layout."""
+        return (self.significant_digits == other.significant_digits and
+                self.highest_ms == other.highest_ms)
+
+
+    def merge(self, other):
+        """Adds the counts of another histogram with the same layout."""
+        if not self.compatible(other):
+            raise ValueError('Cannot merge histograms with different layouts')
+        self.counts += other.counts
+        self.total += other.total
+        self.sum_us += other.sum_us
+        if other.total:
+            self.min_us = other.min_us if self.min_us is None \
+                else min(self.min_us, other.min_us)
+            self.max_us = other.max_us if self.max_us is None \
+                else max(self.max_us, other.max_us)
+        return self
+
+
+    def percentile(self, percent):
+        """Returns the interval in ms that percent of intervals are under.
+
+           The value returned is the top of the bucket holding the
+           percentile, clamped to the largest value recorded.
+        """
+        if self.total == 0:
+            return 0.0
+        if percent >= 100:
+            return self.max_us / 1000.0
+        rank = max(1, int(math.ceil(percent / 100.0 * self.total)))
+        index = int(np.searchsorted(np.cumsum(self.counts), rank))
+        highest = min(self.bucket_range(index)[1], self.max_us)
+        return max(highest, self.min_us) / 1000.0
+
+
+    def percentiles(self, percents=(50, 90, 99, 99.9, 100)):
+        """Returns a dict of percent to interval in ms."""
+        return dict((percent, self.percentile(percent))
+                    for percent in percents)
+
+
+    def mean(self):
+        """Returns the mean interval in ms."""
+        if self.total == 0:
+            return 0.0
+        return self.sum_us / 1000.0 / self.total
+
+
+    def to_dict(self):
+        """Returns a JSON friendly dict, storing only non-empty buckets."""
+        index = np.flatnonzero(self.counts)
+        return {'significant_digits': self.significant_digits,
+                'highest_ms': self.highest_ms,
+                'total': self.total,
+                'sum_us': self.sum_us,
+                'min_us': self.min_us,
+                'max_us': self.max_us,
+                'index': index.tolist(),
+                'counts': self.counts[index].tolist()}
+
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuilds a histogram from to_dict()."""
+        histogram = cls(data['significant_digits'], data['highest_ms'])
+        histogram.counts[np.asarray(data['index'], dtype=np.int64)] = \
+            data['counts']
+        histogram.total = data['total']
+        histogram.sum_us = data['sum_us']
+        histogram.min_us = data['min_us']
+        histogram.max_us = data['max_us']
+        return histogram
+
+
+    def to_json(self):
+        """Returns the histogram serialized as a JSON string."""
+        return json.dumps(self.to_dict())
+
+
+    @classmethod
+    def from_json(cls, text):
+        """Rebuilds a histogram from to_json()."""
+        return cls.from_dict(json.loads(text))
+
+
+def histogram_of(intervals_ms, significant_digits=3):
+    """Returns an IntervalHistogram of an array of intervals in ms."""
+    histogram = IntervalHistogram(significant_digits)
+    histogram.record(intervals_ms)
+    return histogram
+
+
+def merge_histograms(histograms):
+    """Returns one histogram holding the counts of all of histograms."""
+    merged = None
+    for histogram in histograms:
+        if merged is None:
+            merged = IntervalHistogram(histogram.significant_digits,
+                                       histogram.highest_ms)
+        merged.merge(histogram)
+    return merged
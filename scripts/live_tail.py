@@ -0,0 +1,268 @@
+"""Follows a timestamp log while it is still being written and reports
+   frame timing as the capture runs.
+
+   Only running statistics and a short window of recent timestamps are
+   kept, so memory use stays flat no matter how long the capture is.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import os
+import time
+import argparse
+from collections import deque
+import numpy as np
+from running_stats import RunningStats
+from frame_slots import slot_steps
+from capture_catalog import parse_run_name
+from file_analysis import split_log_path
+
+
+class LogTail(object):
+    """Reads lines appended to a growing log file.
+
+       A line is only returned once its newline has been written, so a
+       timestamp that is half way through being written is never parsed.
+
+       Args:
+           path: The path to the log file.
+           chunk_size: Largest number of bytes read per call to read().
+
+       Attributes:
+           path: The path to the log file.
+           offset: Byte offset of the first unread line.
+           chunk_size: Largest number of bytes read per call to read().
+           rewinds: Number of times the file was truncated and read again
+           from the start.
+    """
+    __slots__ = ('path', 'offset', 'chunk_size', 'rewinds')
+
+    def __init__(self, path, chunk_size=1 << 20):
+        self.path = path
+        self.offset = 0
+        self.chunk_size = chunk_size
+        self.rewinds = 0
+
+
+    def read(self):
+        """Returns the bytes of the complete lines written since last read.
+
+           Returns an empty bytes object if nothing new has arrived or the
+           file does not exist yet. If the file was truncated it is read
+           again from the start.
+        """
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return b''
+        if size < self.offset:
+            self.offset = 0
+            self.rewinds += 1
+        if size == self.offset:
+            return b''
+
+        with open(self.path, 'rb') as log_file:
+            log_file.seek(self.offset)
+            data = log_file.read(self.chunk_size)
+
+        end = data.rfind(b'\n') + 1
+        if end == 0:
+            # A single line longer than chunk_size would otherwise stall
+            if len(data) < self.chunk_size:
+                return b''
+            end = len(data)
+        self.offset += end
+        return data[:end]
+
+
+    def read_floats(self):
+        """Returns the newly completed lines parsed as a float64 array."""
+        return np.array(self.read().split(), dtype=np.float64)
+
+
+class LiveAnalysis(object):
+    """Incremental frame timing statistics for one capture.
+
+       Frames are classified into slots at the target framerate the same
+       way as frame_slots.FrameSlots, one interval at a time, so only the
+       last slot is remembered.
+
+       Args:
+           target_framerate: The framerate the capture was asked for. If
+           None, drops are estimated against the running mean interval.
+           window: Number of recent timestamps kept for the current fps.
+
+       Attributes:
+           target_framerate: The framerate the capture was asked for.
+           stats: RunningStats of the frame intervals in ms.
+           frames: Number of timestamps seen.
+           first_time: The first timestamp in ms.
+           last_time: The latest timestamp in ms.
+           last_slot: The slot of the latest timestamp.
+           dropped: Number of empty slots so far.
+           extra: Number of frames sharing a slot so far.
+           recent: Deque of the latest timestamps in ms.
+    """
+    __slots__ = ('target_framerate', 'stats', 'frames', 'first_time',
+                 'last_time', 'last_slot', 'dropped', 'extra', 'recent')
+
+    def __init__(self, target_framerate=None, window=256):
+        self.target_framerate = target_framerate
+        self.stats = RunningStats()
+        self.frames = 0
+        self.first_time = None
+        self.last_time = None
+        self.last_slot = None
+        self.dropped = 0
+        self.extra = 0
+        self.recent = deque(maxlen=window)
+
+
+    def add(self, timestamps):
+        """Adds a chunk of new timestamps in ms."""
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if len(timestamps) == 0:
+            return
+
+        if self.last_time is None:
+            self.first_time = float(timestamps[0])
+            differences = np.diff(timestamps)
+        else:
+            differences = np.diff(np.concatenate(([self.last_time],
+                                                  timestamps)))
+
+        self.count_slots(timestamps, differences)
+        self.stats.add_array(differences)
+        self.frames += len(timestamps)
+        self.last_time = float(timestamps[-1])
+        self.recent.extend(timestamps[-self.recent.maxlen:].tolist())
+
+
+    def count_slots(self, timestamps, differences):
+        """Updates the dropped and extra counts for a chunk."""
+        if self.target_framerate:
+            gap = 1000.0 / self.target_framerate
+        elif self.stats.count > 0 or len(differences) > 1:
+            gap = self.stats.mean if self.stats.count else \
+                float(np.median(differences))
+        else:
+            return
+        steps = slot_steps(differences, gap)
+        self.dropped += int((steps[steps > 1] - 1).sum())
+        self.extra += int(np.count_nonzero(steps == 0))
+        self.last_slot = (self.last_slot or 0) + int(steps.sum())
+
+
+    def framerate(self):
+        """Returns the mean framerate over the whole capture so far."""
+        if self.stats.count == 0 or self.stats.mean <= 0:
+            return 0.0
+        return 1000.0 / self.stats.mean
+
+
+    def recent_framerate(self):
+        """Returns the framerate over the recent window."""
+        if len(self.recent) < 2:
+            return 0.0
+        span = self.recent[-1] - self.recent[0]
+        if span <= 0:
+            return 0.0
+        return 1000.0 * (len(self.recent) - 1) / span
+
+
+    def snapshot(self):
+        """Returns a dict describing the capture so far."""
+        duration = 0.0
+        if self.last_time is not None:
+            duration = (self.last_time - self.first_time) / 1000.0
+        return {'frames': self.frames,
+                'duration_sec': duration,
+                'fps': self.framerate(),
+                'recent_fps': self.recent_framerate(),
+                'mean_interval_ms': self.stats.mean,
+                'interval_std_ms': self.stats.standard_deviation(),
+                'max_interval_ms': self.stats.maximum if self.stats.count
+                                   else 0.0,
+                'dropped': self.dropped,
+                'extra': self.extra}
+
+
+def format_snapshot(snapshot):
+    """Returns a one line summary of a snapshot."""
+    return ('%(duration_sec)9.1f sec  %(frames)8i frames  '
+            '%(fps)7.2f fps (now %(recent_fps)7.2f)  '
+            'std %(interval_std_ms)7.3f ms  '
+            'dropped %(dropped)6i  extra %(extra)6i' % snapshot)
+
+
+def follow(path, target_framerate=None, interval=1.0, poll=0.1,
+           idle_timeout=None, callback=None):
+    """Tails a timestamp log and emits a snapshot every interval seconds.
+
+       Args:
+           path: The video path or its timestamp log.
+           target_framerate: The framerate the capture was asked for,
+           defaults to the one in the file name.
+           interval: Seconds between snapshots.
+           poll: Seconds to sleep when no new lines have been written.
+           idle_timeout: Stop after this many seconds without new lines, or
+           None to run until interrupted.
+           callback: Called with each snapshot dict, defaults to printing
+           it.
+
+       Returns:
+           The final snapshot.
+    """
+    (_, timestamp_path) = split_log_path(path)
+    if target_framerate is None:
+        target_framerate = parse_run_name(timestamp_path).fps
+    if callback is None:
+        callback = lambda snapshot: print(format_snapshot(snapshot))
+
+    tail = LogTail(timestamp_path)
+    analysis = LiveAnalysis(target_framerate)
+    next_report = time.monotonic() + interval
+    last_growth = time.monotonic()
+
+    try:
+        while True:
+            timestamps = tail.read_floats()
+            now = time.monotonic()
+            if len(timestamps):
+                analysis.add(timestamps)
+                last_growth = now
+            elif idle_timeout is not None and now - last_growth > idle_timeout:
+                break
+            else:
+                time.sleep(poll)
+
+            if now >= next_report:
+                callback(analysis.snapshot())
+                next_report = now + interval
+    except KeyboardInterrupt:
+        pass
+
+    snapshot = analysis.snapshot()
+    callback(snapshot)
+    return snapshot
+
+
+def main():
+    """Follows a capture from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('path', help='Video path or timestamp log')
+    parser.add_argument('-f', '--fps', type=float, default=None,
+                        help='Target framerate (default: from the name)')
+    parser.add_argument('-i', '--interval', type=float, default=1.0,
+                        help='Seconds between reports')
+    parser.add_argument('--idle-timeout', type=float, default=None,
+                        help='Stop after this many seconds without frames')
+    args = parser.parse_args()
+
+    follow(args.path, args.fps, args.interval, idle_timeout=args.idle_timeout)
+
+
+if __name__ == '__main__':
+    main()
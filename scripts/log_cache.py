@@ -0,0 +1,176 @@
+"""Caches parsed log files as memory-mappable .npy sidecars so that
+   re-analyzing the same captures does not reparse their text.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import os
+import hashlib
+import numpy as np
+
+# Where the sidecars are kept unless a cache directory is given explicitly
+#     or set with PICAM_CACHE_DIR
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'picam')
+
+# Upper bound on the total size of all sidecars before eviction kicks in
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def cache_disabled():
+    """Returns True if caching has been turned off with PICAM_NO_CACHE."""
+    return os.environ.get('PICAM_NO_CACHE', '') not in ('', '0')
+
+
+class LogCache(object):
+    """A size-bounded store of parsed logs keyed on path, size and mtime.
+
+       Entries are plain .npy files loaded with mmap, so a warm hit costs
+       two stat calls and a header read regardless of the log length. When
+       the store grows past max_bytes the least recently used sidecars are
+       removed.
+
+       Args:
+           cache_dir: Directory that holds the sidecar files, defaults to
+           PICAM_CACHE_DIR or else DEFAULT_CACHE_DIR.
+           max_bytes: Total size the sidecars may take up on disk.
+
+       Attributes:
+           cache_dir: Directory that holds the sidecar files.
+           max_bytes: Total size the sidecars may take up on disk.
+    """
+    __slots__ = ('cache_dir', 'max_bytes')
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or os.environ.get('PICAM_CACHE_DIR') or \
+            DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+
+
+    def sidecar_path(self, path, kind):
+        """Returns the sidecar file for the current state of path.
+
+           Args:
+               path: The log file being cached.
+               kind: A tag for the parser, so one log may have several
+               parsed forms.
+        """
+        stat = os.stat(path)
+        path_key = hashlib.sha1(
+            (os.path.abspath(path) + '\0' + kind).encode('utf-8')).hexdigest()
+        state_key = '%x-%x' % (stat.st_size, stat.st_mtime_ns)
+        return os.path.join(self.cache_dir,
+                            '%s-%s.npy' % (path_key[:20], state_key))
+
+
+    def load(self, path, kind, parser):
+        """Returns the parsed contents of path, using the sidecar if valid.
+
+           Args:
+               path: The log file to load.
+               kind: A tag for the parser used.
+               parser: Function taking the path and returning an ndarray.
+
+           Returns:
+               An ndarray, memory-mapped read-only on a cache hit.
+        """
+        sidecar = self.sidecar_path(path, kind)
+        try:
+            data = np.load(sidecar, mmap_mode='r')
+            # Mark the entry as recently used for eviction
+            os.utime(sidecar)
+            return data
+        except (IOError, OSError, ValueError):
+            pass
+
+        data = parser(path)
+        try:
+            self.store(sidecar, data)
+        except (IOError, OSError) as e:
+            print('Warning! Could not write cache file %s: %s' % (sidecar, e))
+        return data
+
+
+    def store(self, sidecar, data):
+        """Writes data to sidecar, dropping stale entries for the same log."""
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Any other sidecar with the same path prefix is for an older
+        #     version of the log and can never be hit again
+        prefix = os.path.basename(sidecar).split('-')[0] + '-'
+        for name in os.listdir(self.cache_dir):
+            if name.startswith(prefix) and name.endswith('.npy'):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+        # Write then rename so a concurrent reader never sees half a file
+        tmp_path = '%s.%d.tmp' % (sidecar, os.getpid())
+        with open(tmp_path, 'wb') as tmp_file:
+            np.save(tmp_file, np.ascontiguousarray(data))
+        os.replace(tmp_path, sidecar)
+
+        self.evict()
+
+
+    def evict(self):
+        """Removes least recently used sidecars until under max_bytes."""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.npy'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for (_, size, path) in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+
+    def clear(self):
+        """Removes every sidecar in the cache directory."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.npy') or name.endswith('.tmp'):
+                os.remove(os.path.join(self.cache_dir, name))
+
+
+_default_cache = None
+
+
+def default_cache():
+    """Returns the process wide LogCache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = LogCache()
+    return _default_cache
+
+
+def cached_load(path, kind, parser, use_cache=True):
+    """Parses path with parser, going through the default cache.
+
+       Args:
+           path: The log file to load.
+           kind: A tag for the parser used.
+           parser: Function taking the path and returning an ndarray.
+           use_cache: False to bypass the cache and always parse.
+    """
+    if not use_cache or cache_disabled():
+        return parser(path)
+    return default_cache().load(path, kind, parser)
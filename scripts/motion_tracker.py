@@ -0,0 +1,300 @@
+"""Tracks a moving subject by background subtraction and writes the
+   .tracking.log that FileAnalysis reads.
+
+   Frames are downsampled by striding, optionally box blurred and compared
+   with a running-average background, all in NumPy. The bounding box of the
+   changed pixels is the subject. The background is not updated under the
+   subject, so it leaves no trail behind it. Only every stride-th frame is
+   processed; the boxes of the frames in between are interpolated. The
+   frames/sec of each configuration is reported so settings can be chosen
+   that keep up with the capture.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import io
+import time
+import argparse
+import numpy as np
+from yuv_reader import YuvVideo
+
+# The box written for frames where nothing has been tracked yet
+NO_BOX = (-1, -1, -1, -1)
+
+
+def box_blur(image, radius):
+    """Returns image averaged over (2 * radius + 1) square boxes.
+
+       Uses running sums along each axis, so the cost does not depend on
+       the radius. Edges are handled by clamping.
+    """
+    if radius <= 0:
+        return image
+    size = 2 * radius + 1
+    for axis in (0, 1):
+        padded = np.concatenate(
+            (np.repeat(np.take(image, [0], axis), radius + 1, axis),
+             image,
+             np.repeat(np.take(image, [-1], axis), radius, axis)), axis)
+        sums = np.cumsum(padded, axis=axis, dtype=np.float32)
+        image = (np.take(sums, np.arange(size, sums.shape[axis]), axis) -
+                 np.take(sums, np.arange(0, sums.shape[axis] - size), axis)
+                 ) / size
+    return image
+
+
+class MotionTracker(object):
+    """Finds the box around whatever moved against the background.
+
+       Args:
+           stride: Process 1 frame in every stride, like the '1per5'
+           captures.
+           scale: Keep 1 pixel in every scale along each axis.
+           blur: Radius of the box blur in downsampled pixels, 0 for none.
+           roi: Optional (x0, y0, x1, y1) region of the full frame to
+           track in.
+           threshold: Change in brightness that counts as motion.
+           learning_rate: How fast the background follows the frames where
+           they have not changed, 0 keeps the first frame as the
+           background.
+           absorb_frames: Processed frames a pixel may stay changed before
+           it is taken into the background, so that whatever was in the
+           first frame, or a subject that has stopped, does not stay in
+           the box. 0 never absorbs.
+           min_pixels: Fewest changed downsampled pixels that count as
+           motion, otherwise the last box is kept.
+
+       Attributes:
+           background: Running-average background, or None before the
+           first frame.
+           changed: Processed frames each background pixel has been
+           changed for.
+           box: The last box found as (x0, y0, x1, y1) in full frame
+           pixels, NO_BOX until motion is first found.
+    """
+    __slots__ = ('stride', 'scale', 'blur', 'roi', 'threshold',
+                 'learning_rate', 'absorb_frames', 'min_pixels',
+                 'background', 'changed', 'box')
+
+    def __init__(self, stride=1, scale=4, blur=2, roi=None, threshold=25,
+                 learning_rate=0.05, absorb_frames=100, min_pixels=4):
+        self.stride = stride
+        self.scale = scale
+        self.blur = blur
+        self.roi = roi
+        self.threshold = threshold
+        self.learning_rate = learning_rate
+        self.absorb_frames = absorb_frames
+        self.min_pixels = min_pixels
+        self.background = None
+        self.changed = None
+        self.box = NO_BOX
+
+
+    def prepare(self, gray):
+        """Returns the cropped, downsampled and blurred frame as float32."""
+        if self.roi is not None:
+            (x0, y0, x1, y1) = self.roi
+            gray = gray[y0:y1, x0:x1]
+        small = np.asarray(gray[::self.scale, ::self.scale], dtype=np.float32)
+        return box_blur(small, self.blur)
+
+
+    def update(self, gray):
+        """Tracks one frame and returns its box."""
+        small = self.prepare(gray)
+        if self.background is None:
+            self.background = small
+            self.changed = np.zeros(small.shape, dtype=np.int32)
+            return self.box
+
+        moved = np.abs(small - self.background) > self.threshold
+        self.changed = np.where(moved, self.changed + 1, 0)
+        if self.absorb_frames:
+            stale = self.changed > self.absorb_frames
+            self.background[stale] = small[stale]
+            self.changed[stale] = 0
+            moved &= ~stale
+        # Learning under the subject would leave a trail of it behind
+        if self.learning_rate:
+            self.background += np.where(
+                moved, 0, self.learning_rate * (small - self.background))
+
+        if np.count_nonzero(moved) >= self.min_pixels:
+            rows = np.flatnonzero(moved.any(axis=1))
+            columns = np.flatnonzero(moved.any(axis=0))
+            (x_offset, y_offset) = (0, 0)
+            if self.roi is not None:
+                (x_offset, y_offset) = self.roi[:2]
+            self.box = (int(columns[0]) * self.scale + x_offset,
+                        int(rows[0]) * self.scale + y_offset,
+                        int(columns[-1] + 1) * self.scale + x_offset,
+                        int(rows[-1] + 1) * self.scale + y_offset)
+        return self.box
+
+
+    def track(self, frames, start=0):
+        """Tracks a sequence of grayscale frames.
+
+           Args:
+               frames: Iterable of 2D uint8 frames, such as a YuvVideo.
+               start: Index of the first frame in the whole video, so that
+               a segment processes the same frames as a full pass would.
+
+           Returns:
+               A TrackingResult, its processed frames indexed in the whole
+               video.
+        """
+        processed = []
+        boxes = []
+        count = 0
+        began = time.monotonic()
+        for (i, gray) in enumerate(frames, start):
+            count += 1
+            if i % self.stride:
+                continue
+            processed.append(i)
+            boxes.append(self.update(gray))
+        elapsed = time.monotonic() - began
+        return TrackingResult(count, np.array(processed, dtype=np.int64),
+                              np.array(boxes, dtype=np.int64).reshape(-1, 4),
+                              elapsed)
+
+
+class TrackingResult(object):
+    """The boxes tracked in a video.
+
+       Attributes:
+           frames: Number of frames in the video.
+           processed: Array of the frames that were tracked.
+           processed_boxes: Array of x0, y0, x1, y1 for the processed
+           frames.
+           elapsed: Seconds spent tracking.
+    """
+    __slots__ = ('frames', 'processed', 'processed_boxes', 'elapsed')
+
+    def __init__(self, frames, processed, processed_boxes, elapsed):
+        self.frames = frames
+        self.processed = processed
+        self.processed_boxes = processed_boxes
+        self.elapsed = elapsed
+
+
+    def boxes(self):
+        """Returns an (frames, 4) array of boxes for every frame.
+
+           Skipped frames are interpolated between the processed frames
+           around them; frames after the last processed one keep its box.
+           A skipped frame next to a processed frame without a box gets the
+           box of the processed frame before it, so NO_BOX is never
+           interpolated.
+        """
+        frame = np.arange(self.frames)
+        boxes = np.full((self.frames, 4), -1, dtype=np.int64)
+        if len(self.processed) == 0:
+            return boxes
+        for column in range(4):
+            boxes[:, column] = np.rint(np.interp(
+                frame, self.processed, self.processed_boxes[:, column]))
+
+        valid = np.any(self.processed_boxes != NO_BOX, axis=1)
+        if not valid.all():
+            before = np.maximum(np.searchsorted(self.processed, frame,
+                                                side='right') - 1, 0)
+            after = np.minimum(before + 1, len(self.processed) - 1)
+            held = ~valid[before] | ~valid[after]
+            boxes[held] = self.processed_boxes[before[held]]
+        return boxes
+
+
+    def fps(self):
+        """Returns the frames of video tracked per second of work."""
+        return self.frames / self.elapsed if self.elapsed else float('inf')
+
+
+def write_tracking_log(path, boxes, buzz=None):
+    """Writes boxes in the format of a .tracking.log.
+
+       The first line of a tracking log does not belong to a frame (see
+       FileAnalysis), so an empty box is written ahead of the frames.
+
+       Args:
+           path: The log to write.
+           boxes: Array of x0, y0, x1, y1 rows, one per frame.
+           buzz: Optional array of 0/1 buzz flags per frame. Without it
+           the buzz column is left out.
+    """
+    rows = np.asarray(boxes, dtype=np.int64)[:, :4]
+    if buzz is not None:
+        rows = np.column_stack((rows, np.asarray(buzz, dtype=np.int64)
+                                [:len(rows)]))
+    lines = [u'0,0,0,0'] + [u','.join(str(value) for value in row)
+                            for row in rows.tolist()]
+    with io.open(path, 'w') as tracking_file:
+        tracking_file.write(u'\n'.join(lines) + u'\n')
+
+
+def benchmark(frames, configs):
+    """Tracks frames once per configuration and reports the throughput.
+
+       Args:
+           frames: A re-iterable sequence of frames, such as a YuvVideo.
+           configs: List of dicts of MotionTracker arguments.
+
+       Returns:
+           A list of dicts, each config with its 'fps' and 'seconds'.
+    """
+    report = []
+    for config in configs:
+        result = MotionTracker(**config).track(frames)
+        row = dict(config)
+        row['fps'] = result.fps()
+        row['seconds'] = result.elapsed
+        report.append(row)
+    return report
+
+
+def main():
+    """Tracks a raw .yuv capture from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('path', help='Raw .yuv capture')
+    parser.add_argument('-s', '--size', default='640x480',
+                        help='Frame size as WIDTHxHEIGHT')
+    parser.add_argument('--padded', action='store_true',
+                        help='Frames are padded as the camera stores them')
+    parser.add_argument('--stride', type=int, nargs='+', default=[1],
+                        help='Process 1 frame per stride, several values '
+                             'are benchmarked')
+    parser.add_argument('--scale', type=int, default=4,
+                        help='Downsampling factor')
+    parser.add_argument('--blur', type=int, default=2,
+                        help='Blur radius, 0 for no blur')
+    parser.add_argument('--roi', type=int, nargs=4, default=None,
+                        metavar=('X0', 'Y0', 'X1', 'Y1'),
+                        help='Region of the frame to track in')
+    parser.add_argument('-o', '--output', default=None,
+                        help='Tracking log to write (default: next to the '
+                             'capture)')
+    args = parser.parse_args()
+
+    (width, height) = [int(value) for value in args.size.split('x')]
+    video = YuvVideo(args.path, width, height, args.padded)
+    configs = [dict(stride=stride, scale=args.scale, blur=args.blur,
+                    roi=args.roi) for stride in args.stride]
+    if len(configs) > 1:
+        for row in benchmark(video, configs):
+            print('stride %(stride)i, scale %(scale)i, blur %(blur)i: '
+                  '%(fps).1f fps' % row)
+        return
+
+    result = MotionTracker(**configs[0]).track(video)
+    output = args.output or args.path + '.tracking.log'
+    write_tracking_log(output, result.boxes())
+    print('Tracked %i frames at %.1f fps to %s' %
+          (result.frames, result.fps(), output))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+"""Reads per-frame timestamps and keyframe flags straight from the sample
+   tables of an MP4 file, without ffprobe or decoding.
+
+   Only the 'moov' box is parsed: 'mdhd' gives the timescale, 'stts' the
+   decode time deltas, 'ctts' the composition offsets, 'stss' the sync
+   (key) samples and 'elst' the presentation offset. The tables are read as
+   NumPy views over a memory map, so files with hundreds of thousands of
+   samples load in milliseconds.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import mmap
+import struct
+import numpy as np
+
+
+def iter_boxes(data, start, end):
+    """Yields (type, payload_start, box_end) for the boxes in data[start:end].
+
+       Args:
+           data: A bytes-like object such as an mmap.
+           start: Offset of the first box header.
+           end: Offset just past the last box.
+    """
+    offset = start
+    while offset + 8 <= end:
+        (size, box_type) = struct.unpack_from('>I4s', data, offset)
+        header = 8
+        if size == 1:
+            (size,) = struct.unpack_from('>Q', data, offset + 8)
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header or offset + size > end:
+            raise ValueError('Corrupt box %r at offset %i' %
+                             (box_type, offset))
+        yield (box_type, offset + header, offset + size)
+        offset += size
+
+
+def find_box(data, start, end, path):
+    """Returns (payload_start, box_end) of the first box along path, or None.
+
+       Args:
+           data: A bytes-like object such as an mmap.
+           start: Offset of the first box header to search.
+           end: Offset just past the last box to search.
+           path: Tuple of box types, e.g. (b'mdia', b'mdhd').
+    """
+    for (box_type, payload, box_end) in iter_boxes(data, start, end):
+        if box_type == path[0]:
+            if len(path) == 1:
+                return (payload, box_end)
+            return find_box(data, payload, box_end, path[1:])
+    return None
+
+
+def _table(data, box, columns, signed=False):
+    """Returns the entries of a full box table as an (n, columns) array."""
+    (payload, box_end) = box
+    (count,) = struct.unpack_from('>I', data, payload + 4)
+    dtype = '>i4' if signed else '>u4'
+    entries = np.frombuffer(data, dtype=dtype, count=count * columns,
+                            offset=payload + 8)
+    return entries.reshape(count, columns).astype(np.int64)
+
+
+class Mp4Track(object):
+    """The sample timing of one video track.
+
+       All arrays are in decode order, one entry per frame.
+
+       Attributes:
+           timescale: Media time units per second.
+           dts: Array of decode times in media units.
+           pts: Array of presentation times in media units.
+           keyframe: Boolean array, True for sync samples.
+    """
+    __slots__ = ('timescale', 'dts', 'pts', 'keyframe')
+
+    def __init__(self, timescale, dts, pts, keyframe):
+        self.timescale = timescale
+        self.dts = dts
+        self.pts = pts
+        self.keyframe = keyframe
+
+
+    def __len__(self):
+        return len(self.dts)
+
+
+    def pts_ms(self):
+        """Returns the presentation times in ms, in decode order."""
+        return self.pts * (1000.0 / self.timescale)
+
+
+    def presentation_order(self):
+        """Returns the frame indices sorted by presentation time."""
+        return np.argsort(self.pts, kind='stable')
+
+
+    def timestamps(self):
+        """Returns (pts_ms, keyframe) in presentation order."""
+        order = self.presentation_order()
+        return (self.pts_ms()[order], self.keyframe[order])
+
+
+def parse_track(data, trak):
+    """Returns the Mp4Track of a 'trak' box, or None if it is not video."""
+    (payload, box_end) = trak
+    handler = find_box(data, payload, box_end, (b'mdia', b'hdlr'))
+    if handler is None or bytes(data[handler[0] + 8:handler[0] + 12]) != \
+            b'vide':
+        return None
+
+    mdhd = find_box(data, payload, box_end, (b'mdia', b'mdhd'))
+    version = data[mdhd[0]]
+    # Version 1 has 64-bit creation and modification times
+    timescale_offset = mdhd[0] + (20 if version == 1 else 12)
+    (timescale,) = struct.unpack_from('>I', data, timescale_offset)
+
+    stbl = find_box(data, payload, box_end, (b'mdia', b'minf', b'stbl'))
+    if stbl is None:
+        raise ValueError('Video track has no sample table')
+    stts = find_box(data, stbl[0], stbl[1], (b'stts',))
+    stts = _table(data, stts, 2)
+    deltas = np.repeat(stts[:, 1], stts[:, 0])
+    dts = np.zeros(len(deltas), dtype=np.int64)
+    np.cumsum(deltas[:-1], out=dts[1:])
+
+    pts = dts.copy()
+    ctts = find_box(data, stbl[0], stbl[1], (b'ctts',))
+    if ctts is not None:
+        # Version 1 offsets are signed
+        offsets = _table(data, ctts, 2, signed=data[ctts[0]] == 1)
+        pts += np.repeat(offsets[:, 1], offsets[:, 0])[:len(pts)]
+
+    elst = find_box(data, payload, box_end, (b'edts', b'elst'))
+    if elst is not None:
+        pts -= _first_media_time(data, elst)
+
+    stss = find_box(data, stbl[0], stbl[1], (b'stss',))
+    if stss is None:
+        keyframe = np.ones(len(dts), dtype=bool)
+    else:
+        keyframe = np.zeros(len(dts), dtype=bool)
+        samples = _table(data, stss, 1)[:, 0] - 1
+        keyframe[samples[samples < len(dts)]] = True
+
+    return Mp4Track(timescale, dts, pts, keyframe)
+
+
+def _first_media_time(data, elst):
+    """Returns the media time of the first non-empty edit, or 0."""
+    (payload, _) = elst
+    version = data[payload]
+    (count,) = struct.unpack_from('>I', data, payload + 4)
+    offset = payload + 8
+    entry = '>Qq' if version == 1 else '>Ii'
+    for _ in range(count):
+        (_, media_time) = struct.unpack_from(entry, data, offset)
+        offset += struct.calcsize(entry) + 4
+        if media_time >= 0:
+            return media_time
+    return 0
+
+
+def read_track(path):
+    """Returns the Mp4Track of the first video track in an MP4 file."""
+    with open(path, 'rb') as mp4_file:
+        data = mmap.mmap(mp4_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            moov = find_box(data, 0, len(data), (b'moov',))
+            if moov is None:
+                raise ValueError('%s has no moov box' % path)
+            for (box_type, payload, box_end) in iter_boxes(data, *moov):
+                if box_type == b'trak':
+                    track = parse_track(data, (payload, box_end))
+                    if track is not None:
+                        if find_box(data, 0, len(data), (b'moof',)):
+                            raise ValueError('Fragmented MP4 files are not '
+                                             'supported')
+                        return track
+        finally:
+            data.close()
+    raise ValueError('%s has no video track' % path)
+
+
+def load_mp4_timestamps(path):
+    """Returns the frame timestamps of an MP4 in ms, in presentation order.
+
+       Has the same form as file_analysis.load_timestamps, so an .mp4 can be
+       used as the timestamp source of a FileAnalysis.
+    """
+    return read_track(path).timestamps()[0]
@@ -0,0 +1,190 @@
+"""Command line entry point for analyzing captures.
+
+   Usage examples:
+       python picam.py info logs/100sec_120fps_480p.h264.ts
+       python picam.py drops logs/*.ts
+       python picam.py percentiles logs/Video.h264.timestamp.log -p 50 99
+       python picam.py batch logs -o summary
+       python picam.py plot framerate logs/Video.h264.timestamp.log --save out.png
+       python picam.py track Video.yuv --size 640x480 --write out.mp4
+
+   Only numpy and the analysis modules are imported up front. Matplotlib
+   and OpenCV are imported by the subcommands that plot or read video, so
+   the text-only subcommands start quickly on a Pi.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import sys
+import argparse
+from file_analysis import FileAnalysis
+from capture_catalog import parse_run_name
+
+# Plots the plot subcommand can draw, the same as batch_render.PLOTS
+PLOT_NAMES = ('framerate', 'deviation', 'relative_deviation', 'timestamps',
+              'standards', 'dropped_frames')
+
+
+def target_framerate(path, fps=None):
+    """Returns fps, else the framerate in the file name, else None."""
+    if fps is not None:
+        return fps
+    return parse_run_name(path).fps
+
+
+def run_info(args):
+    """Prints the duration, framerate and jitter of each log."""
+    for path in args.paths:
+        print(path)
+        FileAnalysis(path, not args.no_cache).info()
+
+
+def run_drops(args):
+    """Prints the dropped and extra frames of each log."""
+    for path in args.paths:
+        analysis = FileAnalysis(path, not args.no_cache)
+        slots = analysis.frame_slots(target_framerate(path, args.fps))
+        print('%s: %i dropped, %i extra of %i frames at %g fps' %
+              (path, slots.dropped(), slots.extras(), slots.frames(),
+               slots.target_framerate))
+
+
+def run_percentiles(args):
+    """Prints percentiles of the frame intervals of each log."""
+    for path in args.paths:
+        histogram = FileAnalysis(path, not args.no_cache).interval_histogram()
+        percentiles = histogram.percentiles(args.percentiles)
+        print('%s: %s' % (path, ', '.join(
+            'p%g=%.3f ms' % (percent, percentiles[percent])
+            for percent in args.percentiles)))
+
+
+def run_batch(args):
+    """Summarizes a directory of logs to CSV, npz and histogram JSON."""
+    from batch_analysis import analyze_directory, write_summary
+    rows = analyze_directory(args.log_dir, args.workers, args.fps,
+                             not args.no_cache)
+    write_summary(rows, args.output)
+    print('Wrote %i rows to %s.csv, %s.npz and %s.hist.json' %
+          (len(rows), args.output, args.output, args.output))
+
+
+def run_plot(args):
+    """Draws an Evaluate plot, to a window or to an image file."""
+    if args.save is not None:
+        from batch_render import render
+        render(args.paths, args.save, args.plot,
+               target_framerate(args.paths[0], args.fps), not args.no_cache)
+        print('Wrote %s' % args.save)
+        return
+
+    from analysis_tools import Evaluate
+    evaluate = Evaluate(list(args.paths), not args.no_cache)
+    method = getattr(evaluate, 'plot_' + args.plot)
+    if args.plot == 'deviation':
+        method(target_framerate(args.paths[0], args.fps))
+    else:
+        method()
+
+
+def run_track(args):
+    """Overlays the tracking data on a capture's video."""
+    resolution = None
+    if args.size is not None:
+        resolution = [int(value) for value in args.size.split('x')]
+    analysis = FileAnalysis(args.path, not args.no_cache)
+    analysis.apply_tracking(args.write, not args.no_display,
+                            resolution=resolution)
+
+
+def run_h264(args):
+    """Counts the frames in raw .h264 files and checks the timestamps."""
+    from h264_scan import H264Scan
+    from file_analysis import split_log_path
+    for path in args.paths:
+        frames = H264Scan(path).frames()
+        timestamp_path = split_log_path(path)[1]
+        try:
+            logged = len(FileAnalysis(timestamp_path,
+                                      not args.no_cache).timestamps)
+            print('%s: %i frames, %i timestamps' % (path, frames, logged))
+        except (IOError, OSError):
+            print('%s: %i frames' % (path, frames))
+
+
+def parser():
+    """Returns the argument parser of every subcommand."""
+    main_parser = argparse.ArgumentParser(
+        description=__doc__.split('\n')[0])
+    main_parser.add_argument('--no-cache', action='store_true',
+                             help='Do not use the parsed log cache')
+    commands = main_parser.add_subparsers(dest='command')
+
+    info = commands.add_parser('info', help='Duration, framerate, jitter')
+    info.add_argument('paths', nargs='+', help='Timestamp logs')
+    info.set_defaults(run=run_info)
+
+    drops = commands.add_parser('drops', help='Dropped and extra frames')
+    drops.add_argument('paths', nargs='+', help='Timestamp logs')
+    drops.add_argument('-f', '--fps', type=float, default=None,
+                       help='Target framerate (default: from the name)')
+    drops.set_defaults(run=run_drops)
+
+    percentiles = commands.add_parser('percentiles',
+                                      help='Frame interval percentiles')
+    percentiles.add_argument('paths', nargs='+', help='Timestamp logs')
+    percentiles.add_argument('-p', '--percentiles', type=float, nargs='+',
+                             default=[50, 90, 99, 99.9, 100],
+                             help='Percentiles to print')
+    percentiles.set_defaults(run=run_percentiles)
+
+    batch = commands.add_parser('batch', help='Summarize a directory')
+    batch.add_argument('log_dir', help='Directory of timestamp logs')
+    batch.add_argument('-o', '--output', default='summary',
+                       help='Output path without extension')
+    batch.add_argument('-j', '--workers', type=int, default=None,
+                       help='Worker processes (default: one per CPU)')
+    batch.add_argument('-f', '--fps', type=float, default=None,
+                       help='Target framerate for dropped/extra frames')
+    batch.set_defaults(run=run_batch)
+
+    plot = commands.add_parser('plot', help='Plot one or more logs')
+    plot.add_argument('plot', choices=PLOT_NAMES, help='Plot to draw')
+    plot.add_argument('paths', nargs='+', help='Timestamp logs')
+    plot.add_argument('-f', '--fps', type=float, default=None,
+                      help='Target framerate for the deviation plot')
+    plot.add_argument('-s', '--save', default=None,
+                      help='Write the plot to this image instead of '
+                           'showing it')
+    plot.set_defaults(run=run_plot)
+
+    track = commands.add_parser('track', help='Overlay tracking on video')
+    track.add_argument('path', help='Video path or timestamp log')
+    track.add_argument('-w', '--write', default=None,
+                       help='Video file to write')
+    track.add_argument('--no-display', action='store_true',
+                       help='Do not show the video')
+    track.add_argument('--size', default=None,
+                       help='WIDTHxHEIGHT to read a raw .yuv directly')
+    track.set_defaults(run=run_track)
+
+    h264 = commands.add_parser('h264', help='Count frames in raw .h264')
+    h264.add_argument('paths', nargs='+', help='Raw .h264 files')
+    h264.set_defaults(run=run_h264)
+    return main_parser
+
+
+def main(argv=None):
+    """Runs the subcommand given on the command line."""
+    args = parser().parse_args(argv)
+    if getattr(args, 'run', None) is None:
+        parser().print_help()
+        return 2
+    args.run(args)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
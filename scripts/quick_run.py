@@ -1,3 +1,8 @@
-import analysis_tools as tools
-obj = tools.Evaluate("/home/ethan/Pictures/Picamera Data/Video.yuv")
-obj.apply_tracking()
+"""Runs the picam command line, e.g. 'python quick_run.py track Video.yuv'.
+
+   Kept for old habits; see picam.py for the subcommands.
+"""
+import sys
+from picam import main
+
+sys.exit(main())
@@ -0,0 +1,522 @@
+"""Replays a recorded (or synthetic) capture into new log files at the
+   timing it was recorded with, so live analysis can be exercised on a
+   plain Linux box without a Pi and camera.
+
+   Every frame's .timestamp.log line, .tracking.log line and, optionally,
+   raw .yuv frame are appended when the frame's time comes, sped up or
+   slowed down by a factor. Drops and stalls can be injected on top,
+   either at given rates or at the rates measured from another log such
+   as one of the inet_notnice runs.
+
+   A consumer can be run against the replay to measure how long frames
+   take from being written to being processed, and how fast a capture it
+   keeps up with.
+
+   Usage examples:
+       python replay_capture.py ../logs/100sec_60fps_inet.yuv.ts /tmp/r/Video.yuv
+       python replay_capture.py --synthetic 6000 /tmp/r/Video.yuv --speed 4 \\
+           --faults-like ../logs/100sec_60fps_inet_notnice.yuv.ts
+       python replay_capture.py ../logs/100sec_60fps_inet.yuv.ts --measure
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import io
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import numpy as np
+from live_tail import LogTail, LiveAnalysis
+from interval_histogram import histogram_of
+from capture_catalog import parse_run_name
+from file_analysis import split_log_path, load_timestamps
+from gap_index import STALL, GapIndex
+
+# The clock replay times are measured with
+clock = time.perf_counter
+
+
+class FaultModel(object):
+    """Rates of dropped frames and capture stalls to inject.
+
+       Args:
+           drop_rate: Chance that a frame is dropped.
+           stall_rate: Chance that the capture stalls before a frame.
+           stall_ms: Mean length of a stall, exponentially distributed.
+
+       Attributes:
+           drop_rate: Chance that a frame is dropped.
+           stall_rate: Chance that the capture stalls before a frame.
+           stall_ms: Mean length of a stall in ms.
+    """
+    __slots__ = ('drop_rate', 'stall_rate', 'stall_ms')
+
+    def __init__(self, drop_rate=0.0, stall_rate=0.0, stall_ms=500.0):
+        self.drop_rate = drop_rate
+        self.stall_rate = stall_rate
+        self.stall_ms = stall_ms
+
+
+    @classmethod
+    def from_timestamps(cls, timestamps, target_framerate=None):
+        """Returns the model that matches the faults of a recorded log.
+
+           The gaps are the ones gap_index finds from the shared frame slot
+           classification, so the frames dropped agree with
+           FileAnalysis.dropped_frames. A gap of more than STALL_GAPS frame
+           gaps is a stall, the others are dropped frames.
+
+           Args:
+               timestamps: Array of the log's timestamps in ms.
+               target_framerate: The framerate the log was captured at,
+               defaults to the measured framerate.
+        """
+        intervals = len(timestamps) - 1
+        gaps = GapIndex.from_timestamps(timestamps, target_framerate)
+        if intervals < 1 or len(gaps) == 0:
+            return cls()
+        stalls = gaps.kinds() == STALL
+        dropped = int(gaps.missing[~stalls].sum())
+        stall_ms = float((gaps.duration_ms[stalls] - gaps.gap_ms).mean()) \
+            if stalls.any() else 0.0
+        return cls(dropped / float(intervals + dropped),
+                   np.count_nonzero(stalls) / float(intervals), stall_ms)
+
+
+    def __repr__(self):
+        return 'FaultModel(drop_rate=%g, stall_rate=%g, stall_ms=%g)' % \
+            (self.drop_rate, self.stall_rate, self.stall_ms)
+
+
+def inject_faults(timestamps, model, seed=0):
+    """Drops frames and inserts stalls into a capture's timing.
+
+       The first frame is always kept. A dropped frame is left out of
+       every output, and a stall delays the frame and everything after it.
+
+       Args:
+           timestamps: Array of timestamps in ms.
+           model: The FaultModel to apply.
+           seed: Random seed, the same seed gives the same faults.
+
+       Returns:
+           A tuple of the indices of the frames kept and their new
+           timestamps.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    rng = np.random.RandomState(seed)
+    keep = rng.random_sample(len(timestamps)) >= model.drop_rate
+    keep[:1] = True
+    stalls = rng.random_sample(len(timestamps)) < model.stall_rate
+    stalls[:1] = False
+    delays = np.zeros(len(timestamps))
+    delays[stalls] = rng.exponential(model.stall_ms,
+                                     int(np.count_nonzero(stalls)))
+    index = np.flatnonzero(keep)
+    return (index, (timestamps + np.cumsum(delays))[index])
+
+
+def read_tracking_lines(tracking_path):
+    """Returns the lines of a tracking log that belong to frames."""
+    with io.open(tracking_path, 'r') as tracking_file:
+        lines = tracking_file.read().splitlines()
+    # The first line of a tracking log does not belong to a frame
+    return lines[1:]
+
+
+class ReplayResult(object):
+    """When each frame of a replay was written.
+
+       Attributes:
+           scheduled: Array of clock() times each frame was due.
+           written: Array of clock() times each frame was flushed, NaN for
+           frames not written because the replay was stopped.
+    """
+    __slots__ = ('scheduled', 'written')
+
+    def __init__(self, frames):
+        self.scheduled = np.full(frames, np.nan)
+        self.written = np.full(frames, np.nan)
+
+
+    def frames(self):
+        """Returns the number of frames written."""
+        return int(np.count_nonzero(~np.isnan(self.written)))
+
+
+    def lateness_ms(self):
+        """Returns how far behind schedule each written frame was in ms."""
+        done = ~np.isnan(self.written)
+        return (self.written[done] - self.scheduled[done]) * 1000.0
+
+
+    def framerate(self):
+        """Returns the frames/sec the replay was written at."""
+        written = self.written[~np.isnan(self.written)]
+        if len(written) < 2 or written[-1] <= written[0]:
+            return 0.0
+        return (len(written) - 1) / (written[-1] - written[0])
+
+
+def replay(path_name, timestamps, tracking_lines=None, frames=None,
+           speed=1.0, write_times=False, stop_event=None, result=None):
+    """Writes a capture's logs, and frames, in real time.
+
+       Frames that are due together are written and flushed together, so
+       a replay that is sped up past what one write per frame allows
+       still keeps its average rate.
+
+       Args:
+           path_name: The video path the logs are named after, e.g.
+           'Video.yuv' gives 'Video.yuv.timestamp.log' and
+           'Video.yuv.tracking.log'. Existing files are replaced and
+           missing directories are made.
+           timestamps: Array of the timestamps to write in ms.
+           tracking_lines: Optional list of tracking log lines, one per
+           timestamp.
+           frames: Optional sequence of raw frames (anything with a buffer,
+           e.g. the rows of YuvVideo.data), one per timestamp, appended to
+           path_name.
+           speed: How many times faster than recorded to replay.
+           write_times: Whether to also write path_name + '.replay.log'
+           with the time.time() each frame was written, for consumers in
+           other processes to measure their latency against.
+           stop_event: Optional threading.Event that ends the replay early.
+           result: Optional ReplayResult to fill in, so another thread can
+           follow the replay as it runs.
+
+       Returns:
+           The ReplayResult.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    if result is None:
+        result = ReplayResult(len(timestamps))
+    if len(timestamps) == 0:
+        return result
+    lines = [u'%f\n' % value for value in timestamps.tolist()]
+
+    os.makedirs(os.path.dirname(path_name) or '.', exist_ok=True)
+    outputs = [io.open(path_name + '.timestamp.log', 'w')]
+    tracking_file = None
+    if tracking_lines is not None:
+        tracking_file = io.open(path_name + '.tracking.log', 'w')
+        tracking_file.write(u'0,0,0,0\n')
+        tracking_file.flush()
+        outputs.append(tracking_file)
+    frame_file = None
+    if frames is not None:
+        frame_file = io.open(path_name, 'wb')
+        outputs.append(frame_file)
+    times_file = None
+    if write_times:
+        times_file = io.open(path_name + '.replay.log', 'w')
+        outputs.append(times_file)
+
+    start = clock()
+    result.scheduled[:] = start + (timestamps - timestamps[0]) / 1000.0 / \
+        speed
+    try:
+        i = 0
+        while i < len(timestamps):
+            if stop_event is not None and stop_event.is_set():
+                break
+            wait = result.scheduled[i] - clock()
+            if wait > 0:
+                time.sleep(wait)
+            # Every frame that is due by now goes out in this write
+            end = int(np.searchsorted(result.scheduled, clock(),
+                                      side='right'))
+            end = max(end, i + 1)
+
+            if frame_file is not None:
+                for j in range(i, min(end, len(frames))):
+                    frame_file.write(frames[j])
+                frame_file.flush()
+            if tracking_file is not None:
+                tracking_file.write(u''.join(
+                    line + u'\n' for line in tracking_lines[i:end]))
+                tracking_file.flush()
+            outputs[0].write(u''.join(lines[i:end]))
+            outputs[0].flush()
+
+            result.written[i:end] = clock()
+            if times_file is not None:
+                times_file.write((u'%f\n' % time.time()) * (end - i))
+                times_file.flush()
+            i = end
+    finally:
+        for output in outputs:
+            output.close()
+    return result
+
+
+class ConsumerReport(object):
+    """How a consumer kept up with a replay.
+
+       Attributes:
+           speed: The replay speed.
+           frames: Number of frames the consumer processed.
+           latency_ms: Array of the time from each frame being written to
+           the consumer finishing with it, in ms.
+           replay_fps: Frames/sec the replay was written at.
+           consumer_fps: Frames/sec the consumer processed frames at.
+    """
+    __slots__ = ('speed', 'frames', 'latency_ms', 'replay_fps',
+                 'consumer_fps')
+
+    def __init__(self, speed, latency_ms, replay_fps, consumer_fps):
+        self.speed = speed
+        self.frames = len(latency_ms)
+        self.latency_ms = latency_ms
+        self.replay_fps = replay_fps
+        self.consumer_fps = consumer_fps
+
+
+    def histogram(self):
+        """Returns the IntervalHistogram of the latencies."""
+        return histogram_of(self.latency_ms)
+
+
+    def kept_up(self, max_latency_ms=100.0, percent=99):
+        """Returns whether the consumer's latency stayed bounded."""
+        if self.frames == 0:
+            return False
+        return self.histogram().percentile(percent) <= max_latency_ms
+
+
+    def summary(self):
+        """Returns a JSON friendly dict of the report."""
+        percentiles = self.histogram().percentiles((50, 99, 100))
+        return {'speed': self.speed,
+                'frames': self.frames,
+                'replay_fps': float(self.replay_fps),
+                'consumer_fps': float(self.consumer_fps),
+                'p50_ms': percentiles[50],
+                'p99_ms': percentiles[99],
+                'max_ms': percentiles[100]}
+
+
+def measure_consumer(consume, timestamps, speed=1.0, poll=0.001,
+                     work_dir=None):
+    """Replays timestamps while consume follows the log, and times it.
+
+       The replay runs on its own thread and the consumer on this one,
+       reading the log with live_tail.LogTail the way a live analysis
+       would.
+
+       Args:
+           consume: Called with each chunk of new timestamps (a float64
+           array), e.g. LiveAnalysis().add.
+           timestamps: Array of the timestamps to replay in ms.
+           speed: How many times faster than recorded to replay.
+           poll: Seconds to sleep when no new lines have been written.
+           work_dir: Directory for the replayed log, defaults to a new
+           temporary directory that is removed afterwards.
+
+       Returns:
+           A ConsumerReport.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    own_dir = work_dir is None
+    if own_dir:
+        work_dir = tempfile.mkdtemp(prefix='picam_replay_')
+    path_name = os.path.join(work_dir, 'replay.yuv')
+    # The consumer must not see a previous replay's log
+    if os.path.exists(path_name + '.timestamp.log'):
+        os.remove(path_name + '.timestamp.log')
+
+    result = ReplayResult(len(timestamps))
+    stop_event = threading.Event()
+    writer = threading.Thread(target=replay, args=(path_name, timestamps),
+                              kwargs={'speed': speed, 'result': result,
+                                      'stop_event': stop_event})
+    done = np.full(len(timestamps), np.nan)
+    tail = LogTail(path_name + '.timestamp.log')
+    seen = 0
+    writer.start()
+    try:
+        while seen < len(timestamps):
+            chunk = tail.read_floats()
+            if len(chunk) == 0:
+                if not writer.is_alive() and \
+                        tail.offset == os.path.getsize(tail.path):
+                    break
+                time.sleep(poll)
+                continue
+            consume(chunk)
+            done[seen:seen + len(chunk)] = clock()
+            seen += len(chunk)
+    finally:
+        stop_event.set()
+        writer.join()
+        if own_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    latency_ms = (done[:seen] - result.written[:seen]) * 1000.0
+    consumer_fps = 0.0
+    if seen > 1 and done[seen - 1] > result.written[0]:
+        consumer_fps = (seen - 1) / (done[seen - 1] - result.written[0])
+    return ConsumerReport(speed, latency_ms, result.framerate(), consumer_fps)
+
+
+def max_sustainable_speed(consume_factory, timestamps,
+                          speeds=(1, 2, 4, 8, 16, 32, 64),
+                          max_latency_ms=100.0, callback=None):
+    """Finds the fastest replay a consumer keeps up with.
+
+       Args:
+           consume_factory: Called with no arguments before each replay to
+           get a fresh consume callable (see measure_consumer).
+           timestamps: Array of the timestamps to replay in ms.
+           speeds: Replay speeds to try, in increasing order. Trying stops
+           at the first speed the consumer falls behind at.
+           max_latency_ms: The p99 latency above which the consumer counts
+           as falling behind.
+           callback: Called with each ConsumerReport as it finishes.
+
+       Returns:
+           The ConsumerReport of the fastest speed kept up with, or None.
+    """
+    best = None
+    for speed in speeds:
+        report = measure_consumer(consume_factory(), timestamps, speed)
+        if callback is not None:
+            callback(report)
+        if not report.kept_up(max_latency_ms):
+            break
+        best = report
+    return best
+
+
+def load_source(path, synthetic=None, fps=30.0, seed=0):
+    """Returns the timestamps and tracking lines to replay.
+
+       Args:
+           path: A video path or timestamp log to replay, ignored when
+           synthetic is given.
+           synthetic: Number of frames of a synthetic capture to generate
+           instead (see benchmark.synthetic_timestamps).
+           fps: The framerate of a synthetic capture.
+           seed: Random seed of a synthetic capture.
+
+       Returns:
+           A tuple of the timestamps in ms and a list of tracking lines, or
+           None if there is no tracking log.
+    """
+    if synthetic is not None:
+        from benchmark import synthetic_timestamps, synthetic_tracking
+        timestamps = synthetic_timestamps(synthetic, fps, seed=seed)
+        lines = [u'%i,%i,%i,%i,%i' % tuple(row) for row in
+                 synthetic_tracking(synthetic, seed=seed).tolist()]
+        return (timestamps, lines)
+
+    (video_path, timestamp_path) = split_log_path(path)
+    timestamps = load_timestamps(timestamp_path)
+    lines = None
+    if os.path.exists(video_path + '.tracking.log'):
+        lines = read_tracking_lines(
+            video_path + '.tracking.log')[:len(timestamps)]
+    return (timestamps, lines)
+
+
+def main():
+    """Replays a capture, or measures a live analysis against it."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('source', nargs='?', default=None,
+                        help='Video path or timestamp log to replay')
+    parser.add_argument('output', nargs='?', default=None,
+                        help='Video path the replayed logs are named after')
+    parser.add_argument('--synthetic', type=int, default=None,
+                        help='Replay this many synthetic frames instead')
+    parser.add_argument('-f', '--fps', type=float, default=None,
+                        help='Framerate (default: from the source name, '
+                             'or 30 for synthetic captures)')
+    parser.add_argument('-s', '--speed', type=float, default=1.0,
+                        help='Times faster than recorded to replay')
+    parser.add_argument('--yuv-size', default=None,
+                        help='WIDTHxHEIGHT to also replay the raw .yuv '
+                             'frames of the source')
+    parser.add_argument('--drop-rate', type=float, default=0.0,
+                        help='Chance of dropping a frame')
+    parser.add_argument('--stall-rate', type=float, default=0.0,
+                        help='Chance of a stall before a frame')
+    parser.add_argument('--stall-ms', type=float, default=500.0,
+                        help='Mean stall length in ms')
+    parser.add_argument('--faults-like', default=None,
+                        help='Inject the drops and stalls measured from '
+                             'this log instead')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--write-times', action='store_true',
+                        help='Also write OUTPUT.replay.log of wall clock '
+                             'write times')
+    parser.add_argument('--measure', action='store_true',
+                        help='Find the fastest replay live_tail keeps up '
+                             'with instead of writing OUTPUT')
+    parser.add_argument('--max-latency', type=float, default=100.0,
+                        help='p99 latency in ms a consumer must stay under')
+    args = parser.parse_args()
+    if args.synthetic is not None and args.output is None:
+        # With a synthetic capture the only path given is the output
+        (args.source, args.output) = (None, args.source)
+    if args.synthetic is None and args.source is None:
+        parser.error('a source or --synthetic is required')
+    if not args.measure and args.output is None:
+        parser.error('an output is required unless --measure is given')
+
+    fps = args.fps
+    if fps is None:
+        fps = 30.0 if args.synthetic is not None else \
+            parse_run_name(args.source).fps
+    (timestamps, tracking_lines) = load_source(args.source, args.synthetic,
+                                               fps or 30.0, args.seed)
+
+    model = FaultModel(args.drop_rate, args.stall_rate, args.stall_ms)
+    if args.faults_like is not None:
+        model = FaultModel.from_timestamps(
+            load_timestamps(split_log_path(args.faults_like)[1]),
+            parse_run_name(args.faults_like).fps)
+        print(model)
+    (index, timestamps) = inject_faults(timestamps, model, args.seed)
+    if tracking_lines is not None:
+        tracking_lines = [tracking_lines[i] for i in index
+                          if i < len(tracking_lines)]
+
+    if args.measure:
+        def report(consumer_report):
+            print('speed %6gx: %s' % (consumer_report.speed, ', '.join(
+                '%s %.3f' % item for item in
+                sorted(consumer_report.summary().items())
+                if item[0] != 'speed')))
+        best = max_sustainable_speed(lambda: LiveAnalysis(fps).add,
+                                     timestamps,
+                                     max_latency_ms=args.max_latency,
+                                     callback=report)
+        if best is None:
+            print('live_tail did not keep up at any speed')
+        else:
+            print('live_tail keeps up at %gx (%.0f fps)' %
+                  (best.speed, best.replay_fps))
+        return
+
+    frames = None
+    if args.yuv_size is not None and args.source is not None:
+        from yuv_reader import YuvVideo
+        (width, height) = [int(value) for value in args.yuv_size.split('x')]
+        video = YuvVideo(split_log_path(args.source)[0], width, height)
+        frames = [video.data[i] for i in index if i < len(video)]
+
+    result = replay(args.output, timestamps, tracking_lines, frames,
+                    args.speed, args.write_times)
+    lateness = result.lateness_ms()
+    print('Replayed %i frames at %.2f fps, p99 lateness %.3f ms' %
+          (result.frames(), result.framerate(),
+           np.percentile(lateness, 99) if len(lateness) else 0.0))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Single pass mean and variance that can be fed one value or one chunk at
+   a time, so statistics never need the whole capture in memory.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import math
+import numpy as np
+
+
+class RunningStats(object):
+    """Welford's online mean and variance.
+
+       Chunks are folded in with the parallel form of the update (Chan et
+       al.), so adding an array costs one vectorized pass over it and two
+       RunningStats can be merged.
+
+       Attributes:
+           count: Number of values seen.
+           mean: Mean of the values seen.
+           m2: Sum of squared differences from the mean.
+           minimum: Smallest value seen.
+           maximum: Largest value seen.
+    """
+    __slots__ = ('count', 'mean', 'm2', 'minimum', 'maximum')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+
+    def add(self, value):
+        """Adds a single value."""
+        value = float(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+
+    def add_array(self, values):
+        """Adds every value of an array."""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        chunk = RunningStats()
+        chunk.count = len(values)
+        chunk.mean = float(values.mean())
+        chunk.m2 = float(np.square(values - chunk.mean).sum())
+        chunk.minimum = float(values.min())
+        chunk.maximum = float(values.max())
+        self.merge(chunk)
+
+
+    def merge(self, other):
+        """Folds the values summarized by another RunningStats into this."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count = other.count
+            self.mean = other.mean
+            self.m2 = other.m2
+            self.minimum = other.minimum
+            self.maximum = other.maximum
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta**2 * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+
+    def variance(self):
+        """Returns the population variance, 0 with fewer than two values."""
+        if self.count < 2:
+            return 0.0
+        return self.m2 / self.count
+
+
+    def standard_deviation(self):
+        """Returns the population standard deviation."""
+        return math.sqrt(self.variance())
@@ -0,0 +1,162 @@
+"""Tracks a long raw capture in parallel by splitting it into segments of
+   frames, each tracked in its own worker process.
+
+   Every segment starts with a warmup of the frames before it, which only
+   feed the background model, so its first boxes are not made against an
+   empty background. Segments have a fixed length that does not depend on
+   the number of workers and are merged in frame order, which makes the
+   tracking log the same however many workers are used.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import os
+import time
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from yuv_reader import YuvVideo
+from motion_tracker import MotionTracker, TrackingResult, write_tracking_log
+
+# Frames per segment, about a minute at 30fps
+SEGMENT_FRAMES = 1800
+
+# Frames before a segment used to warm up its background model
+WARMUP_FRAMES = 150
+
+
+def segments(frames, segment_frames=SEGMENT_FRAMES):
+    """Returns the (start, stop) frame ranges a video is split into."""
+    return [(start, min(start + segment_frames, frames))
+            for start in range(0, frames, segment_frames)]
+
+
+def track_segment(path, resolution, padded, tracker_args, start, stop,
+                  warmup=WARMUP_FRAMES):
+    """Tracks frames start to stop of a raw .yuv capture.
+
+       Args:
+           path: The .yuv capture.
+           resolution: (width, height) of the capture.
+           padded: Whether the frames are stored padded by the camera.
+           tracker_args: Dict of MotionTracker arguments.
+           start: First frame of the segment.
+           stop: Frame after the last frame of the segment.
+           warmup: Frames before start used to build the background.
+
+       Returns:
+           The TrackingResult of the segment.
+    """
+    video = YuvVideo(path, resolution[0], resolution[1], padded)
+    tracker = MotionTracker(**tracker_args)
+    first = max(0, start - warmup)
+    tracker.track(video.frames(first, start), first)
+    return tracker.track(video.frames(start, stop), start)
+
+
+def _track_segment_star(args):
+    """Unpacks the arguments for track_segment inside a worker."""
+    return track_segment(*args)
+
+
+def merge_results(results, frames):
+    """Joins the TrackingResults of consecutive segments.
+
+       Args:
+           results: Segment results in frame order.
+           frames: Number of frames the merged result covers, e.g. the
+           number of timestamps.
+
+       Returns:
+           A TrackingResult for the whole video. Its elapsed time is the
+           sum over the segments.
+    """
+    processed = [result.processed for result in results]
+    boxes = [result.processed_boxes for result in results]
+    return TrackingResult(
+        frames,
+        np.concatenate(processed) if processed else np.empty(0, np.int64),
+        np.concatenate(boxes) if boxes else np.empty((0, 4), np.int64),
+        sum(result.elapsed for result in results))
+
+
+def track_parallel(path, resolution, padded=False, frames=None, workers=None,
+                   segment_frames=SEGMENT_FRAMES, warmup=WARMUP_FRAMES,
+                   **tracker_args):
+    """Tracks a raw .yuv capture with one worker process per segment.
+
+       Args:
+           path: The .yuv capture.
+           resolution: (width, height) of the capture.
+           padded: Whether the frames are stored padded by the camera.
+           frames: Number of frames to produce boxes for, defaults to the
+           frames in the video. Passing the number of timestamps aligns
+           the result with the .timestamp.log.
+           workers: Number of worker processes, None for one per CPU and 1
+           to run in this process.
+           segment_frames: Frames per segment.
+           warmup: Frames before each segment used to build its background.
+           tracker_args: Passed on to MotionTracker, e.g. stride or blur.
+
+       Returns:
+           A tuple (result, seconds) of the merged TrackingResult and the
+           wall-clock seconds taken.
+    """
+    began = time.monotonic()
+    length = len(YuvVideo(path, resolution[0], resolution[1], padded))
+    if frames is None:
+        frames = length
+    jobs = [(path, resolution, padded, tracker_args, start, stop, warmup)
+            for (start, stop) in segments(min(frames, length),
+                                          segment_frames)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or len(jobs) <= 1:
+        results = [_track_segment_star(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_track_segment_star, jobs))
+    return (merge_results(results, frames), time.monotonic() - began)
+
+
+def main():
+    """Tracks a raw .yuv capture over several processes."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('path', help='Raw .yuv capture')
+    parser.add_argument('-s', '--size', default='640x480',
+                        help='Frame size as WIDTHxHEIGHT')
+    parser.add_argument('--padded', action='store_true',
+                        help='Frames are padded as the camera stores them')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='Worker processes (default: one per CPU)')
+    parser.add_argument('--stride', type=int, default=1,
+                        help='Process 1 frame per stride')
+    parser.add_argument('--segment', type=int, default=SEGMENT_FRAMES,
+                        help='Frames per segment')
+    parser.add_argument('-o', '--output', default=None,
+                        help='Tracking log to write (default: next to the '
+                             'capture)')
+    args = parser.parse_args()
+
+    # Align the log with the timestamps when they are there
+    frames = None
+    timestamp_path = args.path + '.timestamp.log'
+    if os.path.exists(timestamp_path):
+        from file_analysis import load_timestamps
+        frames = len(load_timestamps(timestamp_path))
+
+    resolution = [int(value) for value in args.size.split('x')]
+    (result, seconds) = track_parallel(args.path, resolution, args.padded,
+                                       frames, args.workers, args.segment,
+                                       stride=args.stride)
+    output = args.output or args.path + '.tracking.log'
+    write_tracking_log(output, result.boxes())
+    print('Tracked %i frames at %.1f fps to %s' %
+          (result.frames, result.frames / seconds, output))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""Finds sleep episodes in tracking data without decoding any video.
+
+   A subject is asleep once its tracking box has stayed exactly the same for
+   longer than a threshold. Runs of identical boxes are found in one
+   vectorized pass and timed with the capture timestamps.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import io
+import numpy as np
+
+# How long the box has to stay still before the subject counts as sleeping
+DEFAULT_THRESHOLD_MS = 20000
+
+
+def box_runs(boxes):
+    """Returns the run-length encoding of identical consecutive boxes.
+
+       Args:
+           boxes: Array with x0, y0, x1, y1 in its first four columns.
+
+       Returns:
+           A tuple (change, run_id, starts): a boolean array that is True on
+           the first frame of every run, the run index of every frame and
+           the first frame of every run.
+    """
+    boxes = np.asarray(boxes)[:, :4]
+    change = np.ones(len(boxes), dtype=bool)
+    change[1:] = np.any(boxes[1:] != boxes[:-1], axis=1)
+    run_id = np.cumsum(change) - 1
+    return (change, run_id, np.flatnonzero(change))
+
+
+def still_time(boxes, timestamps):
+    """Returns how long the box had been still at every frame, in ms.
+
+       Args:
+           boxes: Array of tracking boxes, one row per frame.
+           timestamps: Array of frame timestamps in ms, aligned with boxes.
+    """
+    n = min(len(boxes), len(timestamps))
+    timestamps = np.asarray(timestamps[:n], dtype=np.float64)
+    (_, run_id, starts) = box_runs(boxes[:n])
+    return timestamps - timestamps[starts][run_id]
+
+
+class SleepEpisodes(object):
+    """The sleep episodes of one capture.
+
+       Frame indices are inclusive at both ends.
+
+       Attributes:
+           threshold_ms: How long the box had to stay still.
+           sleeping: Boolean array, True for every frame spent asleep.
+           start_frame: Array of the first sleeping frame of each episode.
+           end_frame: Array of the last sleeping frame of each episode.
+           still_since_ms: Array of when the box stopped moving.
+           start_ms: Array of when each episode started (the threshold was
+           reached).
+           end_ms: Array of when each episode ended (the box moved again or
+           the capture ended).
+    """
+    __slots__ = ('threshold_ms', 'sleeping', 'start_frame', 'end_frame',
+                 'still_since_ms', 'start_ms', 'end_ms')
+
+    def __init__(self, boxes, timestamps, threshold_ms=DEFAULT_THRESHOLD_MS):
+        self.threshold_ms = threshold_ms
+        n = min(len(boxes), len(timestamps))
+        timestamps = np.asarray(timestamps[:n], dtype=np.float64)
+        (change, run_id, starts) = box_runs(np.asarray(boxes)[:n])
+        waited = timestamps - timestamps[starts][run_id]
+        self.sleeping = waited >= threshold_ms
+
+        # An episode is a stretch of sleeping frames within one box run
+        previous = np.zeros(n, dtype=bool)
+        previous[1:] = self.sleeping[:-1]
+        following = np.zeros(n, dtype=bool)
+        following[:-1] = self.sleeping[1:] & ~change[1:]
+        self.start_frame = np.flatnonzero(self.sleeping & (~previous | change))
+        self.end_frame = np.flatnonzero(self.sleeping & ~following)
+
+        self.still_since_ms = timestamps[starts][run_id[self.start_frame]]
+        self.start_ms = timestamps[self.start_frame]
+        self.end_ms = timestamps[self.end_frame]
+
+
+    def __len__(self):
+        return len(self.start_frame)
+
+
+    def durations(self):
+        """Returns an array of how long each episode lasted in ms."""
+        return self.end_ms - self.start_ms
+
+
+    def total_ms(self):
+        """Returns the total time spent asleep in ms."""
+        return float(self.durations().sum())
+
+
+    def intervals(self):
+        """Returns a list of (start_ms, end_ms) tuples."""
+        return list(zip(self.start_ms.tolist(), self.end_ms.tolist()))
+
+
+    def write_log(self, path):
+        """Writes a 0/1 sleeping flag per frame, like apply_tracking did."""
+        with io.open(path, 'w') as sleep_file:
+            sleep_file.write(u''.join(u'1\n' if flag else u'0\n'
+                                      for flag in self.sleeping.tolist()))
+
+
+def detect_sleep(boxes, timestamps, threshold_ms=DEFAULT_THRESHOLD_MS):
+    """Returns the SleepEpisodes of tracking boxes.
+
+       Args:
+           boxes: Array of tracking boxes, one row per frame.
+           timestamps: Array of frame timestamps in ms, aligned with boxes.
+           threshold_ms: How long the box has to stay still to count as
+           sleeping.
+    """
+    return SleepEpisodes(boxes, timestamps, threshold_ms)
@@ -0,0 +1,155 @@
+"""Records how long each stage of the tracking pipeline takes per frame,
+   how full its queues are and how fast frames come out.
+
+   Profiling is opt-in: a pipeline without a profiler only pays for an
+   'is None' check per stage. Stage times are appended to plain lists and
+   only folded into IntervalHistograms when a summary is asked for, so
+   recording a sample costs about as much as a list append.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import io
+import json
+import time
+import numpy as np
+from interval_histogram import histogram_of
+
+# The clock every sample is taken with
+clock = time.perf_counter
+
+
+class StageProfiler(object):
+    """Per-stage latencies, queue occupancy and frame throughput.
+
+       Each stage should be recorded from a single thread; different
+       stages may be recorded from different threads.
+
+       Attributes:
+           samples: Dict of stage name to a list of latencies in seconds.
+           queues: Dict of queue name to a list of sampled sizes.
+           frame_times: List of clock() values at which frames finished.
+           started: clock() value when profiling started, or None.
+           stopped: clock() value when profiling stopped, or None.
+    """
+    __slots__ = ('samples', 'queues', 'frame_times', 'started', 'stopped')
+
+    def __init__(self):
+        self.samples = {}
+        self.queues = {}
+        self.frame_times = []
+        self.started = None
+        self.stopped = None
+
+
+    def start(self):
+        """Marks the start of the profiled run."""
+        self.started = clock()
+
+
+    def stop(self):
+        """Marks the end of the profiled run."""
+        self.stopped = clock()
+
+
+    def record(self, stage, seconds):
+        """Records one latency of stage."""
+        samples = self.samples.get(stage)
+        if samples is None:
+            samples = self.samples.setdefault(stage, [])
+        samples.append(seconds)
+
+
+    def sample_queue(self, name, size):
+        """Records the number of items in a queue."""
+        sizes = self.queues.get(name)
+        if sizes is None:
+            sizes = self.queues.setdefault(name, [])
+        sizes.append(size)
+
+
+    def frame_done(self):
+        """Records that a frame came out of the pipeline."""
+        self.frame_times.append(clock())
+
+
+    def elapsed(self):
+        """Returns the seconds between start and stop (or now)."""
+        if self.started is None:
+            return 0.0
+        end = self.stopped if self.stopped is not None else clock()
+        return end - self.started
+
+
+    def histogram(self, stage):
+        """Returns the IntervalHistogram of the latencies of stage in ms."""
+        return histogram_of(np.array(self.samples.get(stage, ())) * 1000.0)
+
+
+    def frame_timestamps(self):
+        """Returns when each frame finished, in ms since the start."""
+        times = np.array(self.frame_times, dtype=np.float64)
+        start = self.started if self.started is not None else \
+            (times[0] if len(times) else 0.0)
+        return (times - start) * 1000.0
+
+
+    def summary(self):
+        """Returns a JSON friendly dict of everything recorded."""
+        stages = {}
+        for stage in sorted(self.samples):
+            histogram = self.histogram(stage)
+            percentiles = histogram.percentiles((50, 90, 99, 99.9, 100))
+            stages[stage] = {
+                'count': int(histogram.total),
+                'mean_ms': histogram.mean(),
+                'total_sec': float(np.sum(self.samples[stage])),
+                'p50_ms': percentiles[50],
+                'p90_ms': percentiles[90],
+                'p99_ms': percentiles[99],
+                'p999_ms': percentiles[99.9],
+                'max_ms': percentiles[100],
+                'histogram': histogram.to_dict(),
+            }
+
+        queues = {}
+        for name in sorted(self.queues):
+            sizes = np.array(self.queues[name], dtype=np.int64)
+            queues[name] = {
+                'samples': len(sizes),
+                'mean': float(sizes.mean()) if len(sizes) else 0.0,
+                'max': int(sizes.max()) if len(sizes) else 0,
+                'counts': np.bincount(sizes).tolist() if len(sizes) else [],
+            }
+
+        elapsed = self.elapsed()
+        frames = len(self.frame_times)
+        return {
+            'frames': frames,
+            'elapsed_sec': elapsed,
+            'fps': frames / elapsed if elapsed else 0.0,
+            'stages': stages,
+            'queues': queues,
+        }
+
+
+    def to_json(self, path=None):
+        """Returns the summary as JSON, also writing it to path if given."""
+        text = json.dumps(self.summary(), sort_keys=True)
+        if path is not None:
+            with io.open(path, 'w') as json_file:
+                json_file.write(text)
+        return text
+
+
+    def write_timestamp_log(self, path):
+        """Writes when each frame finished in the .timestamp.log format.
+
+           The pipeline's output can then be analyzed like a capture, e.g.
+           Evaluate(path).plot_framerate() shows the throughput over time.
+        """
+        with io.open(path, 'w') as timestamp_file:
+            timestamp_file.write(u''.join(u'%f\n' % value for value in
+                                          self.frame_timestamps().tolist()))
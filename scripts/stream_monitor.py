@@ -0,0 +1,452 @@
+"""Watches the captures of many cameras at once and raises alerts as the
+   subjects fall asleep, wake up or buzz, and as captures stall.
+
+   One asyncio task follows each capture's timestamp and tracking logs
+   while they are written, so a single process on a single core can
+   watch dozens of cameras. New lines are parsed a chunk at a time and
+   fed to a small state machine per capture that makes the same awake /
+   sleeping calls as sleep_detection does for a whole file, and frame
+   timing is kept by live_tail.LiveAnalysis. Every per-capture buffer is
+   bounded, so a capture whose tracking falls behind can not use up the
+   host's memory.
+
+   Usage examples:
+       python stream_monitor.py /captures/cam01 /captures/cam02
+       python stream_monitor.py /captures/* --json -i 10
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import os
+import json
+import time
+import asyncio
+import argparse
+from collections import deque
+from live_tail import LogTail, LiveAnalysis
+from capture_catalog import parse_run_name
+from sleep_detection import DEFAULT_THRESHOLD_MS
+from file_analysis import TIMESTAMP_SUFFIXES, split_log_path, parse_tracking
+
+# Most frames kept waiting for their tracking box, per capture
+DEFAULT_BUFFER = 4096
+
+# Seconds without a new frame before a capture counts as stalled
+DEFAULT_STALL_SEC = 5.0
+
+
+class Alert(object):
+    """Something that happened in one capture.
+
+       Attributes:
+           stream: Name of the capture, its video path.
+           kind: 'sleep', 'wake', 'buzz', 'stall', 'resume' or 'overflow'.
+           time_ms: Capture timestamp the alert belongs to, or None.
+           frame: Index of the frame the alert belongs to, or None.
+           detail: Dict of anything else worth knowing.
+    """
+    __slots__ = ('stream', 'kind', 'time_ms', 'frame', 'detail')
+
+    def __init__(self, stream, kind, time_ms=None, frame=None, detail=None):
+        self.stream = stream
+        self.kind = kind
+        self.time_ms = time_ms
+        self.frame = frame
+        self.detail = detail or {}
+
+
+    def to_dict(self):
+        """Returns the alert as a JSON friendly dict."""
+        return {'stream': self.stream, 'kind': self.kind,
+                'time_ms': self.time_ms, 'frame': self.frame,
+                'detail': self.detail}
+
+
+    def __repr__(self):
+        return 'Alert(%r, %r, time_ms=%r, frame=%r)' % \
+            (self.stream, self.kind, self.time_ms, self.frame)
+
+
+class SleepState(object):
+    """Frame by frame version of sleep_detection.SleepEpisodes.
+
+       A subject falls asleep once its box has stayed exactly the same for
+       threshold_ms, and wakes up as soon as the box moves.
+
+       Args:
+           threshold_ms: How long the box has to stay still.
+
+       Attributes:
+           threshold_ms: How long the box has to stay still.
+           box: The latest box, or None before the first frame.
+           still_since_ms: When the box stopped moving.
+           sleeping: Whether the subject is asleep.
+           buzz: The latest buzz value.
+    """
+    __slots__ = ('threshold_ms', 'box', 'still_since_ms', 'sleeping', 'buzz')
+
+    def __init__(self, threshold_ms=DEFAULT_THRESHOLD_MS):
+        self.threshold_ms = threshold_ms
+        self.box = None
+        self.still_since_ms = None
+        self.sleeping = False
+        self.buzz = -1
+
+
+    def update(self, time_ms, row):
+        """Advances by one frame and returns the alert kinds it raised.
+
+           Args:
+               time_ms: The frame's timestamp.
+               row: The frame's x0, y0, x1, y1, buzz as a list.
+        """
+        kinds = []
+        box = row[:4]
+        if box != self.box:
+            if self.sleeping:
+                kinds.append('wake')
+            self.box = box
+            self.still_since_ms = time_ms
+            self.sleeping = False
+        elif not self.sleeping and \
+                time_ms - self.still_since_ms >= self.threshold_ms:
+            self.sleeping = True
+            kinds.append('sleep')
+        if row[4] == 1 and self.buzz != 1:
+            kinds.append('buzz')
+        self.buzz = row[4]
+        return kinds
+
+
+class StreamState(object):
+    """Incremental analysis of one capture's logs.
+
+       Timestamps and tracking boxes are written to separate logs and do
+       not arrive together, so each waits in a bounded buffer until its
+       partner is read. If a capture has no tracking log only its timing
+       is followed, and timestamps are not buffered.
+
+       Args:
+           path: The capture's video path or timestamp log.
+           threshold_ms: How long the box has to stay still for sleep.
+           buffer: Most frames kept waiting for their partner.
+           stall_sec: Seconds without a new frame before a stall alert.
+
+       Attributes:
+           name: The capture's video path.
+           timestamp_tail: LogTail of the timestamp log.
+           tracking_tail: LogTail of the tracking log.
+           live: LiveAnalysis of the frame timing.
+           sleep: SleepState of the tracked subject.
+           pending_times: Deque of timestamps waiting for their boxes.
+           pending_boxes: Deque of boxes waiting for their timestamps.
+           boxes_read: Number of boxes read from the tracking log.
+           frame: Index of the next frame to pair.
+           header_read: Whether the tracking log's first line, which does
+           not belong to a frame, has been skipped. Cleared when the
+           tracking log is truncated.
+           tracking_rewinds: The tracking_tail.rewinds header_read was set
+           for.
+           overflow: Number of frames dropped from full buffers.
+           last_growth: time.monotonic() of the latest new timestamp.
+           stall_sec: Seconds without a new frame before a stall alert.
+           stalled: Whether a stall alert is outstanding.
+    """
+    __slots__ = ('name', 'timestamp_tail', 'tracking_tail', 'live', 'sleep',
+                 'pending_times', 'pending_boxes', 'boxes_read', 'frame',
+                 'header_read', 'tracking_rewinds', 'overflow',
+                 'last_growth', 'stall_sec', 'stalled')
+
+    def __init__(self, path, threshold_ms=DEFAULT_THRESHOLD_MS,
+                 buffer=DEFAULT_BUFFER, stall_sec=DEFAULT_STALL_SEC):
+        (self.name, timestamp_path) = split_log_path(path)
+        self.timestamp_tail = LogTail(timestamp_path)
+        self.tracking_tail = LogTail(self.name + '.tracking.log')
+        self.live = LiveAnalysis(parse_run_name(timestamp_path).fps)
+        self.sleep = SleepState(threshold_ms)
+        self.pending_times = deque(maxlen=buffer)
+        self.pending_boxes = deque(maxlen=buffer)
+        self.boxes_read = 0
+        self.frame = 0
+        self.header_read = False
+        self.tracking_rewinds = 0
+        self.overflow = 0
+        self.last_growth = time.monotonic()
+        self.stall_sec = stall_sec
+        self.stalled = False
+
+
+    def poll(self, now=None):
+        """Reads whatever was appended to the logs.
+
+           Args:
+               now: time.monotonic() of the poll, defaults to now.
+
+           Returns:
+               A list of the Alerts raised.
+        """
+        if now is None:
+            now = time.monotonic()
+        alerts = []
+        timestamps = self.timestamp_tail.read_floats()
+        if len(timestamps):
+            self.live.add(timestamps)
+            self.last_growth = now
+            if self.stalled:
+                self.stalled = False
+                alerts.append(Alert(self.name, 'resume',
+                                    float(timestamps[0]), self.live.frames -
+                                    len(timestamps)))
+            if self.header_read or os.path.exists(self.tracking_tail.path):
+                self.queue(self.pending_times, timestamps.tolist(), alerts)
+        elif not self.stalled and self.live.frames and \
+                now - self.last_growth > self.stall_sec:
+            self.stalled = True
+            alerts.append(Alert(self.name, 'stall', self.live.last_time,
+                                self.live.frames - 1,
+                                {'idle_sec': now - self.last_growth}))
+
+        data = self.tracking_tail.read()
+        if self.tracking_tail.rewinds != self.tracking_rewinds:
+            # A truncated log starts over with its header line
+            self.tracking_rewinds = self.tracking_tail.rewinds
+            self.header_read = False
+        if data:
+            lines = data.decode('ascii', 'replace').split()
+            if not self.header_read and lines:
+                lines = lines[1:]
+                self.header_read = True
+            rows = parse_tracking(lines).tolist()
+            self.boxes_read += len(rows)
+            self.queue(self.pending_boxes, rows, alerts)
+        self.pair(alerts)
+        return alerts
+
+
+    def queue(self, pending, values, alerts):
+        """Appends values to a pending buffer, dropping the oldest if full.
+
+           Every drop is counted and raises an overflow alert.
+        """
+        overflow = len(pending) + len(values) - pending.maxlen
+        pending.extend(values)
+        if overflow > 0:
+            self.overflow += overflow
+            alerts.append(Alert(self.name, 'overflow', None, None,
+                                {'frames': overflow}))
+
+
+    def pair(self, alerts):
+        """Runs the sleep state machine on frames with both halves read."""
+        times = self.pending_times
+        boxes = self.pending_boxes
+        # Index of the oldest frame still buffered on each side, frames
+        #     dropped from one buffer are skipped in the other
+        first_time = self.live.frames - len(times)
+        first_box = self.boxes_read - len(boxes)
+        for _ in range(min(first_box - first_time, len(times))):
+            times.popleft()
+        for _ in range(min(first_time - first_box, len(boxes))):
+            boxes.popleft()
+
+        sleep = self.sleep
+        frame = max(first_time, first_box)
+        for _ in range(min(len(times), len(boxes))):
+            time_ms = times.popleft()
+            for kind in sleep.update(time_ms, boxes.popleft()):
+                alerts.append(Alert(self.name, kind, time_ms, frame))
+            frame += 1
+        self.frame = frame
+
+
+    def health(self):
+        """Returns a JSON friendly dict of the capture's state."""
+        snapshot = self.live.snapshot()
+        slots = snapshot['frames'] + snapshot['dropped']
+        return {'stream': self.name,
+                'frames': snapshot['frames'],
+                'fps': snapshot['fps'],
+                'recent_fps': snapshot['recent_fps'],
+                'dropped': snapshot['dropped'],
+                'drop_rate': snapshot['dropped'] / float(slots) if slots
+                             else 0.0,
+                'tracked': self.frame,
+                'sleeping': self.sleep.sleeping,
+                'stalled': self.stalled,
+                'pending': max(len(self.pending_times),
+                               len(self.pending_boxes)),
+                'overflow': self.overflow}
+
+
+def find_captures(directories):
+    """Returns the video path of every timestamp log in directories."""
+    found = []
+    for directory in directories:
+        try:
+            entries = os.listdir(directory)
+        except OSError:
+            continue
+        for entry in sorted(entries):
+            if entry.endswith(TIMESTAMP_SUFFIXES):
+                found.append(split_log_path(os.path.join(directory,
+                                                         entry))[0])
+    return found
+
+
+class Monitor(object):
+    """Watches every capture in a set of directories.
+
+       Args:
+           directories: Directories holding captures. New captures that
+           show up in them are picked up while running.
+           poll: Seconds between reads of each capture's logs.
+           threshold_ms: How long a box has to stay still for sleep.
+           buffer: Most frames buffered per capture.
+           stall_sec: Seconds without a new frame before a stall alert.
+           scan_sec: Seconds between looks for new captures.
+
+       Attributes:
+           streams: Dict of video path to StreamState.
+    """
+    __slots__ = ('directories', 'poll', 'threshold_ms', 'buffer',
+                 'stall_sec', 'scan_sec', 'streams', 'alerts', 'tasks')
+
+    def __init__(self, directories, poll=0.1,
+                 threshold_ms=DEFAULT_THRESHOLD_MS, buffer=DEFAULT_BUFFER,
+                 stall_sec=DEFAULT_STALL_SEC, scan_sec=5.0):
+        self.directories = list(directories)
+        self.poll = poll
+        self.threshold_ms = threshold_ms
+        self.buffer = buffer
+        self.stall_sec = stall_sec
+        self.scan_sec = scan_sec
+        self.streams = {}
+        self.alerts = None
+        self.tasks = []
+
+
+    def scan(self):
+        """Starts watching captures that are not watched yet."""
+        for name in find_captures(self.directories):
+            if name not in self.streams:
+                stream = StreamState(name, self.threshold_ms, self.buffer,
+                                     self.stall_sec)
+                self.streams[name] = stream
+                self.tasks.append(asyncio.ensure_future(self.watch(stream)))
+
+
+    async def watch(self, stream):
+        """Polls one capture forever, passing its alerts on."""
+        while True:
+            for alert in stream.poll():
+                await self.alerts.put(alert)
+            await asyncio.sleep(self.poll)
+
+
+    async def discover(self):
+        """Scans for new captures forever."""
+        while True:
+            self.scan()
+            await asyncio.sleep(self.scan_sec)
+
+
+    def health(self):
+        """Returns the health dict of every capture."""
+        return [self.streams[name].health() for name in sorted(self.streams)]
+
+
+    async def report(self, on_health, interval):
+        """Calls on_health with every capture's health each interval."""
+        while True:
+            await asyncio.sleep(interval)
+            on_health(self.health())
+
+
+    async def run(self, on_alert, on_health=None, health_interval=10.0,
+                  duration=None):
+        """Watches the captures until cancelled or duration runs out.
+
+           Args:
+               on_alert: Called with each Alert, in the order they were
+               raised within a capture.
+               on_health: Optional, called with the list of health dicts
+               every health_interval seconds.
+               health_interval: Seconds between health reports.
+               duration: Seconds to run for, or None for ever.
+        """
+        # Stream tasks wait on a full queue, so a slow on_alert holds the
+        #     readers back instead of piling alerts up in memory
+        self.alerts = asyncio.Queue(maxsize=self.buffer)
+        self.tasks = [asyncio.ensure_future(self.discover())]
+        if on_health is not None:
+            self.tasks.append(asyncio.ensure_future(
+                self.report(on_health, health_interval)))
+        loop = asyncio.get_running_loop()
+        end = None if duration is None else loop.time() + duration
+        try:
+            while True:
+                timeout = None if end is None else end - loop.time()
+                if timeout is not None and timeout <= 0:
+                    break
+                try:
+                    alert = await asyncio.wait_for(self.alerts.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                on_alert(alert)
+        finally:
+            for task in self.tasks:
+                task.cancel()
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+            self.tasks = []
+
+
+def format_health(health):
+    """Returns a one line summary of a capture's health."""
+    return ('%(stream)s: %(frames)8i frames  %(recent_fps)7.2f fps  '
+            'drop %(drop_rate)6.2f%%  %(state)s' %
+            dict(health, drop_rate=100.0 * health['drop_rate'],
+                 state='stalled' if health['stalled'] else
+                 'sleeping' if health['sleeping'] else 'awake'))
+
+
+def main():
+    """Watches capture directories from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('directories', nargs='+',
+                        help='Directories of captures to watch')
+    parser.add_argument('-i', '--interval', type=float, default=10.0,
+                        help='Seconds between health reports')
+    parser.add_argument('-p', '--poll', type=float, default=0.1,
+                        help='Seconds between reads of each capture')
+    parser.add_argument('-t', '--threshold', type=float, default=20.0,
+                        help='Seconds a box has to stay still for sleep')
+    parser.add_argument('--stall', type=float, default=DEFAULT_STALL_SEC,
+                        help='Seconds without frames before a stall alert')
+    parser.add_argument('--duration', type=float, default=None,
+                        help='Stop after this many seconds')
+    parser.add_argument('--json', action='store_true',
+                        help='Print alerts and health as JSON lines')
+    args = parser.parse_args()
+
+    if args.json:
+        on_alert = lambda alert: print(json.dumps(alert.to_dict()))
+        on_health = lambda health: print(json.dumps({'health': health}))
+    else:
+        on_alert = lambda alert: print('%s %s frame %s at %s ms' % (
+            alert.kind.upper(), alert.stream, alert.frame, alert.time_ms))
+        on_health = lambda health: print('\n'.join(
+            format_health(stream) for stream in health))
+
+    monitor = Monitor(args.directories, args.poll, args.threshold * 1000.0,
+                      stall_sec=args.stall)
+    try:
+        asyncio.run(monitor.run(on_alert, on_health, args.interval,
+                                args.duration))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
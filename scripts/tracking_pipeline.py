@@ -0,0 +1,305 @@
+"""Runs the decode, overlay and encode steps of FileAnalysis.apply_tracking
+   on separate threads so that they overlap.
+
+   Frames flow through bounded queues, decoder -> overlay -> display ->
+   writer, so a slow stage holds back the ones before it instead of letting
+   frames pile up in memory. OpenCV releases the GIL while decoding,
+   converting and encoding, which lets the stages run in parallel.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import threading
+from stage_profiler import clock
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+# Marks the end of the stream in a queue
+_DONE = object()
+
+# How long blocked queue operations wait before checking for a stop request
+_POLL = 0.1
+
+
+def import_cv2():
+    """Returns the cv2 module, imported on first use.
+
+       Importing OpenCV takes seconds on a Pi, so it is left until a video
+       is actually read or drawn on.
+    """
+    import cv2
+    return cv2
+
+
+def draw_overlay(gray, box, msg, buzz):
+    """Draws the tracking box, sleep state and buzz marker on a frame.
+
+       Args:
+           gray: The grayscale frame, drawn on in place.
+           box: Tuple of (x0, y0, x1, y1).
+           msg: The state shown in the top left, e.g. 'Awake'.
+           buzz: 1 if the buzz marker should be shown.
+
+       Returns:
+           The frame.
+    """
+    cv2 = import_cv2()
+    gray = cv2.rectangle(gray, (box[0], box[1]),
+                         (box[2], box[3]), (255, 255, 255), 2)
+    cv2.putText(gray, msg, (15, 30),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                1, (255, 255, 255), 3, 8)
+    if buzz == 1:
+        cv2.putText(gray, 'Buzz', (15, 600),
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    1, (255, 255, 255), 3, 8)
+    return gray
+
+
+class TrackingPipeline(object):
+    """Overlays tracking data on a video with one thread per stage.
+
+       Args:
+           video_path: The video to decode.
+           tracking_boxes: Array of x0, y0, x1, y1, buzz rows, one per frame.
+           sleeping: Boolean array, True for frames where the subject is
+           asleep (see sleep_detection).
+           write: Path of the video to write, or None.
+           display: Whether or not to display the video.
+           queue_depth: Number of frames each queue holds before the stage
+           feeding it has to wait.
+           fourcc: Codec of the written video.
+           source: Optional sequence of grayscale frames, such as a
+           yuv_reader.YuvVideo, used instead of decoding video_path.
+           profiler: Optional stage_profiler.StageProfiler that records the
+           time spent in decode, convert, overlay, display and encode, the
+           queue sizes and when each frame came out.
+
+       Attributes:
+           frames: Number of frames that made it through the overlay stage.
+           quit: Event set to stop decoding, the frames already decoded
+           still go through the overlay and are written.
+           stop: Event set to shut every stage down at once.
+           error: The first exception raised by a stage, if any.
+    """
+    __slots__ = ('video_path', 'tracking_boxes', 'sleeping', 'write',
+                 'display', 'queue_depth', 'fourcc', 'source', 'profiler',
+                 'frames', 'quit', 'stop', 'error')
+
+    def __init__(self, video_path, tracking_boxes, sleeping, write=None,
+                 display=True, queue_depth=32, fourcc=0x00000021,
+                 source=None, profiler=None):
+        self.video_path = video_path
+        self.tracking_boxes = tracking_boxes
+        self.sleeping = sleeping
+        self.write = write
+        self.display = display
+        self.queue_depth = queue_depth
+        self.fourcc = fourcc
+        self.source = source
+        self.profiler = profiler
+        self.frames = 0
+        self.quit = threading.Event()
+        self.stop = threading.Event()
+        self.error = None
+
+
+    def put(self, out_queue, item, name=None):
+        """Puts item on out_queue, giving up if the pipeline is stopped.
+
+           If name is given and profiling is on, the size of the queue is
+           sampled.
+        """
+        while not self.stop.is_set():
+            try:
+                out_queue.put(item, timeout=_POLL)
+                if name is not None and self.profiler is not None:
+                    self.profiler.sample_queue(name, out_queue.qsize())
+                return True
+            except queue.Full:
+                continue
+        return False
+
+
+    def get(self, in_queue):
+        """Returns the next item of in_queue, or _DONE once stopped."""
+        while not self.stop.is_set():
+            try:
+                return in_queue.get(timeout=_POLL)
+            except queue.Empty:
+                continue
+        return _DONE
+
+
+    def fail(self, error):
+        """Records the first error from a stage and stops the pipeline."""
+        if self.error is None:
+            self.error = error
+        self.stop.set()
+
+
+    def decode(self, cap, out_queue):
+        """Decoder stage: reads frames until the tracking data runs out."""
+        profiler = self.profiler
+        try:
+            for i in range(len(self.tracking_boxes) - 1):
+                if self.quit.is_set() or self.stop.is_set():
+                    break
+                if profiler is not None:
+                    began = clock()
+                if self.source is not None:
+                    if i >= len(self.source):
+                        break
+                    frame = self.source[i]
+                else:
+                    ret, frame = cap.read()
+                    if not ret:
+                        break
+                if profiler is not None:
+                    profiler.record('decode', clock() - began)
+                if not self.put(out_queue, (i, frame), 'decoded'):
+                    break
+        except Exception as e:
+            self.fail(e)
+        finally:
+            self.put(out_queue, _DONE)
+
+
+    def overlay(self, in_queue, out_queue):
+        """Overlay stage: converts to gray and draws the tracking state."""
+        profiler = self.profiler
+        try:
+            cv2 = import_cv2()
+            rows = self.tracking_boxes.tolist()
+            sleeping = self.sleeping.tolist()
+
+            while True:
+                item = self.get(in_queue)
+                if item is _DONE:
+                    break
+                (i, frame) = item
+                box = tuple(rows[i][:4])
+                buzz = rows[i][4]
+                msg = 'Sleeping' if i < len(sleeping) and sleeping[i] \
+                    else 'Awake'
+
+                if profiler is not None:
+                    began = clock()
+                if frame.ndim == 2:
+                    # Already gray, copied as the source may be read-only
+                    gray = frame.copy()
+                else:
+                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                if profiler is not None:
+                    converted = clock()
+                    profiler.record('convert', converted - began)
+                gray = draw_overlay(gray, box, msg, buzz)
+                if profiler is not None:
+                    profiler.record('overlay', clock() - converted)
+                self.frames += 1
+                if not self.put(out_queue, gray, 'overlayed'):
+                    break
+        except Exception as e:
+            self.fail(e)
+        finally:
+            self.put(out_queue, _DONE)
+
+
+    def encode(self, writer, in_queue):
+        """Writer stage: encodes frames to the output video."""
+        try:
+            while True:
+                gray = self.get(in_queue)
+                if gray is _DONE:
+                    break
+                if self.profiler is not None:
+                    began = clock()
+                    writer.write(gray)
+                    self.profiler.record('encode', clock() - began)
+                else:
+                    writer.write(gray)
+        except Exception as e:
+            self.fail(e)
+
+
+    def run(self):
+        """Runs the pipeline to the end of the video or until 'q' is pressed.
+
+           Display happens on the calling thread, as GUI toolkits expect.
+           Pressing 'q' stops the decoder, the frames already in the queues
+           are still written so the output ends cleanly.
+
+           Returns:
+               The number of frames overlayed.
+
+           Raises:
+               The first exception raised by a stage, once every stage has
+               finished and the video files are closed.
+        """
+        cv2 = import_cv2()
+        cap = None
+        if self.source is None:
+            cap = cv2.VideoCapture(self.video_path)
+        writer = None
+        if self.write is not None:
+            writer = cv2.VideoWriter(self.write, self.fourcc, 30, (640, 480),
+                                     False)
+
+        decoded = queue.Queue(self.queue_depth)
+        overlayed = queue.Queue(self.queue_depth)
+        encoding = queue.Queue(self.queue_depth)
+        threads = [threading.Thread(target=self.decode, args=(cap, decoded)),
+                   threading.Thread(target=self.overlay,
+                                    args=(decoded, overlayed))]
+        if writer is not None:
+            threads.append(threading.Thread(target=self.encode,
+                                            args=(writer, encoding)))
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start()
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        try:
+            while True:
+                gray = self.get(overlayed)
+                if gray is _DONE:
+                    break
+                if self.display is True and not self.quit.is_set():
+                    if profiler is not None:
+                        began = clock()
+                    cv2.imshow('frame', gray)
+                    key = cv2.waitKey(1)
+                    if profiler is not None:
+                        profiler.record('display', clock() - began)
+                    if key & 0xFF == ord('q'):
+                        self.quit.set()
+                if writer is not None and not self.put(encoding, gray,
+                                                       'encoding'):
+                    break
+                if profiler is not None:
+                    profiler.frame_done()
+        except KeyboardInterrupt:
+            self.stop.set()
+        finally:
+            if writer is not None:
+                self.put(encoding, _DONE)
+            for thread in threads:
+                thread.join()
+            if profiler is not None:
+                profiler.stop()
+            if writer is not None:
+                writer.release()
+            if cap is not None:
+                cap.release()
+            if self.display is True:
+                cv2.destroyAllWindows()
+
+        if self.error is not None:
+            raise self.error
+        return self.frames
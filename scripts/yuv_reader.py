@@ -0,0 +1,125 @@
+"""Reads raw YUV420 (I420) captures as NumPy views of a memory map.
+
+   A raw capture is just its frames back to back: the full size Y plane
+   followed by the quarter size U and V planes. With the resolution known
+   every plane is a fixed offset into the file, so frames are indexed in
+   O(1) without copying or decoding anything, and the Y plane can be used
+   directly as the grayscale frame.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import os
+import numpy as np
+
+
+def padded_size(width, height):
+    """Returns the (width, height) the camera stores a frame with.
+
+       The camera pads raw YUV rows to a multiple of 32 pixels and the
+       frame to a multiple of 16 rows.
+    """
+    return ((width + 31) // 32 * 32, (height + 15) // 16 * 16)
+
+
+class YuvVideo(object):
+    """A raw YUV420 video, memory-mapped.
+
+       Every plane returned is a read-only view into the file, copy it
+       before drawing on it.
+
+       Args:
+           path: The .yuv file.
+           width: Width of the frames in pixels.
+           height: Height of the frames in pixels.
+           padded: Whether the frames are stored padded, as the camera
+           does (see padded_size).
+
+       Attributes:
+           path: The .yuv file.
+           width: Width of the frames in pixels.
+           height: Height of the frames in pixels.
+           stride: Bytes per row of the stored Y plane.
+           rows: Rows of the stored Y plane.
+           frame_bytes: Bytes per stored frame.
+           data: The file as an (n, frame_bytes) uint8 memmap, a trailing
+           partial frame is left out.
+    """
+    __slots__ = ('path', 'width', 'height', 'stride', 'rows', 'frame_bytes',
+                 'data')
+
+    def __init__(self, path, width, height, padded=False):
+        self.path = path
+        self.width = width
+        self.height = height
+        if padded:
+            (self.stride, self.rows) = padded_size(width, height)
+        else:
+            (self.stride, self.rows) = (width, height)
+        self.frame_bytes = self.stride * self.rows * 3 // 2
+
+        frames = os.path.getsize(path) // self.frame_bytes
+        if frames > 0:
+            self.data = np.memmap(path, dtype=np.uint8, mode='r',
+                                  shape=(frames, self.frame_bytes))
+        else:
+            # An empty file can not be memory-mapped
+            self.data = np.zeros((0, self.frame_bytes), dtype=np.uint8)
+
+
+    def __len__(self):
+        return len(self.data)
+
+
+    def __getitem__(self, i):
+        """Returns the Y plane of frame i."""
+        return self.y(i)
+
+
+    def __iter__(self):
+        return self.frames()
+
+
+    def y(self, i):
+        """Returns the Y (luma) plane of frame i, shaped (height, width)."""
+        luma = self.data[i, :self.stride * self.rows]
+        return luma.reshape(self.rows, self.stride)[:self.height, :self.width]
+
+
+    def u(self, i):
+        """Returns the U plane of frame i, at half the width and height."""
+        return self._chroma(i, 0)
+
+
+    def v(self, i):
+        """Returns the V plane of frame i, at half the width and height."""
+        return self._chroma(i, 1)
+
+
+    def yuv(self, i):
+        """Returns the (Y, U, V) planes of frame i."""
+        return (self.y(i), self.u(i), self.v(i))
+
+
+    def _chroma(self, i, plane):
+        """Returns chroma plane 0 (U) or 1 (V) of frame i."""
+        size = (self.stride // 2) * (self.rows // 2)
+        start = self.stride * self.rows + plane * size
+        chroma = self.data[i, start:start + size]
+        return chroma.reshape(self.rows // 2, self.stride // 2)[
+            :self.height // 2, :self.width // 2]
+
+
+    def luma(self):
+        """Returns the Y planes of every frame, shaped (n, height, width)."""
+        planes = self.data[:, :self.stride * self.rows]
+        planes = planes.reshape(len(self), self.rows, self.stride)
+        return planes[:, :self.height, :self.width]
+
+
+    def frames(self, start=0, stop=None, step=1):
+        """Yields the Y planes of frames start, start + step, ... stop."""
+        for i in range(*slice(start, stop, step).indices(len(self))):
+            yield self.y(i)
@@ -0,0 +1,27 @@
+"""Puts the scripts directory on the path so tests import its modules the
+   way the scripts import each other.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import os
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOG_DIR = os.path.join(ROOT, 'logs')
+
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keeps every test's log cache in its own temporary directory."""
+    import log_cache
+    path = tmp_path / 'cache'
+    monkeypatch.setenv('PICAM_CACHE_DIR', str(path))
+    monkeypatch.delenv('PICAM_NO_CACHE', raising=False)
+    monkeypatch.setattr(log_cache, '_default_cache', None)
+    return path
@@ -0,0 +1,49 @@
+"""Tests summarizing a directory of logs in parallel.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import json
+import os
+from benchmark import synthetic_timestamps
+from batch_analysis import analyze_directory, read_columns, write_summary
+
+
+def write_logs(log_dir):
+    names = ['60sec_%gfps_480p%s.h264.ts' % (fps, suffix)
+             for fps in (10, 30, 60) for suffix in ('', '_2', '_inet')]
+    for (seed, name) in enumerate(names):
+        fps = float(name.split('_')[1][:-3])
+        timestamps = synthetic_timestamps(int(fps * 60), fps, jitter_ms=2.0,
+                                          drop_rate=0.01, seed=seed)
+        with open(os.path.join(log_dir, name), 'w') as log_file:
+            log_file.write('\n'.join('%f' % value for value in timestamps))
+    # An empty log gives a row with its error filled in
+    open(os.path.join(log_dir, 'empty.h264.ts'), 'w').close()
+    return len(names) + 1
+
+
+def test_workers_do_not_change_the_rows(tmp_path):
+    count = write_logs(str(tmp_path))
+    rows = [analyze_directory(str(tmp_path), workers, use_cache=False)
+            for workers in (1, 4)]
+    assert len(rows[0]) == count
+    assert json.dumps(rows[0], sort_keys=True) == \
+        json.dumps(rows[1], sort_keys=True)
+    assert [row['name'] for row in rows[0]] == \
+        sorted(row['name'] for row in rows[0])
+    errors = [row['name'] for row in rows[0] if row['error']]
+    assert errors == ['empty.h264.ts']
+
+
+def test_summary_columns(tmp_path):
+    log_dir = tmp_path / 'logs'
+    log_dir.mkdir()
+    write_logs(str(log_dir))
+    rows = analyze_directory(str(log_dir), 1, use_cache=False)
+    write_summary(rows, str(tmp_path / 'summary'))
+    columns = read_columns(str(tmp_path / 'summary.npz'))
+    assert columns['dropped'].tolist() == [row['dropped'] for row in rows]
+    assert columns['target_fps'][0] == 10
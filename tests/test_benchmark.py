@@ -0,0 +1,86 @@
+"""Tests the synthetic captures and reports of the benchmark suite.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import numpy as np
+import pytest
+from benchmark import (STAGES, compare, prepare_size, run_benchmarks,
+                       run_size, synthetic_timestamps, synthetic_tracking)
+from file_analysis import FileAnalysis
+from frame_slots import classify_frames
+
+
+def test_synthetic_timestamps():
+    timestamps = synthetic_timestamps(20000, fps=30.0, seed=1)
+    assert len(timestamps) == 20000
+    assert np.all(np.diff(timestamps) >= 0)
+    assert np.array_equal(timestamps, synthetic_timestamps(20000, 30.0,
+                                                           seed=1))
+    assert not np.array_equal(timestamps, synthetic_timestamps(20000, 30.0,
+                                                               seed=2))
+    # A few dropped slots and stalls slow the capture down a little
+    framerate = 1000.0 * (len(timestamps) - 1) / \
+        (timestamps[-1] - timestamps[0])
+    assert 28.0 < framerate < 30.0
+
+
+def test_synthetic_drops_are_found():
+    timestamps = synthetic_timestamps(50000, fps=30.0, jitter_ms=0.0,
+                                      drop_rate=0.01, stall_rate=0.0)
+    skipped = np.rint(np.diff(timestamps) / (1000.0 / 30.0)) - 1
+    dropped = classify_frames(timestamps, 30.0).dropped()
+    assert dropped == skipped.sum()
+    # Each frame skips a slot with a 1% chance
+    assert 400 < dropped < 600
+    assert classify_frames(synthetic_timestamps(
+        50000, fps=30.0, drop_rate=0.0, stall_rate=0.0), 30.0).dropped() == 0
+
+
+def test_synthetic_tracking():
+    boxes = synthetic_tracking(20000, still_rate=0.001, still_frames=100)
+    assert boxes.shape == (20000, 5)
+    assert np.all(boxes[:, 2] - boxes[:, 0] == 60)
+    assert np.all(boxes[:, :2] >= 0)
+    assert np.all(boxes[:, 2] <= 640) and np.all(boxes[:, 3] <= 480)
+    assert set(np.unique(boxes[:, 4]).tolist()) <= {0, 1}
+    # Rests leave the box exactly where it was
+    still = np.all(boxes[1:, :4] == boxes[:-1, :4], axis=1)
+    assert still.sum() > 100
+
+
+def test_run_size(tmp_path):
+    (path_name, _) = prepare_size(str(tmp_path), 5000)
+    analysis = FileAnalysis(path_name)
+    assert len(analysis.timestamps) == 5000
+    assert len(analysis.tracking_boxes) == 5000
+
+    result = run_size(path_name, 5000)
+    assert result['frames'] == 5000
+    assert sorted(result['seconds']) == sorted(STAGES)
+    assert all(value > 0 for value in result['frames_per_sec'].values())
+    assert result['peak_rss_mb'] > 0
+
+
+def test_run_benchmarks_and_compare():
+    report = run_benchmarks(sizes=(2000,))
+    assert report['settings']['fps'] == 30.0
+    (result,) = report['results']
+    assert result['frames'] == 2000
+    assert 'write_seconds' in result
+
+    faster = {'results': [dict(result, frames_per_sec=dict(
+        (stage, value * 2) for (stage, value) in
+        result['frames_per_sec'].items()))]}
+    lines = compare(report, faster)
+    assert len(lines) == 1 + len(STAGES)
+    assert all(line.endswith('2.00x') for line in lines[1:])
+    assert compare(report, {'results': []}) == lines[:1]
+
+
+@pytest.mark.parametrize('frames', [1, 2])
+def test_tiny_captures(frames):
+    assert len(synthetic_timestamps(frames)) == frames
+    assert synthetic_tracking(frames).shape == (frames, 5)
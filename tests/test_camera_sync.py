@@ -0,0 +1,96 @@
+"""Tests estimating the clock offset and drift between two captures.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import numpy as np
+import pytest
+from benchmark import synthetic_timestamps, synthetic_tracking
+from camera_sync import (ClockModel, align_streams, join_streams,
+                         resample_streams)
+
+OFFSET_MS = -1234.0
+DRIFT = 80e-6
+
+
+def pair(minutes=20, seed=0):
+    """Returns the streams of two cameras watching the same subject."""
+    frames = int(minutes * 60 * 30)
+    timestamps = synthetic_timestamps(frames, 30, seed=seed)
+    boxes = synthetic_tracking(frames, seed=seed)
+    # The second camera started 1234 ms later and its clock runs slow
+    other = ClockModel(OFFSET_MS, DRIFT).from_reference(timestamps)
+    return [(timestamps, boxes), (other, boxes)]
+
+
+@pytest.mark.parametrize('kind', ['motion', 'intervals'])
+def test_offset_and_drift(kind):
+    models = align_streams(pair(), kind=kind)
+    assert models[0].offset_ms == 0.0
+    model = models[1]
+    # Window lags are good to a fraction of a 5 ms sample
+    assert abs(model.offset_ms - OFFSET_MS) < 3.0
+    assert abs(model.drift_ppm() - DRIFT * 1e6) < 3.0
+    assert model.windows >= 8
+
+
+def test_short_capture_gives_offset_only():
+    timestamps = np.arange(0, 30, 10.0)
+    models = align_streams([(timestamps, None), (timestamps + 3.0, None)],
+                           kind='intervals')
+    assert models[1].drift == 0.0
+    assert models[1].windows == 0
+
+
+def test_clock_model_round_trip():
+    model = ClockModel(OFFSET_MS, DRIFT)
+    times = np.linspace(0, 3600000, 7)
+    assert np.allclose(model.to_reference(model.from_reference(times)),
+                       times)
+
+
+def test_join_streams():
+    first = np.array([0.0, 10.0, 20.0, 30.0])
+    second = np.array([15.0, 25.0, 60.0])
+    timeline = join_streams([first, second])
+    assert timeline.times.tolist() == [0, 10, 15, 20, 25, 30, 60]
+    # Frames before a stream starts have no frame of it
+    assert timeline.frames.tolist() == [[0, 1, 1, 2, 2, 3, 3],
+                                        [-1, -1, 0, 0, 1, 1, 2]]
+    assert timeline.complete().tolist() == [False, False, True, True, True,
+                                            True, True]
+
+
+def test_join_streams_tolerance():
+    first = np.array([0.0, 10.0, 20.0, 30.0])
+    second = np.array([15.0, 25.0, 60.0])
+    times = np.array([5.0, 16.0, 25.0, 40.0, 50.0, 70.0])
+    timeline = join_streams([first, second], times, tolerance_ms=10.0)
+    # A frame exactly tolerance_ms old is still used
+    assert timeline.frames.tolist() == [[0, 1, 2, 3, -1, -1],
+                                        [-1, 0, 1, -1, -1, 2]]
+    assert join_streams([first, second], times).frames[0].tolist() == \
+        [0, 1, 2, 3, 3, 3]
+
+
+def test_resample_streams():
+    first = np.arange(0.0, 1000.0, 10.0)
+    second = np.arange(105.0, 2000.0, 20.0)
+    timeline = resample_streams([first, second], 100)
+    # The grid only covers the time both streams were capturing
+    assert timeline.times[0] == 105.0
+    assert timeline.times[-1] < 990.0
+    assert np.allclose(np.diff(timeline.times), 10.0)
+    assert timeline.complete().all()
+
+
+def test_resample_empty_streams():
+    first = np.arange(0.0, 1000.0, 10.0)
+    for aligned in ([], [first, []], [[], []]):
+        timeline = resample_streams(aligned, 100, tolerance_ms=50.0)
+        assert len(timeline) == 0
+        assert timeline.frames.shape == (len(aligned), 0)
+    timeline = join_streams([first, []], [5.0, 15.0], tolerance_ms=50.0)
+    assert timeline.frames.tolist() == [[0, 1], [-1, -1]]
@@ -0,0 +1,83 @@
+"""Tests reading capture parameters from the log file names in logs/.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import os
+import re
+import pytest
+from conftest import LOG_DIR
+from capture_catalog import parse_run_name
+
+# name, duration, fps, resolution, container, repetition, tags
+RUN_NAMES = [
+    ('100sec_12.5fps_full1080p_inet_nullwrite.h264.ts',
+     100, 12.5, '1080p', 'h264', 0, ('inet', 'nullwrite')),
+    ('1800sec_120fps_480p.4.h264.ts', 1800, 120, '480p', 'h264', 4, ()),
+    ('500sec_15fps1.yuv.ts', 500, 15, None, 'yuv', 1, ()),
+    ('900sec_120fps_480p_singlerecord_bash_1.h264.ts',
+     900, 120, '480p', 'h264', 1, ('singlerecord', 'bash')),
+    ('100sec_60fps_inet_notnice_nowrite.h264.ts',
+     100, 60, None, 'h264', 0, ('inet', 'notnice', 'nowrite')),
+    ('300sec_20fps_tracking_threading_maxqueue64_OOC_mypi.yuv.timestamp.log',
+     300, 20, None, 'yuv', 0,
+     ('tracking', 'threading', 'maxqueue64', 'OOC', 'mypi')),
+    ('300sec_20fps_tracking_threading_maxqueue64_OOC_mypi_heatsink'
+     '.yuv.timestamp.log', 300, 20, None, 'yuv', 0,
+     ('tracking', 'threading', 'maxqueue64', 'OOC', 'mypi', 'heatsink')),
+    ('100sec_120fps_lowres.yuv.ts', 100, 120, 'lowres', 'yuv', 0, ()),
+    ('10sec_10fps_highres_inet.yuv.ts', 10, 10, 'highres', 'yuv', 0,
+     ('inet',)),
+    ('500sec_45fps_480p_nowrite.bgr.ts', 500, 45, '480p', 'bgr', 0,
+     ('nowrite',)),
+]
+
+# Names in logs/ that do not follow the run naming: name, container
+OTHER_NAMES = [
+    ('Video.h264', 'h264'),
+    ('Video.h264.timestamp.log', 'h264'),
+    # The container is run into the resolution
+    ('10sec_40fps_480ph264.ts', None),
+    # Not timestamp logs
+    ('500sec_60fps_720p_nowrite.h264.lt', None),
+    ('60sec_30fps_tracking_1per20.yuv.tracking.log', None),
+]
+
+
+@pytest.mark.parametrize(
+    'name,duration,fps,resolution,container,repetition,tags', RUN_NAMES)
+def test_parse_run_name(name, duration, fps, resolution, container,
+                        repetition, tags):
+    run = parse_run_name(os.path.join(LOG_DIR, name))
+    assert run.duration == duration
+    assert run.fps == fps
+    assert run.resolution == resolution
+    assert run.container == container
+    assert run.repetition == repetition
+    assert run.tags == tags
+
+
+@pytest.mark.parametrize('name,container', OTHER_NAMES)
+def test_other_names_do_not_match(name, container):
+    run = parse_run_name(name)
+    assert run.duration is None
+    assert run.fps is None
+    assert run.container == container
+    assert run.tags == ()
+
+
+def test_every_log_fps():
+    prefix = re.compile(r'^(\d+)sec_(\d+(?:\.\d+)?)fps.*\.(?:h264|yuv|mjpeg|'
+                        r'bgr|mp4)\.(?:ts|timestamp\.log)$')
+    checked = 0
+    for name in os.listdir(LOG_DIR):
+        match = prefix.match(name)
+        if match is None:
+            continue
+        run = parse_run_name(name)
+        assert run.duration == float(match.group(1)), name
+        assert run.fps == float(match.group(2)), name
+        checked += 1
+    assert checked > 0
@@ -0,0 +1,83 @@
+"""Tests writing, reading and exporting capture files.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import numpy as np
+import pytest
+from capture_store import (Capture, CaptureWriter, dropped_before,
+                           export_logs, make_records, read_metadata,
+                           write_capture)
+from file_analysis import load_timestamps, load_tracking
+from frame_slots import classify_frames
+
+
+def sample():
+    timestamps = np.array([0.0, 33.4, 100.1, 133.2, 166.9])
+    boxes = np.array([[1, 2, 11, 12, 0], [2, 3, 12, 13, 1],
+                      [3, 4, 13, 14, 0], [4, 5, 14, 15, 0]])
+    sleeping = np.array([False, False, True, True, True])
+    return (timestamps, boxes, sleeping)
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'Video.yuv.capture')
+    (timestamps, boxes, sleeping) = sample()
+    write_capture(path, make_records(timestamps, boxes, sleeping),
+                  {'fps': 30})
+    capture = Capture(path)
+    assert read_metadata(path) == {'fps': 30}
+    assert len(capture) == 5
+    assert np.array_equal(capture.timestamps(), timestamps)
+    # The last frame has no box
+    assert np.array_equal(capture.tracking_boxes(), boxes)
+    assert capture['tracked'].tolist() == [True] * 4 + [False]
+    assert capture['sleeping'].tolist() == sleeping.tolist()
+    assert capture['buzz'].tolist() == [0, 1, 0, 0, -1]
+
+
+def test_writer_appends_and_reader_skips_partial_records(tmp_path):
+    path = str(tmp_path / 'live.capture')
+    (timestamps, boxes, _) = sample()
+    with CaptureWriter(path, {'live': True}) as writer:
+        writer.append_records(make_records(timestamps[:2], boxes[:2]))
+        writer.append(timestamps[2], boxes[2, :4], boxes[2, 4])
+    with CaptureWriter(path) as writer:
+        writer.append(timestamps[3], sleeping=True)
+    with open(path, 'ab') as capture_file:
+        capture_file.write(b'\0' * 5)
+
+    capture = Capture(path)
+    assert capture.metadata == {'live': True}
+    assert np.array_equal(capture.timestamps(), timestamps[:4])
+    assert np.array_equal(capture.tracking_boxes(), boxes[:3])
+    assert capture['sleeping'].tolist() == [False, False, False, True]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.capture'
+    path.write_bytes(b'not a capture' * 1000)
+    with pytest.raises(ValueError):
+        Capture(str(path))
+
+
+def test_export_logs(tmp_path):
+    capture_path = str(tmp_path / 'Video.yuv.capture')
+    (timestamps, boxes, sleeping) = sample()
+    write_capture(capture_path, make_records(timestamps, boxes, sleeping))
+    path_name = str(tmp_path / 'Video.yuv')
+    written = export_logs(capture_path, path_name)
+    assert written[:2] == [path_name + '.timestamp.log',
+                           path_name + '.tracking.log']
+    assert np.allclose(load_timestamps(written[0]), timestamps)
+    # The first line of a tracking log does not belong to a frame
+    assert np.array_equal(load_tracking(written[1])[1:], boxes)
+    with open(written[2]) as sleep_file:
+        assert sleep_file.read().split() == ['0', '0', '1', '1']
+
+
+def test_dropped_before():
+    slots = classify_frames([0.0, 100.0, 400.0, 500.0, 800.0], 10)
+    assert dropped_before(slots).tolist() == [0, 0, 2, 0, 2]
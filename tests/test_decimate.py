@@ -0,0 +1,86 @@
+"""Tests thinning long series for plotting and labeling the subplots.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import os
+import numpy as np
+import pytest
+from conftest import LOG_DIR
+from decimate import POINTS_PER_PIXEL, decimate, decimate_line
+
+
+def bucket_extremes(x, y, buckets):
+    """Returns the min and max of y in each of buckets equal x ranges."""
+    bucket = np.clip(((x - x[0]) / (x[-1] - x[0]) * buckets).astype(int),
+                     0, buckets - 1)
+    return [(y[bucket == b].min(), y[bucket == b].max())
+            for b in range(buckets)]
+
+
+def test_short_series_is_kept():
+    x = np.arange(POINTS_PER_PIXEL * 10)
+    assert decimate(x, x, 10).tolist() == x.tolist()
+    line = (x, x, 'go')
+    assert decimate_line(line, 10) is line
+
+
+def test_keeps_bucket_min_and_max():
+    generator = np.random.RandomState(3)
+    x = np.arange(100000, dtype=np.float64)
+    y = generator.normal(size=len(x))
+    index = decimate(x, y, 200)
+    assert len(index) < len(x) / 10
+    assert index[0] == 0
+    assert index[-1] == len(x) - 1
+    assert bucket_extremes(x[index], y[index], 200) == \
+        bucket_extremes(x, y, 200)
+
+
+def test_keeps_outliers():
+    x = np.arange(50000, dtype=np.float64)
+    y = np.full(len(x), 100.0)
+    spikes = [1234, 1240, 30000]
+    y[spikes] = 300.0
+    index = decimate(x, y, 100)
+    assert set(spikes) <= set(index.tolist())
+
+
+def test_unsorted_x():
+    generator = np.random.RandomState(5)
+    x = generator.permutation(20000).astype(np.float64)
+    y = np.sin(x / 100.0)
+    y[int(np.flatnonzero(x == 777)[0])] = 5.0
+    index = decimate(x, y, 50)
+    assert np.all(np.diff(index) > 0)
+    assert y[index].max() == 5.0
+    assert y[index].min() == y.min()
+
+
+@pytest.mark.parametrize('style,y_labeled', [('vertical', [1]),
+                                              ('horizontal', [0])])
+def test_subplot_labels(monkeypatch, style, y_labeled):
+    matplotlib = pytest.importorskip('matplotlib')
+    matplotlib.use('Agg')
+    from analysis_tools import Evaluate, import_pyplot
+    plt = import_pyplot()
+    # Keep the figure open to look at its axes
+    monkeypatch.setattr(Evaluate, 'finish', lambda self, save_path=None: None)
+
+    paths = [os.path.join(LOG_DIR, name) for name in
+             ('10sec_30fps.yuv.ts', '10sec_40fps_480p.h264.ts',
+              '10sec_60fps_inet.yuv.ts')]
+    evaluate = Evaluate(paths)
+    evaluate.plot_style = style
+    evaluate.plot_framerate()
+    axes = plt.gcf().axes
+    try:
+        assert [i for (i, sub_plot) in enumerate(axes)
+                if sub_plot.get_ylabel()] == y_labeled
+        x_labeled = [i for (i, sub_plot) in enumerate(axes)
+                     if sub_plot.get_xlabel()]
+        assert x_labeled == ([2] if style == 'vertical' else [0, 1, 2])
+    finally:
+        plt.close('all')
@@ -0,0 +1,73 @@
+"""Tests indexing sleep, wake and buzz events and rendering their windows.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import os
+import numpy as np
+import pytest
+from event_index import (BUZZ, SLEEP, WAKE, EventIndex,
+                         render_contact_sheets)
+from sleep_detection import detect_sleep
+
+
+def make_events():
+    """Returns the events of a minute of one frame a second, asleep for
+       frames 20-29 and buzzing for frames 40-42.
+    """
+    timestamps = np.arange(60) * 1000.0
+    boxes = np.zeros((60, 5), dtype=np.int64)
+    boxes[:, :4] = [10, 10, 20, 20]
+    boxes[30:, :4] += np.arange(1, 31)[:, np.newaxis]
+    boxes[:, 4] = 0
+    boxes[40:43, 4] = 1
+    episodes = detect_sleep(boxes, timestamps, 20000)
+    return EventIndex(timestamps, boxes, episodes)
+
+
+def test_events():
+    events = make_events()
+    assert len(events) == 3
+    assert events.kind.tolist() == [SLEEP, WAKE, BUZZ]
+    assert events.first_frame.tolist() == [20, 30, 40]
+    assert events.last_frame.tolist() == [20, 30, 42]
+    assert events.start_ms.tolist() == [20000, 30000, 40000]
+    assert events.end_ms.tolist() == [20000, 30000, 42000]
+    assert events.select([BUZZ]).tolist() == [False, False, True]
+    assert events.between(25000, 41000).tolist() == [1, 2]
+
+
+def test_windows():
+    events = make_events()
+    assert events.windows(2, 2) == [(18, 22), (28, 32), (38, 44)]
+    # Windows that overlap or touch are merged
+    assert events.windows(5, 5) == [(15, 47)]
+    assert events.windows(2, 2, [BUZZ, WAKE]) == [(28, 32), (38, 44)]
+    assert events.windows(2, 2, ['nothing']) == []
+    # Windows stop at the ends of the capture
+    assert events.windows(30, 30, [SLEEP]) == [(0, 50)]
+
+
+def test_render_contact_sheets(tmp_path):
+    cv2 = pytest.importorskip('cv2')
+    video_path = str(tmp_path / 'Video.avi')
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'MJPG'),
+                             10, (64, 48))
+    if not writer.isOpened():
+        pytest.skip('No MJPG encoder')
+    for i in range(30):
+        writer.write(np.full((48, 64, 3), i * 8, dtype=np.uint8))
+    writer.release()
+
+    written = render_contact_sheets(video_path, [(20, 27)], str(tmp_path),
+                                    thumbnails=8, columns=4, scale=0.5)
+    assert written == [os.path.join(str(tmp_path),
+                                    'Video.0000020-0000027.png')]
+    sheet = cv2.imread(written[0], cv2.IMREAD_GRAYSCALE)
+    assert sheet.shape == (48, 128)
+    # Each thumbnail is the frame seeked to, in order
+    means = [sheet[row:row + 24, column:column + 32].mean()
+             for row in (0, 24) for column in range(0, 128, 32)]
+    assert np.allclose(means, np.arange(20, 28) * 8, atol=4)
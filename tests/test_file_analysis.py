@@ -0,0 +1,120 @@
+"""Tests parsing timestamp and tracking logs into arrays.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import os
+import math
+import numpy as np
+import pytest
+from conftest import LOG_DIR
+from file_analysis import (FileAnalysis, load_timestamps, parse_tracking,
+                           split_log_path)
+
+LOG_PATH = os.path.join(LOG_DIR, '100sec_10fps_full1080p_inet.h264.ts')
+
+
+def test_split_log_path():
+    assert split_log_path('Video.h264') == ('Video.h264',
+                                            'Video.h264.timestamp.log')
+    assert split_log_path('Video.h264.timestamp.log') == (
+        'Video.h264', 'Video.h264.timestamp.log')
+    assert split_log_path('logs/Video.h264.ts') == ('logs/Video.h264',
+                                                    'logs/Video.h264.ts')
+
+
+def test_load_timestamps_matches_line_parsing():
+    with open(LOG_PATH, 'r') as timestamp_file:
+        expected = [float(line) for line in timestamp_file.readlines()]
+    timestamps = load_timestamps(LOG_PATH)
+    assert timestamps.dtype == np.float64
+    assert timestamps.tolist() == expected
+
+
+def test_metrics_match_line_parsing():
+    with open(LOG_PATH, 'r') as timestamp_file:
+        lines = [float(line) for line in timestamp_file.readlines()]
+    differences = [b - a for (a, b) in zip(lines, lines[1:])]
+    total_time = sum(differences)
+    mean = total_time / len(differences)
+    variance = sum((value - mean)**2 for value in differences) / \
+        len(differences)
+
+    analysis = FileAnalysis(LOG_PATH, use_cache=False)
+    assert np.allclose(analysis.time_difference, differences)
+    assert math.isclose(analysis.total_time, total_time)
+    assert math.isclose(analysis.framerate,
+                        1 / ((total_time/1000) / len(differences)))
+    (deviation, units) = analysis.standard_deviation
+    (multiplier, expected_units) = analysis.get_time_units(variance)
+    assert units == expected_units
+    assert math.isclose(deviation, math.sqrt(variance) * multiplier)
+
+
+def test_parse_tracking():
+    boxes = parse_tracking(['0,0,0,0', '1,2,3,4', '5,6,7,8'])
+    assert boxes.dtype == np.int64
+    assert boxes.tolist() == [[0, 0, 0, 0, -1], [1, 2, 3, 4, -1],
+                              [5, 6, 7, 8, -1]]
+
+
+def test_parse_tracking_mixed_columns():
+    boxes = parse_tracking(['0,0,0,0', '1,2,3,4,1', '5,6,7,8', '9,9,9,9,0'])
+    assert boxes.tolist() == [[0, 0, 0, 0, -1], [1, 2, 3, 4, 1],
+                              [5, 6, 7, 8, -1], [9, 9, 9, 9, 0]]
+    assert parse_tracking([]).shape == (0, 5)
+
+
+def test_tracking_skips_first_line(tmp_path):
+    path_name = str(tmp_path / 'Video.yuv')
+    with open(path_name + '.timestamp.log', 'w') as timestamp_file:
+        timestamp_file.write('0.0\n100.0\n200.0\n')
+
+    analysis = FileAnalysis(path_name)
+    assert not analysis.tracking
+    assert analysis.tracking_boxes.shape == (0, 5)
+
+    with open(path_name + '.tracking.log', 'w') as tracking_file:
+        tracking_file.write('0,0,0,0\n1,2,3,4,1\n5,6,7,8,0\n-1,-1,-1,-1\n')
+    analysis = FileAnalysis(path_name)
+    assert analysis.tracking
+    assert analysis.tracking_boxes.tolist() == [
+        [1, 2, 3, 4, 1], [5, 6, 7, 8, 0], [-1, -1, -1, -1, -1]]
+
+
+def test_metrics_are_computed_lazily(tmp_path):
+    path_name = str(tmp_path / 'Video.h264')
+    analysis = FileAnalysis(path_name)
+    # Nothing is read until a metric is asked for
+    assert analysis.memo == {}
+    with open(path_name + '.timestamp.log', 'w') as timestamp_file:
+        timestamp_file.write(''.join('%f\n' % (i * 100.0) for i in range(11)))
+    assert analysis.framerate == pytest.approx(10.0)
+    assert 'framerate' in analysis.memo
+    assert 'tracking_boxes' not in analysis.memo
+
+
+def test_appending_recomputes_metrics(tmp_path):
+    path_name = str(tmp_path / 'Video.h264')
+    with open(path_name + '.timestamp.log', 'w') as timestamp_file:
+        timestamp_file.write(''.join('%f\n' % (i * 100.0) for i in range(11)))
+    analysis = FileAnalysis(path_name)
+    assert analysis.framerate == pytest.approx(10.0)
+    assert analysis.frame_slots().frames() == 11
+    framerate = analysis.framerate
+    assert analysis.framerate is framerate
+
+    # The capture goes on at 20fps
+    with open(path_name + '.timestamp.log', 'a') as timestamp_file:
+        timestamp_file.write(''.join('%f\n' % (1000.0 + i * 50.0)
+                                     for i in range(1, 21)))
+    assert len(analysis.timestamps) == 31
+    assert analysis.total_time == pytest.approx(2000.0)
+    assert analysis.framerate == pytest.approx(15.0)
+    assert analysis.frame_slots(10).frames() == 31
+
+    analysis.invalidate()
+    assert analysis.memo == {}
+    assert analysis.framerate == pytest.approx(15.0)
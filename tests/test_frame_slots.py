@@ -0,0 +1,122 @@
+"""Tests frame slot classification and the dropped frame count.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import os
+import numpy as np
+from conftest import LOG_DIR
+from frame_slots import classify_frames, slot_steps
+from benchmark import synthetic_timestamps
+from batch_analysis import summarize_file
+from file_analysis import FileAnalysis
+from live_tail import LiveAnalysis
+
+
+def test_steady_capture_fills_every_slot():
+    slots = classify_frames(np.arange(100) * 100.0 + 3.0, 10)
+    assert slots.frames() == 100
+    assert slots.hits() == 100
+    assert slots.dropped() == 0
+    assert slots.extras() == 0
+    assert slots.balanced()
+
+
+def test_drops_and_extras():
+    # Slot 3 is skipped and slot 6 gets two frames
+    timestamps = np.array([0, 100, 200, 400, 500, 600, 640, 700], np.float64)
+    slots = classify_frames(timestamps, 10)
+    assert slots.dropped_slots.tolist() == [3]
+    assert slots.extra_slots.tolist() == [6]
+    assert slots.hit.tolist() == [True] * 6 + [False, True]
+    assert slots.dropped() == 1
+    assert slots.extras() == 1
+
+
+def test_jitter_is_not_dropped():
+    # Frame 2 is 60 ms late and frame 3 on time, no slot is skipped
+    slots = classify_frames([0.0, 100.0, 260.0, 300.0, 400.0], 10)
+    assert slots.dropped() == 0
+    assert slots.extras() == 1
+    assert slots.slot.tolist() == [0, 1, 2, 2, 3]
+    # A steady capture a little slower than asked for drops nothing
+    slots = classify_frames(np.arange(1000) * 104.0, 10)
+    assert slots.dropped() == 0
+    assert slots.extras() == 0
+
+
+def test_long_intervals_skip_whole_slots():
+    slots = classify_frames([0.0, 100.0, 390.0, 500.0, 1000.0], 10)
+    assert slots.slot.tolist() == [0, 1, 3, 4, 9]
+    assert slots.dropped_slots.tolist() == [2, 5, 6, 7, 8]
+    assert slots.missing.tolist() == [0, 0, 1, 0, 4]
+    assert slots.dropped() == 5
+
+
+def test_exact_frame_gaps():
+    # In seconds, (0.12 - 0.04) / 0.04 rounds to just under 2
+    slots = classify_frames([0, 40, 120, 160, 240], 25)
+    assert slots.slot.tolist() == [0, 1, 3, 4, 6]
+    assert slots.dropped_slots.tolist() == [2, 5]
+
+
+def test_slot_steps():
+    steps = slot_steps([10.0, 49.9, 50.0, 199.9, 200.0, 1000.0, -5.0], 100.0)
+    assert steps.tolist() == [0, 0, 1, 1, 2, 10, 0]
+
+
+def test_earlier_frames_are_extra():
+    slots = classify_frames([200.0, 0.0, 100.0, 110.0], 10)
+    assert slots.hit.tolist() == [True, False, True, False]
+    assert slots.dropped() == 0
+
+
+def test_empty():
+    slots = classify_frames([], 30)
+    assert slots.frames() == 0
+    assert slots.dropped() == 0
+
+
+def test_plot_dropped_frames_counts_whole_frame_gaps():
+    analysis = FileAnalysis(os.path.join(
+        LOG_DIR, '100sec_10fps_full1080p_inet.h264.ts'), False)
+    # The count from before the logs were parsed with numpy, which was
+    #     made at the measured framerate
+    assert analysis.plot_dropped_frames(analysis.framerate) == 27
+    assert analysis.target_framerate == 10
+    assert analysis.plot_dropped_frames() == 28
+
+
+def test_plot_deviation_skips_first_point(tmp_path):
+    path_name = str(tmp_path / 'Video.h264')
+    with open(path_name + '.timestamp.log', 'w') as timestamp_file:
+        timestamp_file.write('0\n100\n205\n410\n500\n600\n640\n700\n')
+
+    p = FileAnalysis(path_name).plot_deviation(10)
+    ((hits_x, hits_y, _), (dropped_x, _, _), (extra_x, _, _)) = \
+        p.get_draw_lines()
+    assert hits_x.tolist() == [1, 2, 4, 5, 6, 7]
+    assert np.allclose(hits_y, [0, 5, 10, 0, 0, 0])
+    assert len(dropped_x) == 0
+    assert len(extra_x) == 0
+    assert p.x_label == 'Frame'
+    assert p.y_label == 'Time Deviation from Expected [ms]'
+
+
+def test_drop_counts_agree(tmp_path, capsys):
+    path = str(tmp_path / '100sec_30fps_480p.h264.timestamp.log')
+    timestamps = synthetic_timestamps(3000, 30, jitter_ms=6.0,
+                                      drop_rate=0.01, seed=3)
+    with open(path, 'w') as timestamp_file:
+        timestamp_file.write('\n'.join('%f' % value for value in timestamps))
+    analysis = FileAnalysis(path, False)
+    dropped = analysis.plot_dropped_frames()
+    assert dropped > 0
+    analysis.dropped_frames()
+    assert 'Dropped: %i\n' % dropped in capsys.readouterr().out
+    assert summarize_file(path, use_cache=False)['dropped'] == dropped
+    live = LiveAnalysis(30)
+    live.add(timestamps)
+    assert live.dropped == dropped
@@ -0,0 +1,94 @@
+"""Tests gap index queries against brute force over the gaps.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import os
+import numpy as np
+from conftest import LOG_DIR
+from benchmark import synthetic_timestamps
+from file_analysis import FileAnalysis
+from frame_slots import classify_frames
+from gap_index import DROP, STALL, GapIndex, load_gap_index
+
+
+def index():
+    timestamps = synthetic_timestamps(200000, 120, jitter_ms=0.3,
+                                      drop_rate=0.002, stall_rate=0.0002,
+                                      seed=2)
+    return (timestamps, GapIndex.from_timestamps(timestamps, 120))
+
+
+def brute_missing(gaps, start_ms, end_ms):
+    total = 0
+    for i in range(len(gaps)):
+        step = gaps.duration_ms[i] / (gaps.missing[i] + 1)
+        due = gaps.start_ms[i] + step * np.arange(1, gaps.missing[i] + 1)
+        total += int(((due >= start_ms) & (due < end_ms)).sum())
+    return total
+
+
+def test_gaps_match_frame_slots():
+    (timestamps, gaps) = index()
+    slots = classify_frames(timestamps, 120)
+    expected = np.flatnonzero(slots.missing) - 1
+    assert np.array_equal(gaps.start_frame, expected)
+    assert np.array_equal(gaps.missing, slots.missing[expected + 1])
+    assert gaps.total_missing() == slots.dropped()
+    assert set(gaps.kinds().tolist()) == set((DROP, STALL))
+
+
+def test_total_missing_matches_dropped_frames():
+    for name in ('100sec_10fps_full1080p_inet.h264.ts',
+                 '100sec_120fps_highres_inet_notnice_nowrite.mjpeg.ts',
+                 'Video.h264.timestamp.log'):
+        analysis = FileAnalysis(os.path.join(LOG_DIR, name), False)
+        assert analysis.gap_index().total_missing() == \
+            analysis.frame_slots().dropped()
+        assert analysis.gap_index().total_missing() == \
+            analysis.plot_dropped_frames()
+
+
+def test_range_queries_match_brute_force():
+    (timestamps, gaps) = index()
+    rng = np.random.RandomState(0)
+    for _ in range(20):
+        start_ms = rng.uniform(0, timestamps[-1])
+        end_ms = start_ms + rng.uniform(0, 100000)
+        expected = np.flatnonzero((gaps.start_ms < end_ms) &
+                                  (gaps.end_ms > start_ms))
+        assert np.array_equal(gaps.overlapping(start_ms, end_ms), expected)
+        assert gaps.missing_between(start_ms, end_ms) == \
+            brute_missing(gaps, start_ms, end_ms)
+        threshold = rng.uniform(0, 500)
+        assert np.array_equal(
+            gaps.longer_than(threshold, start_ms, end_ms),
+            expected[gaps.duration_ms[expected] > threshold])
+        assert np.array_equal(gaps.longer_than(threshold),
+                              np.flatnonzero(gaps.duration_ms > threshold))
+        assert gaps.count_longer_than(threshold) == \
+            int((gaps.duration_ms > threshold).sum())
+    assert gaps.missing_between(-np.inf, np.inf) == gaps.total_missing()
+
+
+def test_no_gaps():
+    gaps = GapIndex.from_timestamps(np.arange(100) * 10.0)
+    assert len(gaps) == 0
+    assert gaps.missing_between(0, 1000) == 0
+    assert len(gaps.longer_than(0, 0, 1000)) == 0
+    assert len(GapIndex.from_timestamps([])) == 0
+
+
+def test_saved_index(tmp_path):
+    (timestamps, gaps) = index()
+    path = str(tmp_path / 'Video.h264.timestamp.log')
+    with open(path, 'w') as timestamp_file:
+        timestamp_file.write('\n'.join('%f' % value for value in timestamps))
+    built = load_gap_index(path, target_framerate=120)
+    loaded = load_gap_index(path, lambda: 1 / 0, target_framerate=120)
+    assert np.array_equal(loaded.start_frame, built.start_frame)
+    assert np.allclose(loaded.end_ms, gaps.end_ms)
+    # Other settings are not served from the saved index
+    assert len(load_gap_index(path, target_framerate=60)) < len(built)
@@ -0,0 +1,66 @@
+"""Tests counting the frames of raw H.264 streams.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import os
+import numpy as np
+from conftest import LOG_DIR
+from file_analysis import load_timestamps
+from h264_scan import H264Scan, check_frame_count, find_start_codes
+
+VIDEO_PATH = os.path.join(LOG_DIR, 'Video.h264')
+
+# Frames in Video.h264 as counted by decoding it with ffmpeg
+VIDEO_FRAMES = 310
+
+
+def test_known_stream():
+    scan = H264Scan(VIDEO_PATH)
+    assert scan.frames() == VIDEO_FRAMES
+    assert scan.keyframes().tolist() == [0, 60, 120, 180, 240, 300]
+    assert scan.gop_lengths().tolist() == [60, 60, 60, 60, 60, 10]
+    assert scan.type_counts() == {'slice': 304, 'idr': 6, 'sps': 6,
+                                  'pps': 6}
+    assert scan.frame_size.sum() == os.path.getsize(VIDEO_PATH)
+
+
+def test_check_frame_count():
+    # The capture logged one timestamp fewer than it encoded
+    timestamps = load_timestamps(VIDEO_PATH + '.timestamp.log')
+    assert check_frame_count(VIDEO_PATH, timestamps) == 1
+
+
+def test_start_codes_across_chunks():
+    with open(VIDEO_PATH, 'rb') as h264_file:
+        data = h264_file.read()
+    whole = find_start_codes(data)
+    # Small odd chunks put many start codes across chunk borders
+    assert find_start_codes(data, 1001).tolist() == whole.tolist()
+    head = data[:20000]
+    assert find_start_codes(head, 3).tolist() == \
+        find_start_codes(head).tolist()
+
+
+def test_slices_and_start_code_lengths(tmp_path):
+    # SPS, PPS, then an IDR frame of two slices and a P frame of one, with
+    #     3 and 4 byte start codes. 0x88 and 0x9a start with first_mb 0,
+    #     0x40 continues the frame at a later macroblock.
+    units = [b'\x00\x00\x00\x01\x67\x42\x1e',
+             b'\x00\x00\x01\x68\xce',
+             b'\x00\x00\x00\x01\x65\x88\x84',
+             b'\x00\x00\x01\x65\x40\x21',
+             b'\x00\x00\x00\x01\x41\x9a\x02\x03']
+    path = str(tmp_path / 'clip.h264')
+    with open(path, 'wb') as h264_file:
+        h264_file.write(b''.join(units))
+
+    scan = H264Scan(path)
+    assert scan.nal_offset.tolist() == np.cumsum(
+        [0] + [len(unit) for unit in units[:-1]]).tolist()
+    assert scan.frames() == 2
+    assert scan.keyframe.tolist() == [True, False]
+    assert scan.frame_size.tolist() == [sum(len(unit) for unit in units[:4]),
+                                        len(units[4])]
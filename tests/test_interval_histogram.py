@@ -0,0 +1,65 @@
+"""Tests interval histogram percentiles, merging and serialization.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import numpy as np
+import pytest
+from interval_histogram import (IntervalHistogram, histogram_of,
+                                merge_histograms)
+
+
+def intervals():
+    rng = np.random.RandomState(0)
+    return np.concatenate((rng.normal(33.3, 1.0, 9900),
+                           rng.uniform(60.0, 500.0, 100)))
+
+
+def test_percentiles_within_precision():
+    values = intervals()
+    histogram = histogram_of(values)
+    for (percent, value) in histogram.percentiles((50, 90, 99, 99.9)).items():
+        exact = np.percentile(np.rint(values * 1000.0), percent,
+                              method='inverted_cdf') / 1000.0
+        # Three significant digits, and the top of the bucket is returned
+        assert exact <= value <= exact * 1.001 + 0.001
+    assert histogram.percentile(100) == np.rint(values.max() * 1000) / 1000.0
+    assert histogram.total == len(values)
+    assert np.isclose(histogram.mean(), values.mean(), rtol=1e-5)
+
+
+def test_exact_below_sub_bucket_range():
+    histogram = histogram_of([0.001, 0.002, 0.003, 0.004])
+    assert histogram.percentile(50) == 0.002
+    assert histogram.percentile(100) == 0.004
+
+
+def test_merge_matches_one_histogram():
+    values = intervals()
+    parts = [histogram_of(part) for part in np.array_split(values, 4)]
+    merged = merge_histograms(parts)
+    whole = histogram_of(values)
+    assert np.array_equal(merged.counts, whole.counts)
+    assert merged.percentiles() == whole.percentiles()
+    assert (merged.min_us, merged.max_us) == (whole.min_us, whole.max_us)
+
+
+def test_merge_needs_same_layout():
+    with pytest.raises(ValueError):
+        IntervalHistogram(3).merge(IntervalHistogram(2))
+
+
+def test_json_round_trip():
+    histogram = histogram_of(intervals())
+    copy = IntervalHistogram.from_json(histogram.to_json())
+    assert np.array_equal(copy.counts, histogram.counts)
+    assert copy.percentiles() == histogram.percentiles()
+
+
+def test_empty():
+    histogram = IntervalHistogram()
+    histogram.record([np.nan])
+    assert histogram.total == 0
+    assert histogram.percentile(50) == 0.0
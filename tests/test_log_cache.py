@@ -0,0 +1,110 @@
+"""Tests the sidecar cache of parsed logs.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import os
+import numpy as np
+from log_cache import LogCache, cached_load
+from file_analysis import load_timestamps
+
+
+class CountingParser(object):
+    """load_timestamps that counts how often it is called."""
+
+    def __init__(self):
+        self.calls = 0
+
+
+    def __call__(self, path):
+        self.calls += 1
+        return load_timestamps(path)
+
+
+def write_log(path, count, mtime=None):
+    with open(str(path), 'w') as log_file:
+        log_file.write(''.join('%f\n' % (i * 33.3) for i in range(count)))
+    if mtime is not None:
+        os.utime(str(path), (mtime, mtime))
+    return str(path)
+
+
+def sidecars(cache_dir):
+    if not os.path.isdir(str(cache_dir)):
+        return []
+    return sorted(name for name in os.listdir(str(cache_dir))
+                  if name.endswith('.npy'))
+
+
+def test_hit(tmp_path, cache_dir):
+    path = write_log(tmp_path / 'a.ts', 100)
+    parser = CountingParser()
+    first = cached_load(path, 'timestamps', parser)
+    second = cached_load(path, 'timestamps', parser)
+    assert parser.calls == 1
+    assert isinstance(second, np.memmap)
+    assert np.array_equal(first, second)
+    assert len(sidecars(cache_dir)) == 1
+
+
+def test_kinds_are_kept_apart(tmp_path, cache_dir):
+    path = write_log(tmp_path / 'a.ts', 100)
+    cached_load(path, 'timestamps', load_timestamps)
+    other = cached_load(path, 'doubled',
+                        lambda path: load_timestamps(path) * 2)
+    assert other[1] == 66.6
+    assert len(sidecars(cache_dir)) == 2
+
+
+def test_miss_after_the_log_changes(tmp_path, cache_dir):
+    path = write_log(tmp_path / 'a.ts', 100, mtime=1000000000)
+    parser = CountingParser()
+    cached_load(path, 'timestamps', parser)
+    old = sidecars(cache_dir)
+
+    # Same size, newer mtime
+    write_log(path, 100, mtime=1000000500)
+    assert len(cached_load(path, 'timestamps', parser)) == 100
+    assert parser.calls == 2
+    # Same mtime, new size
+    write_log(path, 150, mtime=1000000500)
+    assert len(cached_load(path, 'timestamps', parser)) == 150
+    assert parser.calls == 3
+    # Stale sidecars of the log are removed
+    assert len(sidecars(cache_dir)) == 1
+    assert sidecars(cache_dir) != old
+
+
+def test_eviction_past_the_size_cap(tmp_path, cache_dir):
+    entry_bytes = 1000 * 8 + 128
+    cache = LogCache(str(cache_dir), max_bytes=int(3.5 * entry_bytes))
+    paths = [write_log(tmp_path / ('%i.ts' % i), 1000) for i in range(4)]
+    for (i, path) in enumerate(paths[:3]):
+        cache.load(path, 'timestamps', load_timestamps)
+        sidecar = cache.sidecar_path(path, 'timestamps')
+        os.utime(sidecar, (1000000000 + i, 1000000000 + i))
+    # A hit makes the oldest entry the most recently used
+    parser = CountingParser()
+    cache.load(paths[0], 'timestamps', parser)
+    assert parser.calls == 0
+    cache.load(paths[3], 'timestamps', load_timestamps)
+
+    kept = [os.path.exists(cache.sidecar_path(path, 'timestamps'))
+            for path in paths]
+    assert kept == [True, False, True, True]
+    assert sum(os.path.getsize(os.path.join(str(cache_dir), name))
+               for name in sidecars(cache_dir)) <= cache.max_bytes
+
+
+def test_bypass(tmp_path, cache_dir, monkeypatch):
+    path = write_log(tmp_path / 'a.ts', 100)
+    parser = CountingParser()
+    cached_load(path, 'timestamps', parser, use_cache=False)
+    cached_load(path, 'timestamps', parser, use_cache=False)
+    assert parser.calls == 2
+    monkeypatch.setenv('PICAM_NO_CACHE', '1')
+    cached_load(path, 'timestamps', parser)
+    assert parser.calls == 3
+    assert sidecars(cache_dir) == []
@@ -0,0 +1,92 @@
+"""Tests the background subtraction tracker and its tracking logs.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import numpy as np
+from file_analysis import load_tracking
+from motion_tracker import (NO_BOX, MotionTracker, TrackingResult,
+                            box_blur, write_tracking_log)
+
+(WIDTH, HEIGHT) = (320, 240)
+
+# Side of the square that moves across the frames
+SIZE = 40
+
+
+def make_frames(frames, x0, speed):
+    """Returns noisy frames of a bright square moving right by speed."""
+    generator = np.random.RandomState(0)
+    background = (generator.rand(HEIGHT, WIDTH) * 40 + 80).astype(np.int64)
+    clip = []
+    for i in range(frames):
+        gray = background + generator.randint(-3, 4, background.shape)
+        x = x0 + speed * i
+        gray[100:100 + SIZE, max(x, 0):max(x + SIZE, 0)] = 230
+        clip.append(gray.astype(np.uint8))
+    return clip
+
+
+def test_box_blur():
+    image = np.zeros((5, 5), dtype=np.float32)
+    image[2, 2] = 9
+    blurred = box_blur(image, 1)
+    assert blurred.shape == (5, 5)
+    assert np.allclose(blurred[1:4, 1:4], 1)
+    assert blurred.sum() == 9
+    assert box_blur(image, 0) is image
+
+
+def test_no_box_before_the_background():
+    tracker = MotionTracker()
+    # Nothing can have moved on the first frame, or in a still scene
+    boxes = [tracker.update(gray) for gray in make_frames(5, -SIZE, 0)]
+    assert boxes == [NO_BOX] * 5
+
+
+def test_box_follows_a_moving_subject():
+    tracker = MotionTracker()
+    result = tracker.track(make_frames(100, -SIZE, 1))
+    boxes = result.processed_boxes
+    assert tuple(boxes[0]) == NO_BOX
+    # The background is not learned under the slow square, so the box
+    #     stays its size, give or take the blur, instead of trailing
+    #     behind it
+    for (i, box) in enumerate(boxes[50:].tolist(), 50):
+        x = -SIZE + i
+        assert abs(box[0] - x) <= 12
+        assert abs(box[2] - (x + SIZE)) <= 12
+        assert box[2] - box[0] <= SIZE + 16
+        assert 88 <= box[1] and box[3] <= 100 + SIZE + 12
+
+
+def test_first_frame_ghost_is_absorbed():
+    # The square is in the first frame, so the background starts with it
+    tracker = MotionTracker(absorb_frames=30)
+    boxes = tracker.track(make_frames(120, 20, 4)).processed_boxes
+    widths = boxes[:, 2] - boxes[:, 0]
+    assert widths[20] > 2 * SIZE
+    assert (widths[60:] <= SIZE + 16).all()
+
+
+def test_interpolation_holds_no_box():
+    result = TrackingResult(
+        10, np.array([0, 3, 6, 9]),
+        np.array([NO_BOX, NO_BOX, [10, 10, 20, 20], [40, 10, 50, 20]]), 1.0)
+    boxes = result.boxes()
+    assert boxes[:6].tolist() == [list(NO_BOX)] * 6
+    assert boxes[6].tolist() == [10, 10, 20, 20]
+    assert boxes[7].tolist() == [20, 10, 30, 20]
+    assert boxes[9].tolist() == [40, 10, 50, 20]
+    assert TrackingResult(3, np.empty(0, np.int64), np.empty((0, 4)),
+                          0.0).boxes().tolist() == [list(NO_BOX)] * 3
+
+
+def test_write_tracking_log(tmp_path):
+    path = str(tmp_path / 'Video.yuv.tracking.log')
+    write_tracking_log(path, [NO_BOX, (1, 2, 3, 4)], buzz=[0, 1])
+    assert load_tracking(path).tolist() == [[0, 0, 0, 0, -1],
+                                            [-1, -1, -1, -1, 0],
+                                            [1, 2, 3, 4, 1]]
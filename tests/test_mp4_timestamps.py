@@ -0,0 +1,99 @@
+"""Tests reading frame timestamps from the sample tables of an MP4.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import struct
+import numpy as np
+import pytest
+from mp4_timestamps import find_box, iter_boxes, read_track
+
+
+def box(box_type, *children):
+    payload = b''.join(children)
+    return struct.pack('>I4s', 8 + len(payload), box_type) + payload
+
+
+def full_box(box_type, version, payload):
+    return box(box_type, struct.pack('>I', version << 24) + payload)
+
+
+def table(box_type, rows, version=0):
+    fmt = '>' + ('i' if version == 1 else 'I') * len(rows[0])
+    return full_box(box_type, version, struct.pack('>I', len(rows)) +
+                    b''.join(struct.pack(fmt, *row) for row in rows))
+
+
+def track(handler, timescale, stbl, edit=None):
+    mdhd = full_box(b'mdhd', 0, struct.pack('>IIIIHH', 0, 0, timescale, 0,
+                                            0, 0))
+    hdlr = full_box(b'hdlr', 0, struct.pack('>I4s', 0, handler) +
+                    b'\0' * 13)
+    children = [box(b'mdia', mdhd, hdlr, box(b'minf', box(b'stbl', *stbl)))]
+    if edit is not None:
+        entry = struct.pack('>IiHH', 0, edit, 1, 0)
+        children.insert(0, box(b'edts', full_box(
+            b'elst', 0, struct.pack('>I', 1) + entry)))
+    return box(b'trak', *children)
+
+
+def write_mp4(path):
+    """Writes an MP4 with an audio track and an I P B B P video track."""
+    audio = track(b'soun', 48000, [table(b'stts', [(10, 1024)])])
+    video = track(b'vide', 90000, [
+        table(b'stts', [(5, 3000)]),
+        table(b'ctts', [(1, 3000), (1, 9000), (2, 0), (1, 3000)]),
+        table(b'stss', [(1,)]),
+    ], edit=3000)
+    data = box(b'ftyp', b'isom\0\0\0\0') + box(b'moov', audio, video)
+    with open(path, 'wb') as mp4_file:
+        mp4_file.write(data)
+    return data
+
+
+def test_iter_and_find_boxes(tmp_path):
+    data = write_mp4(str(tmp_path / 'clip.mp4'))
+    types = [box_type for (box_type, _, _) in iter_boxes(data, 0, len(data))]
+    assert types == [b'ftyp', b'moov']
+    assert find_box(data, 0, len(data), (b'moov', b'trak', b'mdia',
+                                         b'mdhd')) is not None
+    assert find_box(data, 0, len(data), (b'moov', b'mvex')) is None
+
+
+def test_stts_ctts_and_edit_list(tmp_path):
+    path = str(tmp_path / 'clip.mp4')
+    write_mp4(path)
+    mp4 = read_track(path)
+    assert mp4.timescale == 90000
+    assert len(mp4) == 5
+    assert mp4.dts.tolist() == [0, 3000, 6000, 9000, 12000]
+    assert mp4.pts.tolist() == [0, 9000, 3000, 6000, 12000]
+    assert mp4.keyframe.tolist() == [True, False, False, False, False]
+    (pts_ms, keyframe) = mp4.timestamps()
+    assert np.allclose(pts_ms, np.arange(5) * 100.0 / 3.0)
+    assert keyframe.tolist() == [True, False, False, False, False]
+
+
+def test_no_video_track(tmp_path):
+    path = str(tmp_path / 'audio.mp4')
+    with open(path, 'wb') as mp4_file:
+        mp4_file.write(box(b'moov', track(b'soun', 48000, [
+            table(b'stts', [(10, 1024)])])))
+    with pytest.raises(ValueError):
+        read_track(path)
+
+
+def test_opencv_written_file(tmp_path):
+    cv2 = pytest.importorskip('cv2')
+    path = str(tmp_path / 'cv2.mp4')
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 25,
+                             (64, 48), False)
+    if not writer.isOpened():
+        pytest.skip('OpenCV cannot write MP4 here')
+    for _ in range(12):
+        writer.write(np.zeros((48, 64), dtype=np.uint8))
+    writer.release()
+    (pts_ms, _) = read_track(path).timestamps()
+    assert np.allclose(pts_ms, np.arange(12) * 40.0)
@@ -0,0 +1,69 @@
+"""Tests the output of the picam command line.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import os
+import sys
+import subprocess
+from conftest import LOG_DIR, ROOT
+import picam
+
+LOG_PATH = os.path.join(LOG_DIR, '100sec_10fps_full1080p_inet.h264.ts')
+
+
+def test_info(capsys):
+    assert picam.main(['info', LOG_PATH]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == LOG_PATH
+    assert lines[1] == '  Sec: 99.182083'
+    assert lines[2] == '  Frames: 947'
+    assert lines[3].startswith('  Framerate: 9.548')
+    assert lines[4] == '  Standard Deviation: 0.094994 sec'
+    assert lines[5].startswith('  Interval p50/p99/p99.9: 100.031 / ')
+
+
+def test_drops(capsys):
+    # The framerate comes from the file name unless it is given
+    assert picam.main(['drops', LOG_PATH]) == 0
+    assert picam.main(['drops', '-f', '5', LOG_PATH]) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        '%s: 28 dropped, 0 extra of 948 frames at 10 fps' % LOG_PATH,
+        '%s: 13 dropped, 930 extra of 948 frames at 5 fps' % LOG_PATH]
+
+
+def test_drops_without_framerate_in_name(capsys):
+    path = os.path.join(LOG_DIR, 'Video.h264.timestamp.log')
+    assert picam.main(['drops', path]) == 0
+    out = capsys.readouterr().out
+    assert out.startswith('%s: 0 dropped, 0 extra of 309 frames at 30.0' %
+                          path)
+
+
+def test_percentiles(capsys):
+    assert picam.main(['percentiles', LOG_PATH, '-p', '50', '100']) == 0
+    assert capsys.readouterr().out == \
+        '%s: p50=100.031 ms, p100=2999.458 ms\n' % LOG_PATH
+
+
+def test_h264(capsys):
+    assert picam.main(['h264', os.path.join(LOG_DIR, 'Video.h264')]) == 0
+    assert capsys.readouterr().out.endswith(
+        'Video.h264: 310 frames, 309 timestamps\n')
+
+
+def test_no_command(capsys):
+    assert picam.main([]) == 2
+    assert 'usage' in capsys.readouterr().out
+
+
+def test_text_commands_do_not_import_plotting():
+    # Matplotlib and OpenCV take seconds to import on a Pi
+    code = ('import sys, picam; picam.main(["drops", %r]); '
+            'print(sorted(name for name in ("matplotlib", "cv2") '
+            'if name in sys.modules))' % LOG_PATH)
+    out = subprocess.check_output([sys.executable, '-c', code],
+                                  cwd=os.path.join(ROOT, 'scripts'))
+    assert out.decode('utf-8').splitlines()[-1] == '[]'
@@ -0,0 +1,67 @@
+"""Tests the fault model and fault injection of capture replays.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import os
+import numpy as np
+import pytest
+from conftest import LOG_DIR
+from file_analysis import FileAnalysis
+from frame_slots import classify_frames
+from replay_capture import FaultModel, inject_faults
+
+
+def test_model_of_known_gaps():
+    gap = 1000.0 / 30
+    timestamps = np.arange(1000) * gap
+    # Two frames dropped at 100, one at 400 and a 10 frame gap stall at 700
+    timestamps[100:] += 2 * gap
+    timestamps[400:] += gap
+    timestamps[700:] += 9 * gap
+    model = FaultModel.from_timestamps(timestamps, 30)
+    assert classify_frames(timestamps, 30).dropped() == 12
+    assert model.drop_rate == pytest.approx(3 / 1002.0)
+    assert model.stall_rate == pytest.approx(1 / 999.0)
+    assert model.stall_ms == pytest.approx(9 * gap)
+
+
+def test_model_of_a_log_with_gaps():
+    analysis = FileAnalysis(
+        os.path.join(LOG_DIR, '100sec_60fps_inet_notnice.yuv.ts'), False)
+    assert analysis.frame_slots(60).dropped() > 0
+    model = FaultModel.from_timestamps(analysis.timestamps, 60)
+    assert model.drop_rate > 0
+    assert model.stall_rate > 0
+    assert model.stall_ms > 4 * 1000.0 / 60
+
+
+def test_model_of_clean_timing():
+    timestamps = np.arange(500) * 1000.0 / 60
+    model = FaultModel.from_timestamps(timestamps)
+    assert (model.drop_rate, model.stall_rate) == (0.0, 0.0)
+    assert FaultModel.from_timestamps(timestamps[:1]).drop_rate == 0.0
+
+
+def test_inject_faults():
+    timestamps = np.arange(10000) * 10.0
+    model = FaultModel(drop_rate=0.1, stall_rate=0.01, stall_ms=200.0)
+    (index, faulty) = inject_faults(timestamps, model, seed=3)
+    assert index[0] == 0
+    assert 800 < len(timestamps) - len(index) < 1200
+    assert np.all(np.diff(faulty) > 0)
+    assert faulty[-1] > timestamps[-1]
+    (again, _) = inject_faults(timestamps, model, seed=3)
+    assert np.array_equal(index, again)
+
+
+def test_model_fits_injected_faults():
+    timestamps = np.arange(100000) * 1000.0 / 30
+    model = FaultModel(drop_rate=0.01, stall_rate=0.001, stall_ms=1000.0)
+    (_, faulty) = inject_faults(timestamps, model, seed=1)
+    fitted = FaultModel.from_timestamps(faulty, 30)
+    assert fitted.drop_rate == pytest.approx(0.01, rel=0.2)
+    assert fitted.stall_rate == pytest.approx(0.001, rel=0.3)
+    assert fitted.stall_ms == pytest.approx(1000.0, rel=0.3)
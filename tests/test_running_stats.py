@@ -0,0 +1,61 @@
+"""Tests RunningStats against numpy over whole arrays.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import numpy as np
+from running_stats import RunningStats
+
+
+def values():
+    return np.random.RandomState(0).normal(33.3, 2.0, 10000)
+
+
+def check(stats, expected):
+    assert stats.count == len(expected)
+    assert np.isclose(stats.mean, expected.mean())
+    assert np.isclose(stats.m2, np.square(expected - expected.mean()).sum())
+    assert np.isclose(stats.standard_deviation(), expected.std())
+    assert stats.minimum == expected.min()
+    assert stats.maximum == expected.max()
+
+
+def test_add_matches_add_array():
+    expected = values()
+    one_by_one = RunningStats()
+    for value in expected[:500]:
+        one_by_one.add(value)
+    whole = RunningStats()
+    whole.add_array(expected[:500])
+    check(one_by_one, expected[:500])
+    check(whole, expected[:500])
+
+
+def test_chunks_match_whole_array():
+    expected = values()
+    stats = RunningStats()
+    for chunk in np.array_split(expected, 7):
+        stats.add_array(chunk)
+    check(stats, expected)
+
+
+def test_merge():
+    expected = values()
+    (first, second) = (RunningStats(), RunningStats())
+    first.add_array(expected[:1234])
+    second.add_array(expected[1234:])
+    first.merge(second)
+    check(first, expected)
+
+
+def test_merge_empty():
+    stats = RunningStats()
+    stats.merge(RunningStats())
+    assert stats.count == 0
+    assert stats.variance() == 0.0
+    other = RunningStats()
+    other.add_array([1.0, 3.0])
+    stats.merge(other)
+    check(stats, np.array([1.0, 3.0]))
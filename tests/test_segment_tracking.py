@@ -0,0 +1,55 @@
+"""Tests that segmented tracking does not depend on the worker count.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import numpy as np
+from segment_tracking import segments, track_parallel
+
+(WIDTH, HEIGHT) = (64, 48)
+
+
+def write_clip(path, frames=400):
+    """Writes a raw YUV420 clip of a square bouncing around."""
+    with open(path, 'wb') as clip_file:
+        for i in range(frames):
+            luma = np.full((HEIGHT, WIDTH), 40, dtype=np.uint8)
+            x = abs((i * 3) % 88 - 44)
+            y = abs((i * 2) % 56 - 28)
+            if (i // 90) % 2 == 0:
+                luma[y:y + 12, x:x + 12] = 220
+            clip_file.write(luma.tobytes())
+            clip_file.write(np.full(WIDTH * HEIGHT // 2, 128,
+                                    dtype=np.uint8).tobytes())
+
+
+def test_segments():
+    assert segments(250, 100) == [(0, 100), (100, 200), (200, 250)]
+    assert segments(0, 100) == []
+
+
+def test_workers_do_not_change_the_result(tmp_path):
+    path = str(tmp_path / 'clip.yuv')
+    write_clip(path)
+    results = [track_parallel(path, (WIDTH, HEIGHT), workers=workers,
+                              segment_frames=100, warmup=30, scale=2,
+                              blur=1)[0]
+               for workers in (1, 4)]
+    assert results[0].frames == results[1].frames == 400
+    assert np.array_equal(results[0].processed, results[1].processed)
+    assert np.array_equal(results[0].processed_boxes,
+                          results[1].processed_boxes)
+    assert np.array_equal(results[0].boxes(), results[1].boxes())
+    # Something was tracked
+    assert len(np.unique(results[0].processed_boxes, axis=0)) > 10
+
+
+def test_frames_align_with_timestamps(tmp_path):
+    path = str(tmp_path / 'clip.yuv')
+    write_clip(path, 120)
+    (result, _) = track_parallel(path, (WIDTH, HEIGHT), frames=150,
+                                 workers=1, segment_frames=50, stride=5)
+    assert result.processed.tolist() == list(range(0, 120, 5))
+    assert len(result.boxes()) == 150
@@ -0,0 +1,83 @@
+"""Tests finding sleep episodes from tracking boxes.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import numpy as np
+from sleep_detection import box_runs, detect_sleep, still_time
+
+
+def make_boxes(runs):
+    """Returns boxes made of runs of (length, box) and 1 second timestamps."""
+    boxes = np.concatenate([np.tile(box, (length, 1))
+                            for (length, box) in runs])
+    return (boxes, np.arange(len(boxes)) * 1000.0)
+
+
+def test_box_runs():
+    (boxes, _) = make_boxes([(2, [0, 0, 1, 1]), (3, [1, 1, 2, 2]),
+                             (1, [0, 0, 1, 1])])
+    (change, run_id, starts) = box_runs(boxes)
+    assert change.tolist() == [True, False, True, False, False, True]
+    assert run_id.tolist() == [0, 0, 1, 1, 1, 2]
+    assert starts.tolist() == [0, 2, 5]
+
+
+def test_still_time():
+    (boxes, timestamps) = make_boxes([(3, [0, 0, 1, 1]), (2, [1, 1, 2, 2])])
+    assert still_time(boxes, timestamps).tolist() == [0, 1000, 2000, 0, 1000]
+
+
+def test_episode_boundaries():
+    # Still from frame 3 to 30, moving at 31 and still again until the end
+    runs = [(1, [i, 0, i + 1, 1]) for i in range(3)]
+    runs += [(28, [5, 5, 9, 9]), (30, [6, 6, 9, 9])]
+    (boxes, timestamps) = make_boxes(runs)
+    episodes = detect_sleep(boxes, timestamps, 20000)
+
+    assert len(episodes) == 2
+    # Asleep once the box has been still for the whole threshold
+    assert episodes.start_frame.tolist() == [23, 51]
+    # Awake on the frame the box moves, and asleep to the end of the capture
+    assert episodes.end_frame.tolist() == [30, 60]
+    assert episodes.still_since_ms.tolist() == [3000, 31000]
+    assert episodes.intervals() == [(23000, 30000), (51000, 60000)]
+    assert episodes.total_ms() == 16000
+    assert np.flatnonzero(episodes.sleeping).tolist() == \
+        list(range(23, 31)) + list(range(51, 61))
+
+
+def test_back_to_back_episodes():
+    # The box jumps straight from one still position to another
+    (boxes, timestamps) = make_boxes([(25, [0, 0, 4, 4]),
+                                      (25, [1, 1, 5, 5])])
+    episodes = detect_sleep(boxes, timestamps, 20000)
+    assert episodes.start_frame.tolist() == [20, 45]
+    assert episodes.end_frame.tolist() == [24, 49]
+    assert not episodes.sleeping[25:45].any()
+
+
+def test_short_still_is_awake():
+    (boxes, timestamps) = make_boxes([(20, [0, 0, 4, 4]),
+                                      (20, [1, 1, 5, 5])])
+    episodes = detect_sleep(boxes, timestamps, 20000)
+    assert len(episodes) == 0
+    assert not episodes.sleeping.any()
+
+
+def test_boxes_longer_than_timestamps():
+    (boxes, timestamps) = make_boxes([(30, [0, 0, 4, 4])])
+    episodes = detect_sleep(boxes, timestamps[:25], 20000)
+    assert len(episodes.sleeping) == 25
+    assert episodes.start_frame.tolist() == [20]
+    assert episodes.end_frame.tolist() == [24]
+
+
+def test_write_log(tmp_path):
+    (boxes, timestamps) = make_boxes([(3, [0, 0, 4, 4])])
+    path = str(tmp_path / 'sleeping.log')
+    detect_sleep(boxes, timestamps, 1000).write_log(path)
+    with open(path) as sleep_file:
+        assert sleep_file.read() == '0\n1\n1\n'
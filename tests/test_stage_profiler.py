@@ -0,0 +1,101 @@
+"""Tests the per-stage profiling of the tracking pipeline.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import json
+import numpy as np
+import pytest
+import stage_profiler
+from file_analysis import FileAnalysis
+from stage_profiler import StageProfiler
+
+
+class FakeClock(object):
+    """A clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 100.0
+
+
+    def __call__(self):
+        return self.now
+
+
+def test_summary(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(stage_profiler, 'clock', fake)
+    profiler = StageProfiler()
+    profiler.start()
+    for i in range(100):
+        profiler.record('decode', 0.002)
+        profiler.record('encode', 0.001 * (i + 1))
+        profiler.sample_queue('decoded', i % 4)
+        fake.now += 0.01
+        profiler.frame_done()
+    profiler.stop()
+
+    summary = json.loads(profiler.to_json())
+    assert summary['frames'] == 100
+    assert summary['elapsed_sec'] == pytest.approx(1.0)
+    assert summary['fps'] == pytest.approx(100.0)
+    decode = summary['stages']['decode']
+    assert decode['count'] == 100
+    assert decode['p50_ms'] == pytest.approx(2.0, rel=0.01)
+    assert decode['total_sec'] == pytest.approx(0.2)
+    encode = summary['stages']['encode']
+    assert encode['p50_ms'] == pytest.approx(50.0, rel=0.02)
+    assert encode['max_ms'] == pytest.approx(100.0, rel=0.01)
+    assert summary['queues']['decoded'] == {
+        'samples': 100, 'mean': 1.5, 'max': 3, 'counts': [25, 25, 25, 25]}
+
+
+def test_frame_timestamp_log(monkeypatch, tmp_path):
+    fake = FakeClock()
+    monkeypatch.setattr(stage_profiler, 'clock', fake)
+    profiler = StageProfiler()
+    profiler.start()
+    for i in range(50):
+        fake.now += 0.04
+        profiler.frame_done()
+    assert np.allclose(profiler.frame_timestamps(),
+                       np.arange(1, 51) * 40.0)
+
+    # The output reads back like a 25fps capture
+    path = str(tmp_path / 'pipeline.timestamp.log')
+    profiler.write_timestamp_log(path)
+    assert FileAnalysis(path).framerate == pytest.approx(25.0)
+
+
+def test_empty():
+    profiler = StageProfiler()
+    assert profiler.elapsed() == 0.0
+    summary = profiler.summary()
+    assert summary['frames'] == 0
+    assert summary['fps'] == 0.0
+    assert summary['stages'] == {}
+    assert len(profiler.frame_timestamps()) == 0
+
+
+def test_profiled_pipeline():
+    cv2 = pytest.importorskip('cv2')
+    from tracking_pipeline import TrackingPipeline
+    frames = 30
+    source = [np.zeros((48, 64), dtype=np.uint8)] * frames
+    # As in apply_tracking, the last box does not get a frame
+    boxes = np.tile([10, 10, 50, 40, 0], (frames + 1, 1))
+    profiler = StageProfiler()
+    sleeping = np.zeros(frames + 1, dtype=bool)
+    pipeline = TrackingPipeline(None, boxes, sleeping, display=False,
+                                source=source,
+                                fourcc=cv2.VideoWriter_fourcc(*'MJPG'),
+                                profiler=profiler)
+    assert pipeline.run() == frames
+
+    summary = profiler.summary()
+    assert summary['frames'] == frames
+    for stage in ('decode', 'convert', 'overlay'):
+        assert summary['stages'][stage]['count'] == frames
+    assert all(stats['samples'] > 0 for stats in summary['queues'].values())
@@ -0,0 +1,120 @@
+"""Tests the live sleep state machine and per-capture log following.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import numpy as np
+from benchmark import synthetic_timestamps, synthetic_tracking
+from sleep_detection import detect_sleep
+from stream_monitor import SleepState, StreamState
+
+THRESHOLD_MS = 5000
+
+
+def capture(frames=20000):
+    return (synthetic_timestamps(frames, 30, seed=1),
+            synthetic_tracking(frames, still_rate=0.002, still_frames=300,
+                               buzz_rate=0.001, seed=1))
+
+
+def expected_frames(timestamps, boxes):
+    episodes = detect_sleep(boxes, timestamps, THRESHOLD_MS)
+    # An episode still running at the end of the capture has no wake
+    woken = episodes.end_frame + 1
+    buzzing = boxes[:, 4] == 1
+    buzzing[1:] &= ~buzzing[:-1]
+    return (episodes.start_frame.tolist(),
+            woken[woken < len(timestamps)].tolist(),
+            np.flatnonzero(buzzing).tolist())
+
+
+def test_sleep_state_matches_detect_sleep():
+    (timestamps, boxes) = capture()
+    state = SleepState(THRESHOLD_MS)
+    found = {'sleep': [], 'wake': [], 'buzz': []}
+    for (frame, (time_ms, row)) in enumerate(zip(timestamps.tolist(),
+                                                 boxes.tolist())):
+        for kind in state.update(time_ms, row):
+            found[kind].append(frame)
+    (sleep, wake, buzz) = expected_frames(timestamps, boxes)
+    assert len(sleep) > 3
+    assert found['sleep'] == sleep
+    assert found['wake'] == wake
+    assert found['buzz'] == buzz
+
+
+def test_stream_state_follows_growing_logs(tmp_path):
+    (timestamps, boxes) = capture()
+    path_name = str(tmp_path / '20sec_30fps_480p.yuv')
+    stream = StreamState(path_name, THRESHOLD_MS, stall_sec=1.0)
+    found = {'sleep': [], 'wake': [], 'buzz': []}
+    with open(path_name + '.timestamp.log', 'w') as timestamp_file, \
+            open(path_name + '.tracking.log', 'w') as tracking_file:
+        tracking_file.write('0,0,0,0\n')
+        # The tracking log falls behind the timestamps by a chunk
+        chunks = np.array_split(np.arange(len(timestamps)), 40)
+        for (i, chunk) in enumerate(chunks):
+            timestamp_file.write(''.join('%f\n' % value for value in
+                                         timestamps[chunk].tolist()))
+            timestamp_file.flush()
+            if i:
+                tracking_file.write(''.join(
+                    '%i,%i,%i,%i,%i\n' % tuple(row)
+                    for row in boxes[chunks[i - 1]].tolist()))
+                tracking_file.flush()
+            for alert in stream.poll(now=float(i)):
+                found[alert.kind].append(alert.frame)
+        tracking_file.write(''.join('%i,%i,%i,%i,%i\n' % tuple(row)
+                                    for row in boxes[chunks[-1]].tolist()))
+    for alert in stream.poll(now=40.0):
+        found[alert.kind].append(alert.frame)
+
+    (sleep, wake, buzz) = expected_frames(timestamps, boxes)
+    assert found == {'sleep': sleep, 'wake': wake, 'buzz': buzz}
+    assert stream.frame == len(timestamps)
+    assert stream.health()['overflow'] == 0
+
+    # No new frames for longer than stall_sec
+    assert [alert.kind for alert in stream.poll(now=42.0)] == ['stall']
+    assert stream.poll(now=43.0) == []
+
+
+def write_lines(path, lines, mode='a'):
+    with open(path, mode) as log_file:
+        log_file.write(''.join(line + '\n' for line in lines))
+
+
+def test_overflow_before_tracking_starts(tmp_path):
+    path_name = str(tmp_path / 'Video.yuv')
+    stream = StreamState(path_name, THRESHOLD_MS, buffer=10)
+    write_lines(path_name + '.timestamp.log', ['%i' % i for i in range(25)])
+    # Without a tracking log timestamps are not kept for boxes to pair with
+    assert stream.poll(now=0.0) == []
+    assert len(stream.pending_times) == 0
+
+    # The tracking log exists but its header is not written yet
+    write_lines(path_name + '.tracking.log', [])
+    write_lines(path_name + '.timestamp.log',
+                ['%i' % i for i in range(25, 40)])
+    alerts = stream.poll(now=1.0)
+    assert [(alert.kind, alert.detail) for alert in alerts] == \
+        [('overflow', {'frames': 5})]
+    assert stream.health()['overflow'] == 5
+
+
+def test_truncated_tracking_log_skips_its_header(tmp_path):
+    path_name = str(tmp_path / 'Video.yuv')
+    tracking_path = path_name + '.tracking.log'
+    write_lines(tracking_path, ['0,0,0,0'] + ['1,2,3,4,0'] * 5)
+    stream = StreamState(path_name, THRESHOLD_MS)
+    stream.poll(now=0.0)
+    assert stream.boxes_read == 5
+
+    # The capture was restarted and wrote a new, shorter log
+    write_lines(tracking_path, ['0,0,0,0', '5,6,7,8,0'], 'w')
+    stream.poll(now=1.0)
+    assert stream.tracking_tail.rewinds == 1
+    assert stream.boxes_read == 6
+    assert list(stream.pending_boxes)[-1] == [5, 6, 7, 8, 0]
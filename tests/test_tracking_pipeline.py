@@ -0,0 +1,60 @@
+"""Tests stopping and failing the threaded tracking pipeline.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import time
+import threading
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip('cv2')
+from tracking_pipeline import TrackingPipeline
+
+FRAMES = 200
+
+
+class SlowFrames(object):
+    """Grayscale frames that take a while to read, like a decoder."""
+
+    def __len__(self):
+        return FRAMES
+
+
+    def __getitem__(self, i):
+        time.sleep(0.002)
+        return np.zeros((480, 640), dtype=np.uint8)
+
+
+class BrokenFrames(SlowFrames):
+    """Frames that fail part way through."""
+
+    def __getitem__(self, i):
+        if i == 10:
+            raise IOError('corrupt frame')
+        return SlowFrames.__getitem__(self, i)
+
+
+def pipeline(source, write=None):
+    boxes = np.tile([10, 10, 50, 50, 0], (FRAMES + 1, 1))
+    return TrackingPipeline(None, boxes, np.zeros(FRAMES + 1, dtype=bool),
+                            write, display=False, queue_depth=8,
+                            fourcc=cv2.VideoWriter_fourcc(*'MJPG'),
+                            source=source)
+
+
+def test_quit_writes_every_overlayed_frame(tmp_path):
+    path = str(tmp_path / 'out.avi')
+    tracking = pipeline(SlowFrames(), path)
+    threading.Timer(0.1, tracking.quit.set).start()
+    frames = tracking.run()
+    assert 0 < frames < FRAMES
+    video = cv2.VideoCapture(path)
+    assert int(video.get(cv2.CAP_PROP_FRAME_COUNT)) == frames
+
+
+def test_stage_errors_are_raised():
+    with pytest.raises(IOError):
+        pipeline(BrokenFrames()).run()
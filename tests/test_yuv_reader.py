@@ -0,0 +1,74 @@
+"""Tests reading raw YUV420 captures.
+
+   Date  : October 2026
+
+  Style-Guide: https://www.github.com/google/styleguide/blob/gh-pages/pyguide.md
+"""
+
+import numpy as np
+from yuv_reader import YuvVideo, padded_size
+
+
+def write_yuv(path, frames, stride, rows, extra=b''):
+    """Writes frames whose Y, U and V bytes are 3*i, 3*i + 1 and 3*i + 2."""
+    with open(path, 'wb') as yuv_file:
+        for i in range(frames):
+            yuv_file.write(bytes([3 * i]) * (stride * rows))
+            yuv_file.write(bytes([3 * i + 1]) * (stride * rows // 4))
+            yuv_file.write(bytes([3 * i + 2]) * (stride * rows // 4))
+        yuv_file.write(extra)
+
+
+def test_planes(tmp_path):
+    path = str(tmp_path / 'Video.yuv')
+    write_yuv(path, 3, 64, 48)
+    video = YuvVideo(path, 64, 48)
+    assert len(video) == 3
+    assert video.frame_bytes == 64 * 48 * 3 // 2
+    (y, u, v) = video.yuv(2)
+    assert y.shape == (48, 64)
+    assert u.shape == v.shape == (24, 32)
+    assert (y == 6).all() and (u == 7).all() and (v == 8).all()
+    assert video.luma().shape == (3, 48, 64)
+    assert [int(frame[0, 0]) for frame in video] == [0, 3, 6]
+    assert [int(frame[0, 0]) for frame in video.frames(1, 3)] == [3, 6]
+
+
+def test_padded(tmp_path):
+    assert padded_size(100, 75) == (128, 80)
+    path = str(tmp_path / 'Video.yuv')
+    write_yuv(path, 2, 128, 80)
+    video = YuvVideo(path, 100, 75, padded=True)
+    assert len(video) == 2
+    assert video[1].shape == (75, 100)
+    assert video.u(1).shape == (37, 50)
+    assert (video.v(1) == 5).all()
+
+
+def test_partial_trailing_frame(tmp_path):
+    # A capture stopped in the middle of writing its last frame
+    path = str(tmp_path / 'Video.yuv')
+    write_yuv(path, 2, 64, 48, extra=b'\x09' * 1000)
+    video = YuvVideo(path, 64, 48)
+    assert len(video) == 2
+    assert video.data.shape == (2, video.frame_bytes)
+    assert int(video[-1][0, 0]) == 3
+    assert len(list(video.frames())) == 2
+
+
+def test_less_than_a_frame(tmp_path):
+    path = str(tmp_path / 'Video.yuv')
+    write_yuv(path, 0, 64, 48, extra=b'\x09' * 1000)
+    video = YuvVideo(path, 64, 48)
+    assert len(video) == 0
+    assert video.luma().shape == (0, 48, 64)
+
+
+def test_empty_file(tmp_path):
+    path = str(tmp_path / 'Video.yuv')
+    open(path, 'wb').close()
+    video = YuvVideo(path, 64, 48)
+    assert len(video) == 0
+    assert video.data.shape == (0, video.frame_bytes)
+    assert video.data.dtype == np.uint8
+    assert list(video.frames()) == []